@@ -8,6 +8,12 @@ from .json_handler import JsonHandler
 from .xml_handler import XmlHandler
 from .excel_handler import ExcelHandler
 from .feather_handler import FeatherHandler
+from .storage import StorageBackend, LocalStorage, MemoryStorage, S3Storage, StoragePath, register_storage
+from .schema_cache import SchemaCache
+from .sniffer import CsvSniffer
+from .checkpoint import TailCheckpoint
+from .json_codec import JsonCodec
+from .json_stream import JsonArrayStream
 
 # for v1.0
 from . import csv_handler
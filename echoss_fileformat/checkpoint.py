@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Callable, Optional
+
+from echoss_fileformat.echoss_logger import get_logger
+
+logger = get_logger("echoss_fileformat")
+
+
+class TailCheckpoint:
+    """append-only 파일을 이어서 읽기 위한 sidecar checkpoint
+
+    마지막으로 읽은 완전한 record 의 끝 byte 위치(offset), 파일 inode, 파일 앞부분 hash 와
+    CSV 헤더 byte 를 JSON 파일로 저장함. 기본 checkpoint 파일명은 '<파일명>.checkpoint'
+    """
+    VERSION = 1
+    SUFFIX = '.checkpoint'
+    # rotation 판별에 사용하는 파일 앞부분 byte 수
+    HEAD_BYTES = 1024
+
+    def __init__(self, filename: str, path: str = None):
+        """
+        Args:
+            filename (str): 이어서 읽을 파일명
+            path (str): checkpoint JSON 파일명. None 이면 filename + SUFFIX
+        """
+        self.filename = filename
+        self.path = path if path is not None else filename + TailCheckpoint.SUFFIX
+
+    def read(self) -> Optional[dict]:
+        """저장된 checkpoint. 없거나 읽을 수 없으면 None"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fp:
+                state = json.load(fp)
+            if state.get('version') == TailCheckpoint.VERSION:
+                return state
+        except Exception as e:
+            logger.warning(f"checkpoint '{self.path}' read raise {e}, read from start")
+        return None
+
+    def write(self, state: dict) -> None:
+        """checkpoint 저장. 임시 파일에 쓴 뒤 교체하여 쓰다 만 checkpoint 를 읽지 않도록 함"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.checkpoint_', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                json.dump(dict(state, version=TailCheckpoint.VERSION), fp)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def clear(self) -> None:
+        """checkpoint 파일 삭제. 다음 읽기는 처음부터 시작"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class TailRead:
+    """read_appended() 로 읽은 새 record 와 처리 후 저장할 checkpoint"""
+
+    def __init__(self, checkpoint: TailCheckpoint, data: bytes, state: dict, restarted: bool):
+        self.checkpoint = checkpoint
+        self.data = data
+        self.state = state
+        self.restarted = restarted
+
+    def commit(self) -> None:
+        """새 record 처리가 끝난 뒤 checkpoint 저장"""
+        self.checkpoint.write(self.state)
+
+
+def get_checkpoint(filename, checkpoint) -> TailCheckpoint:
+    """load(incremental=) 옵션을 TailCheckpoint 로 변환
+
+    Args:
+        filename: 이어서 읽을 파일명. 압축하지 않은 로컬 파일만 지원
+        checkpoint: True 이면 sidecar checkpoint, 문자열이면 checkpoint 파일명, 또는 TailCheckpoint
+
+    Returns:
+        TailCheckpoint
+    """
+    if not isinstance(filename, str) or not os.path.isfile(filename):
+        raise ValueError(f"incremental load need local filename, not {filename!r}")
+    if isinstance(checkpoint, TailCheckpoint):
+        return checkpoint
+    if checkpoint is True:
+        return TailCheckpoint(filename)
+    if isinstance(checkpoint, str):
+        return TailCheckpoint(filename, path=checkpoint)
+    raise ValueError(f"incremental={checkpoint!r} must be True, checkpoint filename or TailCheckpoint")
+
+
+def read_appended(checkpoint: TailCheckpoint, record_end: Callable[[bytes, int], int],
+                  header_end: Callable[[bytes], int] = None) -> Optional[TailRead]:
+    """checkpoint 이후에 추가된 완전한 record 를 읽기
+
+    파일 inode 가 바뀌었거나 (rotation), 파일 크기가 offset 보다 작거나 (truncation),
+    파일 앞부분이 checkpoint 와 다르면 처음부터 다시 읽음.
+    이어서 읽을 때는 처음 읽을 때 저장한 헤더 byte 를 새 record 앞에 붙여서 리턴
+
+    Args:
+        checkpoint: TailCheckpoint
+        record_end: (byte 데이터, 시작 위치) 를 받아서 시작 위치 이후 마지막 완전한 record 의 끝 위치를 리턴하는 함수.
+            완전한 record 가 없으면 시작 위치 리턴
+        header_end: 파일 처음 byte 데이터에서 헤더의 끝 위치를 리턴하는 함수. 헤더가 없으면 None.
+            헤더가 완전하지 않으면 -1 리턴
+
+    Returns:
+        TailRead 또는 새 record 가 없으면 None
+    """
+    filename = checkpoint.filename
+    state = checkpoint.read()
+    with open(filename, 'rb') as fp:
+        stat = os.fstat(fp.fileno())
+        offset = 0
+        header = b''
+        if state is not None:
+            head_size = min(state['offset'], TailCheckpoint.HEAD_BYTES)
+            if state.get('inode') != stat.st_ino or stat.st_size < state['offset']:
+                logger.info(f"'{filename}' rotated or truncated, read from start")
+            elif hashlib.sha1(fp.read(head_size)).hexdigest() != state.get('head'):
+                logger.info(f"'{filename}' head changed, read from start")
+            else:
+                offset = state['offset']
+                # 헤더 byte 는 latin-1 문자열로 저장하여 인코딩과 관계없이 그대로 복원
+                header = state.get('header', '').encode('latin-1')
+        fp.seek(offset)
+        data = fp.read()
+        fp.seek(0)
+        head = fp.read(TailCheckpoint.HEAD_BYTES)
+
+    restarted = state is not None and offset == 0
+    if offset == 0 and header_end is not None:
+        header_size = header_end(data)
+        if header_size < 0:
+            return None
+        header = data[:header_size]
+        end = record_end(data, header_size)
+    else:
+        end = record_end(data, 0)
+    if end <= (len(header) if offset == 0 else 0):
+        return None
+
+    new_offset = offset + end
+    new_state = {
+        'offset': new_offset,
+        'inode': stat.st_ino,
+        'head': hashlib.sha1(head[:min(new_offset, TailCheckpoint.HEAD_BYTES)]).hexdigest(),
+        'header': header.decode('latin-1'),
+    }
+    body = data[:end] if offset == 0 else header + data[:end]
+    return TailRead(checkpoint, body, new_state, restarted)
@@ -0,0 +1,218 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+from typing import Optional, Tuple, Union
+
+from echoss_fileformat.echoss_logger import get_logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = get_logger("echoss_fileformat")
+
+COMPRESSION_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.gzip': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'xz',
+    '.zst': 'zstd',
+    '.zstd': 'zstd',
+}
+
+# 확장자가 없는 파일은 첫 byte 로 압축 형식을 판별
+COMPRESSION_MAGIC = [
+    (b'\x1f\x8b\x08', 'gzip'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+]
+BZ2_BLOCK_MAGIC = b'\x31\x41\x59\x26\x53\x59'
+
+COMPRESSION_METHODS = ('gzip', 'bz2', 'xz', 'zstd')
+
+
+def split_compression_ext(filename: str) -> Tuple[str, Optional[str]]:
+    """파일명에서 압축 확장자를 분리
+
+    Args:
+        filename (str): 파일명. 예) 'data.jsonl.zst'
+
+    Returns:
+        (압축 확장자를 뺀 파일명, 압축 형식) tuple. 예) ('data.jsonl', 'zstd'), 압축 확장자가 없으면 (filename, None)
+    """
+    base, ext = os.path.splitext(filename)
+    method = COMPRESSION_EXTENSIONS.get(ext.lower())
+    if method is None:
+        return filename, None
+    return base, method
+
+
+def sniff_compression(filename: str) -> Optional[str]:
+    """파일의 첫 byte 로 압축 형식 판별
+
+    Args:
+        filename (str): 파일명
+
+    Returns:
+        압축 형식 이름 또는 압축 파일이 아니면 None
+    """
+    try:
+        with open(filename, 'rb') as fp:
+            head = fp.read(10)
+    except OSError:
+        return None
+    return compression_from_magic(head)
+
+
+def compression_from_magic(head: bytes) -> Optional[str]:
+    """파일 첫 10 byte 의 magic number 로 압축 형식 판별
+
+    Args:
+        head (bytes): 파일의 첫 byte 들
+
+    Returns:
+        압축 형식 이름 또는 압축 파일이 아니면 None
+    """
+    for magic, method in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return method
+    if head[:3] == b'BZh' and head[3:4].isdigit() and head[4:10] == BZ2_BLOCK_MAGIC:
+        return 'bz2'
+    return None
+
+
+def parse_compression(compression: Union[str, dict, None]) -> Tuple[Optional[str], Optional[int], Optional[int]]:
+    """handler 의 compression 옵션을 (method, level, threads) 로 변환
+
+    Args:
+        compression: 'infer', None, 압축 형식 이름 또는 {'method': 'zstd', 'level': 3, 'threads': 4} 형태의 dictionary
+
+    Returns:
+        (method, level, threads) tuple. method 는 'infer', None 또는 압축 형식 이름
+    """
+    level = None
+    threads = None
+    if isinstance(compression, dict):
+        method = compression.get('method', 'infer')
+        level = compression.get('level')
+        threads = compression.get('threads')
+    else:
+        method = compression
+    if method is not None and method != 'infer' and method not in COMPRESSION_METHODS:
+        raise ValueError(f"compression method '{method}' is not supported, use one of {COMPRESSION_METHODS}")
+    return method, level, threads
+
+
+def infer_compression(filename: str, open_mode: str, compression: Union[str, dict, None] = 'infer') -> Optional[str]:
+    """파일명과 compression 옵션으로 사용할 압축 형식 결정
+
+    'infer' 이면 확장자로 판별하고, 읽기 모드에서 확장자가 없으면 파일의 첫 byte 로 판별
+
+    Args:
+        filename (str): 파일명
+        open_mode (str): Literal['r', 'w', 'a', 'rb', 'wb', 'ab']
+        compression: handler 의 compression 옵션
+
+    Returns:
+        압축 형식 이름 또는 압축하지 않으면 None
+    """
+    method, _, _ = parse_compression(compression)
+    if method != 'infer':
+        return method
+    _, method = split_compression_ext(filename)
+    if method is None and 'r' in open_mode:
+        method = sniff_compression(filename)
+    return method
+
+
+class _OwnedFileMixin:
+    """내부 클래스 close 시에 감싸고 있는 file object 도 close"""
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._owned_fileobj.close()
+
+
+class _OwnedGzipFile(_OwnedFileMixin, gzip.GzipFile):
+    pass
+
+
+class _OwnedBZ2File(_OwnedFileMixin, bz2.BZ2File):
+    pass
+
+
+class _OwnedLZMAFile(_OwnedFileMixin, lzma.LZMAFile):
+    pass
+
+
+def open_compressed(filename: Union[str, io.IOBase], open_mode: str, method: str, encoding: str = 'utf-8',
+                    level: int = None, threads: int = None):
+    """압축 파일을 streaming 으로 압축/해제하는 file object 생성
+
+    Args:
+        filename (str): 파일명 또는 binary file object. file object 는 리턴 객체를 close 할 때 같이 close
+        open_mode (str): Literal['r', 'w', 'a', 'rb', 'wb', 'ab']
+        method (str): 압축 형식 'gzip', 'bz2', 'xz', 'zstd'
+        encoding (str): text 모드의 인코딩
+        level (int): 압축 수준, None 이면 형식별 기본값
+        threads (int): zstd 압축 thread 수, -1 이면 CPU 수 만큼 사용. 다른 형식은 무시
+
+    Returns:
+        binary 모드면 binary file object, text 모드면 io.TextIOWrapper
+    """
+    binary_open_mode = open_mode.replace('b', '') + 'b'
+    writing = 'r' not in open_mode
+    if not isinstance(filename, str) and method != 'zstd':
+        fp = _open_compressed_fileobj(filename, binary_open_mode, method, level if writing else None)
+    elif method == 'gzip':
+        if writing and level is not None:
+            fp = gzip.open(filename, binary_open_mode, compresslevel=level)
+        else:
+            fp = gzip.open(filename, binary_open_mode)
+    elif method == 'bz2':
+        if writing and level is not None:
+            fp = bz2.open(filename, binary_open_mode, compresslevel=level)
+        else:
+            fp = bz2.open(filename, binary_open_mode)
+    elif method == 'xz':
+        if writing and level is not None:
+            fp = lzma.open(filename, binary_open_mode, preset=level)
+        else:
+            fp = lzma.open(filename, binary_open_mode)
+    elif method == 'zstd':
+        if zstandard is None:
+            raise ImportError("zstd compression need 'zstandard' package, pip install zstandard")
+        if writing:
+            cctx = zstandard.ZstdCompressor(level=level if level is not None else 3,
+                                            threads=threads if threads is not None else 0)
+            fp = zstandard.open(filename, binary_open_mode, cctx=cctx)
+        else:
+            fp = zstandard.open(filename, binary_open_mode)
+    else:
+        raise ValueError(f"compression method '{method}' is not supported, use one of {COMPRESSION_METHODS}")
+
+    if 'b' in open_mode:
+        return fp
+    return io.TextIOWrapper(fp, encoding=encoding)
+
+
+def _open_compressed_fileobj(fileobj, binary_open_mode: str, method: str, level: Optional[int]):
+    """내부함수 binary file object 를 gzip, bz2, xz 로 감싸고 close 시에 fileobj 도 close"""
+    if method == 'gzip':
+        fp = _OwnedGzipFile(fileobj=fileobj, mode=binary_open_mode, compresslevel=level if level is not None else 9)
+    elif method == 'bz2':
+        fp = _OwnedBZ2File(fileobj, binary_open_mode, compresslevel=level if level is not None else 9)
+    elif method == 'xz':
+        if 'r' in binary_open_mode:
+            fp = _OwnedLZMAFile(fileobj, binary_open_mode)
+        else:
+            fp = _OwnedLZMAFile(fileobj, binary_open_mode, preset=level)
+    else:
+        raise ValueError(f"compression method '{method}' is not supported, use one of {COMPRESSION_METHODS}")
+    fp._owned_fileobj = fileobj
+    return fp
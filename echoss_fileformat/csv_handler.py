@@ -1,12 +1,151 @@
+import codecs
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 import io
+import mmap
+import numpy as np
+import os
 import pandas as pd
-from typing import Union, Literal, Optional
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import re
+import threading
+from typing import Callable, Iterator, List, Union, Literal, Optional, Tuple
+import warnings
 
+from .checkpoint import TailCheckpoint, TailRead, get_checkpoint, read_appended
+from .compression import infer_compression
+from .data_buffer import DataBuffer, arrow_to_frame, frame_to_ipc, ipc_to_frame
 from .fileformat_base import FileformatBase
+from .metrics import instrument, source_size, stat_timer
+from .schema_cache import SchemaCache, get_schema_cache
+from .storage import resolve_storage_path
 from .echoss_logger import get_logger, set_logger_level
 
 logger = get_logger('echoss_fileformat')
 
+# 'c' 엔진의 bad line 경고 수집은 process 전체의 warnings 상태를 바꾸므로 thread 간에 한번에 하나만 실행
+_CAPTURE_LOCK = threading.Lock()
+
+
+def _parse_csv_range(filename: str, start: int, end: int, read_kwargs: dict, collect: bool = False):
+    """CsvHandler.load(workers=) 의 process worker 함수. 파일의 [start, end) byte 범위를 읽어서
+    (Arrow IPC 버퍼, 컬럼 목록, bad line 목록) 으로 리턴. Arrow 는 컬럼 이름을 문자열로 바꾸므로 원래 컬럼 목록을 같이 전달
+
+    Arrow 로 변환할 수 없는 컬럼이 있으면 IPC 버퍼 대신 dataframe 을 그대로 리턴.
+    collect 이면 범위 안에서 건너뛴 bad line 의 (범위 시작 위치, 줄 번호, None, 이유) 목록을 같이 리턴
+    """
+    with open(filename, 'rb') as fp:
+        fp.seek(start)
+        data = fp.read(end - start)
+    collector = _BadLineCollector()
+    if collect:
+        df = collector.read_csv(io.BytesIO(data), read_kwargs, start)
+    else:
+        # noinspection PyTypeChecker
+        df = pd.read_csv(io.BytesIO(data), **read_kwargs)
+    try:
+        return frame_to_ipc(df), list(df.columns), collector.records
+    except Exception as e:
+        logger.debug(f"'{filename}' range [{start}, {end}) arrow ipc raise: {e}")
+        return df, None, collector.records
+
+
+class _BadLineCollector:
+    """내부 클래스 on_bad_lines='collect' 에서 건너뛴 bad line 을 (범위 시작 위치, 줄 번호, 원문, 이유) 로 수집
+
+    pyarrow 엔진에는 invalid_row_handler 로 호출하여 원문을 바로 받고,
+    'python' 엔진은 읽을 때마다 만든 on_bad_lines 함수로 필드 목록을 받아서 구분자로 합친 원문만 받음.
+    'c' 엔진은 on_bad_lines='warn' 의 ParserWarning 에서 줄 번호와 이유만 받고,
+    경고 수집은 process 전체 상태를 바꾸므로 _CAPTURE_LOCK 으로 thread 간에 한번에 하나만 실행
+    """
+    LINE_PATTERN = re.compile(r'Skipping line (\d+): ([^\n]*)')
+
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, row) -> str:
+        self.records.append((0, row.number, row.text,
+                             f"expected {row.expected_columns} fields, saw {row.actual_columns}"))
+        return 'skip'
+
+    def read_csv(self, source, read_kwargs: dict, start: int = 0) -> pd.DataFrame:
+        """bad line 을 수집하면서 pd.read_csv 로 읽기
+
+        Args:
+            source: pd.read_csv 입력
+            read_kwargs: on_bad_lines='warn' 인 pd.read_csv 키워드 옵션
+            start: 읽은 입력의 byte 범위 시작 위치
+        """
+        if read_kwargs.get('engine') == 'python':
+            # noinspection PyTypeChecker
+            return pd.read_csv(source, **self.python_kwargs(read_kwargs, start))
+        with self.capture(start):
+            # noinspection PyTypeChecker
+            return pd.read_csv(source, **read_kwargs)
+
+    def python_kwargs(self, read_kwargs: dict, start: int = 0) -> dict:
+        """'python' 엔진의 on_bad_lines 를 이 collector 에 수집하는 함수로 바꾼 키워드 옵션
+
+        'python' 엔진은 필드가 많은 줄만 함수로 전달하고 줄 번호는 주지 않으므로,
+        줄 번호는 _find_bad_records 에서 원문으로 찾음
+        """
+        sep = read_kwargs.get('sep', read_kwargs.get('delimiter'))
+        sep = sep if isinstance(sep, str) and len(sep) == 1 else ','
+
+        def collect(fields: list):
+            self.records.append((start, None, sep.join(fields), f"too many fields, saw {len(fields)}"))
+            return None
+
+        return dict(read_kwargs, on_bad_lines=collect)
+
+    @contextmanager
+    def capture(self, start: int = 0):
+        """with 블럭의 pd.read_csv bad line 경고를 수집. 다른 경고는 블럭이 끝난 뒤 다시 발생시킴
+
+        경고 수집은 process 전체의 warnings 상태를 바꾸므로 _CAPTURE_LOCK 을 잡고 실행
+
+        Args:
+            start: 읽은 입력의 byte 범위 시작 위치. 줄 번호는 범위 시작부터 센 record 번호
+        """
+        with _CAPTURE_LOCK, warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            try:
+                yield self
+            finally:
+                others = []
+                for item in caught:
+                    matches = self.LINE_PATTERN.findall(str(item.message)) \
+                        if issubclass(item.category, pd.errors.ParserWarning) else []
+                    if len(matches) == 0:
+                        others.append(item)
+                    self.records.extend((start, int(line), None, reason) for line, reason in matches)
+        for item in others:
+            warnings.warn_explicit(item.message, item.category, item.filename, item.lineno)
+
+    def clear(self):
+        self.records.clear()
+
+
+class _TextSink:
+    """내부 클래스 pyarrow CSVWriter 가 쓰는 utf-8 byte 를 text 모드 file object 에 문자열로 쓰기"""
+
+    closed = False
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def write(self, data) -> int:
+        self.fp.write(self.decoder.decode(bytes(data)))
+        return len(data)
+
+    def flush(self):
+        self.fp.flush()
+
+    def close(self):
+        pass
+
 
 class CsvHandler(FileformatBase):
     """CSV file handler
@@ -16,8 +155,25 @@ class CsvHandler(FileformatBase):
     """
     format = "csv"
 
+    ENGINES = ('c', 'python', 'pyarrow', 'auto')
+    # engine='auto' 에서 pyarrow 를 사용하는 최소 입력 byte 크기. 작은 파일은 thread 준비 비용이 더 큼
+    ARROW_AUTO_MIN_BYTES = 1024 * 1024
+    # dump(engine='pyarrow') 의 quoting 별 pyarrow quoting_style
+    ARROW_QUOTING_STYLES = {0: 'needed', 1: 'all_valid'}
+    # dump() 에서 한번에 변환하여 쓰는 기본 row 수
+    WRITE_CHUNK_ROWS = 100_000
+    # load(filter=) 에서 chunksize 를 지정하지 않았을 때의 chunk row 수
+    FILTER_CHUNK_ROWS = 100_000
+    # load(workers=) 에서 process 하나가 맡는 최소 byte 범위
+    PARALLEL_MIN_RANGE_BYTES = 16 * 1024 * 1024
+
     def __init__(self, processing_type='array', encoding='utf-8', error_log='error.log',
-                 delimiter=',', quotechar='"', quoting=0, escapechar='\\'):
+                 delimiter=',', quotechar='"', quoting=0, escapechar='\\',
+                 memory_limit: int = None, spill_dir: str = None,
+                 compression: Union[str, dict, None] = 'infer', use_mmap: bool = False,
+                 engine: Literal['c', 'python', 'pyarrow', 'auto'] = 'c', dtype_backend: str = None,
+                 schema_cache: Union[SchemaCache, str, bool] = None, categorize: str = None,
+                 dump_engine: Literal['c', 'python', 'pyarrow', 'auto'] = 'c'):
         """CSV 파일 핸들러 초기화 메쏘드
 
         학습데이터는 processing_type='array' 사용. 누적 후 to_pandas()로 최종 dataframe 획득
@@ -32,68 +188,179 @@ class CsvHandler(FileformatBase):
             quotechar: 인용 문자
             quoting (int): 인용문자 사용빈도에 정책,  0: QUOTE_MINIMAL, 1: QUOTE_ALL, 2: QUOTE_NONNUMERIC, 3: QUOTE_NONE
             escapechar: 예외처리 문자
+            memory_limit (int): 누적 데이터의 메모리 최대 byte 크기. 넘으면 임시 파일로 spill
+            spill_dir (str): spill 임시 파일 디렉토리
+            compression: 파일명 사용 시의 압축 형식. 'infer' 는 확장자와 첫 byte 로 판별, None 은 압축하지 않음
+            use_mmap (bool): True 이면 압축하지 않은 파일명 입력을 memory map 으로 읽음
+            engine: load() 의 CSV parser. 'c', 'python' 은 pd.read_csv 엔진,
+                'pyarrow' 는 multithread pyarrow.csv reader 사용, 지원하지 않는 옵션이면 'c' 로 대체.
+                'auto' 는 ARROW_AUTO_MIN_BYTES 이상 크기의 입력에만 'pyarrow' 사용
+            dtype_backend: None 이면 numpy dtype, 'numpy_nullable' 이면 pandas nullable dtype,
+                'pyarrow' 이면 pd.ArrowDtype 컬럼으로 읽음
+            schema_cache: 파일명 입력의 dtype, 날짜 컬럼 추론 결과를 layout 별로 재사용하는 SchemaCache,
+                cache JSON 파일명 또는 True (process 안에서 공유하는 메모리 cache)
+            categorize (str): 'auto' 이면 low cardinality 문자열 컬럼을 pandas categorical 로 읽음
+            dump_engine: dump() 의 기본 CSV writer. 'pyarrow' 는 값 형식이 df.to_csv 와 다르므로 기본값은 'c'
         """
-        super().__init__(processing_type=processing_type, encoding=encoding, error_log=error_log)
+        super().__init__(processing_type=processing_type, encoding=encoding, error_log=error_log,
+                         memory_limit=memory_limit, spill_dir=spill_dir,
+                         compression=compression, use_mmap=use_mmap, categorize=categorize)
         self.delimiter = delimiter
         self.quotechar = quotechar
         self.quoting = quoting
         self.escapechar = escapechar
+        if engine not in CsvHandler.ENGINES:
+            raise ValueError(f"{engine=} is not supported, use one of {CsvHandler.ENGINES}")
+        self.engine = engine
+        if dump_engine not in CsvHandler.ENGINES:
+            raise ValueError(f"{dump_engine=} is not supported, use one of {CsvHandler.ENGINES}")
+        self.dump_engine = dump_engine
+        self.dtype_backend = dtype_backend
+        self.schema_cache = schema_cache
 
+    @instrument('load')
     def load(self, file_or_filename: Union[io.TextIOWrapper, io.BytesIO, io.BufferedIOBase, str],
-             header: Union[int, list] = 0, skiprows: int = 0, nrows: int = None, usecols=None, **kwargs) -> Optional[pd.DataFrame]:
+             header: Union[int, list] = 0, skiprows: int = 0, nrows: int = None, usecols=None,
+             chunksize: int = None, transform: Callable[[pd.DataFrame], pd.DataFrame] = None,
+             workers: int = None, filter: Union[str, dict, Callable] = None,
+             incremental: Union[bool, str, TailCheckpoint] = False, **kwargs) -> Optional[pd.DataFrame]:
         """CSV 파일 읽기
 
             CSV 파일을 읽고 dataframe 으로 처리함
 
+            chunksize 를 지정하면 파일을 chunksize row 단위로 읽으면서 usecols, dtype 과 transform 을
+            chunk 마다 적용하여 pass_list 에 추가함. 파일 전체의 중간 dataframe 을 만들지 않으므로
+            load 중 최대 메모리 사용량이 최종 dataframe 크기에 가까움
+
+            workers 를 지정하면 압축하지 않은 큰 파일을 인용문자를 고려한 record 경계의 byte 범위로 나누어
+            process pool 에서 같은 헤더와 옵션으로 읽고 파일 순서대로 합침
+
+            filter 를 지정하면 chunksize (기본값 FILTER_CHUNK_ROWS) 단위로 읽으면서 chunk 마다 조건에 맞는 row 만
+            남기고 transform 을 적용함. 버려진 row 는 pass_list 에 누적되지 않으므로 usecols 와 같이 사용하면
+            남은 row 크기의 메모리로 읽음. 'object' 결과는 0 부터 시작하는 index 로 리턴
+
+            incremental 을 지정하면 checkpoint 에 저장된 byte 위치 이후에 추가된 완전한 record 만 읽고
+            읽기에 성공하면 checkpoint 를 갱신함. 파일이 rotation 되거나 잘린 경우에는 처음부터 다시 읽음
+
         Args:
             file_or_filename (file-like object): file object or file name
             header (Union[int, list]): 헤더로 사용될 row index, 멀티헤더인 경우에는 [1, 2, 3] 형태로 사용
             skiprows (int) : 데이터를 읽기 위해서 스킵할 row 숫자 지정. (header 로 부터 스킵 숫자)
             nrows (int): skiprows 부터 N개의 데이터 row 건수만 읽을 경우 지정
             usecols (Union[int, list]): 전체 컬럼 사용시 None, 컬럼 번호나 이름의 리스트 [0, 1, 2] or ['foo', 'bar', 'baz']
-            **kwargs : 추가 키워드 옵션
+            chunksize (int): 지정하면 chunksize row 단위로 나누어 읽음. pyarrow 엔진 대신 'c' 엔진 사용
+            transform (Callable): dataframe 을 받아서 변환한 dataframe 을 리턴하는 함수. chunksize 지정 시에는 chunk 마다 적용
+            workers (int): 1 보다 크면 파일 하나를 최대 workers 개 process 에서 나누어 읽음.
+                nrows, chunksize 지정, 압축 파일, 작은 파일이나 pyarrow 엔진은 한번에 읽음.
+                범위마다 dtype 을 추론하므로 범위에 따라 type 이 달라질 수 있는 컬럼은 dtype 지정 권고
+            filter (Union[str, dict, Callable]): row 조건. 문자열은 df.query() 식 예) "age > 30 and region == 'seoul'",
+                dictionary 는 {컬럼: 값, 값 목록 또는 Series 를 받아 bool mask 를 리턴하는 함수} 를 모두 만족하는 row,
+                함수는 chunk dataframe 을 받아 bool mask 를 리턴. dictionary 의 컬럼은 usecols 에 없어도 읽어서 검사
+            incremental: True 이면 '<파일명>.checkpoint' sidecar 파일, 문자열이면 그 checkpoint 파일명,
+                또는 TailCheckpoint 사용. 압축하지 않은 로컬 파일명만 지원하고 nrows 와 같이 사용할 수 없음.
+                새 record 가 없으면 'object' 는 빈 dataframe 리턴
+            **kwargs : 추가 키워드 옵션. engine, dtype_backend, schema_cache 는 handler 설정 대신 사용.
+                on_bad_lines 기본값 'collect' 는 필드 수가 맞지 않는 줄을 건너뛰고 (원문, 줄 번호, 이유) 를
+                fail_list 에 추가. 줄 번호는 헤더와 빈 줄을 포함하여 1 부터 센 record 번호이고
+                'python' 엔진은 인용문자 안 줄바꿈 뒤의 줄 번호가 다를 수 있음
         """
-        fp = None
-        opened = None
         try:
-            # file_or_filename 객체가 지원되는 file-like object 또는 filename string 인지 검사
-            open_mode = self._decide_rw_open_mode('load')
-            fp, binary_mode, opened = self._get_file_obj(file_or_filename, open_mode)
-
-            # kwargs pop ?
-            kw_encoding = kwargs.pop('encoding', self.encoding)
-            kw_sep = kwargs.pop('sep', self.delimiter)
-            kw_quotechar = kwargs.pop('quotechar', self.quotechar)
-            kw_escapechar = kwargs.pop('escapechar', self.escapechar)
-            kw_infer_datetime_format = kwargs.pop('infer_datetime_format', True)
-            kw_on_bad_lines = kwargs.pop('on_bad_lines', 'warn')
+            tail = None
+            if incremental:
+                tail = self._read_tail(file_or_filename, incremental, header, skiprows, nrows,
+                                       kwargs.get('encoding', self.encoding))
+                if tail is None:
+                    return pd.DataFrame() if self.processing_type == FileformatBase.TYPE_OBJECT else None
+                file_or_filename = io.BytesIO(tail.data)
+            schema_cache = get_schema_cache(kwargs.pop('schema_cache', self.schema_cache))
+            read_kwargs = self._build_read_kwargs(header, skiprows, nrows, usecols, kwargs)
+            engine = read_kwargs.pop('engine', self.engine)
+            collector = self._bad_line_collector(read_kwargs)
+            position = self._read_position(file_or_filename)
+            if filter is not None:
+                transform = self._filter_transform(filter, read_kwargs, transform)
+                chunksize = chunksize or CsvHandler.FILTER_CHUNK_ROWS
+            schema_key = None
+            if schema_cache is not None:
+                schema_key = self._apply_schema_cache(schema_cache, file_or_filename, read_kwargs)
 
-            # noinspection PyTypeChecker
-            df = pd.read_csv(
-                fp,
-                encoding=kw_encoding,
-                sep=kw_sep,
-                quotechar=kw_quotechar,
-                escapechar=kw_escapechar,
-                header=header,
-                skiprows=skiprows,
-                nrows=nrows,
-                usecols=usecols,
-                on_bad_lines=kw_on_bad_lines,
-                **kwargs
-            )
+            rows_before = self._accumulated_rows()
+            try:
+                df = self._read_source(file_or_filename, read_kwargs, engine, chunksize, transform, workers, collector)
+            except (ValueError, TypeError) as e:
+                # cache 된 dtype 과 맞지 않는 파일은 schema 없이 다시 읽고 cache 의 dtype 을 넓힘
+                if schema_key is None or self._accumulated_rows() != rows_before:
+                    raise e
+                logger.warning(f"{file_or_filename} cached schema raise {e}, read without schema")
+                read_kwargs.pop('dtype', None)
+                read_kwargs.pop('parse_dates', None)
+                if collector is not None:
+                    collector.clear()
+                df = self._read_source(file_or_filename, read_kwargs, engine, chunksize, transform, workers, collector)
+                if df is not None and transform is None:
+                    schema_cache.widen(schema_key, schema_cache.infer(df))
+                    df = schema_cache.conform(df, schema_cache.get(schema_key))
+                else:
+                    sample = self._read_schema_sample(file_or_filename, read_kwargs, schema_cache.sample_rows)
+                    schema_cache.widen(schema_key, schema_cache.infer(sample))
 
+            self._append_bad_lines(collector, file_or_filename, position, read_kwargs)
+            if tail is not None:
+                tail.commit()
             if self.processing_type == FileformatBase.TYPE_OBJECT:
-                return df
-            else:
+                if filter is not None and df is not None:
+                    df = df.reset_index(drop=True)
+                return self._categorize_frame(df)
+            elif df is not None:
                 self.pass_list.append(df)
+                self._check_memory_limit()
         except Exception as e:
-            self.fail_list.append(str(file_or_filename))
+            self.fail_list.append(None, source=file_or_filename, reason=e)
             logger.error(f"{file_or_filename} load raise: {e}")
+
+    @instrument('iter_chunks')
+    def iter_chunks(self, file_or_filename: Union[io.TextIOWrapper, io.BytesIO, io.BufferedIOBase, str],
+                    chunk_rows: int = 10000, header: Union[int, list] = 0, skiprows: int = 0, nrows: int = None,
+                    usecols=None, transform: Callable[[pd.DataFrame], pd.DataFrame] = None,
+                    filter: Union[str, dict, Callable] = None, **kwargs) -> Iterator[pd.DataFrame]:
+        """CSV 파일을 chunk_rows 단위 dataframe 으로 나누어 읽기
+
+        load() 와 같은 옵션을 사용하고 결과는 pass_list 에 누적하지 않음
+
+        Args:
+            file_or_filename (file-like object): file object or file name
+            chunk_rows (int): chunk 1개의 최대 row 수
+            header (Union[int, list]): 헤더로 사용될 row index, 멀티헤더인 경우에는 [1, 2, 3] 형태로 사용
+            skiprows (int) : 데이터를 읽기 위해서 스킵할 row 숫자 지정. (header 로 부터 스킵 숫자)
+            nrows (int): skiprows 부터 N개의 데이터 row 건수만 읽을 경우 지정
+            usecols (Union[int, list]): 전체 컬럼 사용시 None, 컬럼 번호나 이름의 리스트 [0, 1, 2] or ['foo', 'bar', 'baz']
+            transform (Callable): chunk 마다 적용할 dataframe 변환 함수
+            filter (Union[str, dict, Callable]): chunk 마다 transform 전에 적용할 row 조건. load() 의 filter 와 같음
+            **kwargs : 추가 키워드 옵션
+
+        Returns:
+            pd.DataFrame generator
+        """
+        fp = None
+        opened = False
+        try:
+            read_kwargs = self._build_read_kwargs(header, skiprows, nrows, usecols, kwargs)
+            if filter is not None:
+                transform = self._filter_transform(filter, read_kwargs, transform)
+            collector = self._bad_line_collector(read_kwargs)
+            position = self._read_position(file_or_filename)
+            fp, opened, read_kwargs = self._get_read_source(file_or_filename, read_kwargs)
+            yield from self._iter_read_chunks(fp, read_kwargs, chunk_rows, transform, collector)
+            self._safe_close(fp, opened)
+            fp, opened = None, False
+            self._append_bad_lines(collector, file_or_filename, position, read_kwargs)
+        except Exception as e:
+            self.fail_list.append(None, source=file_or_filename, reason=e)
+            logger.error(f"{file_or_filename} iter_chunks raise: {e}")
         finally:
             self._safe_close(fp, opened)
 
-
+    @instrument('loads')
     def loads(self, str_or_bytes: Union[str, bytes],
               header=0, skiprows=0, nrows=None, usecols=None) -> pd.DataFrame:
         """문자열이나 bytes 에서 CSV 읽기
@@ -117,13 +384,14 @@ class CsvHandler(FileformatBase):
                 if self.processing_type == FileformatBase.TYPE_OBJECT:
                     return df
         except Exception as e:
-            self.fail_list.append(str_or_bytes)
-            logger.error(f"'{str_or_bytes}' loads raise {e}")
+            self.fail_list.append(str_or_bytes, reason=e)
+            logger.error(f"loads [{len(str_or_bytes)}] raise {e}")
 
+    @instrument('to_pandas')
     def to_pandas(self) -> pd.DataFrame:
         """클래스 내부메쏘드 CSV 파일 처리 결과를 pd.DataFrame 형태로 pass_list 에 저장
 
-        내부적으로 추가할 데이터(pass_list)가 있으면 모두 통합하여 새로운 dataframe 을 생성함
+        내부적으로 추가할 데이터(pass_list)가 있으면 data_buffer 에 추가하여 dataframe 을 생성함
         실패 목록(fail_list)가 있으면 파일로 저장
         학습을 위한 dataframe 이기 떄문에 dot('.') 문자로 normalize 된 flatten 컬럼과 값을 가진다.
 
@@ -133,83 +401,76 @@ class CsvHandler(FileformatBase):
             logger.error(f"{self.processing_type} not support to_pandas() method")
             raise TypeError(f"processing_type '{self.processing_type}' support to_pandas() method")
 
-        if len(self.pass_list) > 0:
-            try:
-                if len(self.data_df) > 0:
-                    df_list = [self.data_df].extend(self.pass_list)
-                else:
-                    df_list = self.pass_list
-                merge_df = pd.concat(df_list, ignore_index=True)
-                self.data_df = merge_df
-            except Exception as e:
-                logger.error(f"pass_list[{len(self.pass_list)}] to_pandas raise: {e}")
-                self.fail_list.extend(self.pass_list)
-            finally:
-                self.pass_list.clear()
-
-        if len(self.fail_list) > 0:
-            error_fp = None
-            try:
-                error_fp = open(self.error_log, mode='ab')
-            except Exception as e:
-                logger.error(f"fail_list[{len(self.fail_list)}] error log append raise: {e}")
+        self._merge_pass_list()
 
-            if error_fp:
-                for fail in self.fail_list:
-                    try:
-                        if not isinstance(fail, str):
-                            fail_str = str(fail)
-                        else:
-                            fail_str = fail
-                        fail_bytes = fail_str.encode(self.encoding)
-                        error_fp.write(fail_bytes)
-                        error_fp.write(b'\n')
-                    except Exception as e:
-                        logger.exception(e)
-                error_fp.close()
-                self.fail_list.clear()
+        self._flush_fail_list()
         return self.data_df
 
+    @instrument('dump')
     def dump(self, file_or_filename, data: pd.DataFrame = None, **kwargs):
         """데이터를 CSV 파일로 쓰기
 
         파일은 text, binary 모드 파일객체이거나 파일명 문자열
+
+        engine='pyarrow' 이면 pyarrow.csv.CSVWriter 로 chunk_rows 단위 record batch 를 streaming 으로 씀.
+        quotechar 는 '"', quoting 은 0 (QUOTE_MINIMAL) 또는 1 (QUOTE_ALL), escapechar 는 None 만 지원하고
+        그 밖의 옵션이면 df.to_csv 로 대체. pyarrow 는 문자열 값과 헤더를 모두 인용문자로 감싸고 bool, 날짜/시간, 실수를
+        pyarrow 형식 (true, 2024-01-01 00:00:00.000000000, 1) 으로 씀
         Args:
             file_or_filename (file, str): 파일객체 또는 파일명
             data: dataframe 으로 설정시 사용. 기존 유틸리티의 호환성을 위해서 남김
             kwargs : optional key value args
+                engine: 'c', 'python' 은 df.to_csv 사용, 'pyarrow' 는 CSVWriter 사용,
+                    'auto' 는 지원하는 옵션이면 'pyarrow' 사용. 기본값은 handler 의 dump_engine
+                chunk_rows (int): 한번에 변환하여 쓰는 row 수. 기본값은 WRITE_CHUNK_ROWS
         """
-        open_mode = self._decide_rw_open_mode('dump')
+        kw_encoding = kwargs.pop('encoding', self.encoding)
+        kw_sep = kwargs.pop('sep', self.delimiter)
+        kw_quotechar = kwargs.pop('quotechar', self.quotechar)
+        kw_escapechar = kwargs.pop('escapechar', self.escapechar)
+        kw_quoting = kwargs.pop('quoting', self.quoting)
+        kw_index = kwargs.pop('index', False)
+        engine = kwargs.pop('engine', self.dump_engine)
+        chunk_rows = kwargs.pop('chunk_rows', None)
+
+        write_options = None
+        if engine in ('pyarrow', 'auto'):
+            write_options, reason = self._arrow_write_options(kw_sep, kw_quotechar, kw_quoting, kw_escapechar,
+                                                              kw_index)
+            if write_options is None and engine == 'pyarrow':
+                logger.warning(f"pyarrow csv writer not support {reason}, use df.to_csv")
+        # pyarrow 는 utf-8 byte 를 쓰므로 utf-8 파일명은 binary 모드로 열어서 decode 하지 않음
+        if write_options is not None and str(kw_encoding).lower().replace('_', '-') in ('utf-8', 'utf8'):
+            open_mode = 'wb'
+        else:
+            open_mode = self._decide_rw_open_mode('dump')
         fp, binary_mode, opened = self._get_file_obj(file_or_filename, open_mode)
 
         try:
-            if data is None:
-                df = self.to_pandas()
+            if data is None and self.data_buffer.spilled:
+                # spill 된 데이터는 전체 dataframe 을 만들지 않고 chunk 단위로 쓰기
+                self._flush_pass_list()
+                df_list = self.data_buffer.iter_frames()
+            elif data is None:
+                df_list = [self.to_pandas()]
+            else:
+                df_list = [data]
+
+            to_csv_kwargs = dict(encoding=kw_encoding, sep=kw_sep, quotechar=kw_quotechar, escapechar=kw_escapechar,
+                                 quoting=kw_quoting, index=kw_index)
+            if write_options is not None:
+                self._write_csv_arrow(fp, binary_mode, df_list, write_options,
+                                      chunk_rows or CsvHandler.WRITE_CHUNK_ROWS, to_csv_kwargs)
             else:
-                df = data
-
-                # kwargs pop ?
-            kw_encoding = kwargs.pop('encoding', self.encoding)
-            kw_sep = kwargs.pop('sep', self.delimiter)
-            kw_quotechar = kwargs.pop('quotechar', self.quotechar)
-            kw_escapechar = kwargs.pop('escapechar', self.escapechar)
-            kw_quoting = kwargs.pop('quoting', self.quoting)
-            kw_index = kwargs.pop('index', False)
-            df.to_csv(
-                fp,
-                encoding=kw_encoding,
-                sep=kw_sep,
-                quotechar=kw_quotechar,
-                escapechar=kw_escapechar,
-                quoting=kw_quoting,
-                index=kw_index
-            )
+                for i, df in enumerate(df_list):
+                    df.to_csv(fp, header=(i == 0), chunksize=chunk_rows, **to_csv_kwargs)
         except Exception as e:
-            self.fail_list.append(str(file_or_filename))
+            self.fail_list.append(None, source=file_or_filename, reason=e)
             logger.error(f"{file_or_filename} load raise: {e}")
         finally:
             self._safe_close(fp, opened)
 
+    @instrument('dumps')
     def dumps(self, data: pd.DataFrame = None) -> str:
         """데이터를 CSV 파일로 쓰기
 
@@ -231,6 +492,880 @@ class CsvHandler(FileformatBase):
     클래스 내부 메쏘드   
     """
 
+    def _get_read_source(self, file_or_filename, read_kwargs: dict) -> Tuple[object, bool, dict]:
+        """내부메쏘드 pd.read_csv() 에 전달할 입력과 키워드 옵션 결정
+
+        use_mmap 이면 파일명을 그대로 전달하여 pandas 가 memory map 으로 읽음
+
+        Returns:
+            (입력 file object 또는 파일명, 이 메쏘드에서 열었는지 여부, pd.read_csv() 키워드 옵션) tuple
+        """
+        if self._can_mmap(file_or_filename):
+            read_kwargs['memory_map'] = True
+            return file_or_filename, False, read_kwargs
+        fp, binary_mode, opened = self._get_file_obj(file_or_filename, self._decide_rw_open_mode('load'))
+        return fp, opened, read_kwargs
+
+    def _read_source(self, file_or_filename, read_kwargs: dict, engine: str, chunksize: Optional[int],
+                     transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]],
+                     workers: Optional[int] = None,
+                     collector: _BadLineCollector = None) -> Optional[pd.DataFrame]:
+        """내부메쏘드 load() 의 engine 별 읽기
+
+        collector 를 지정하면 건너뛴 bad line 을 collector 에 수집
+
+        Returns:
+            읽은 dataframe. chunksize 나 workers 로 나누어 읽은 'array' 는 조각을 바로 누적하고 None
+        """
+        fp = None
+        opened = False
+        try:
+            if chunksize is not None:
+                if engine in ('c', 'python'):
+                    read_kwargs['engine'] = engine
+                fp, opened, read_kwargs = self._get_read_source(file_or_filename, read_kwargs)
+                return self._load_chunks(fp, read_kwargs, chunksize, transform, collector)
+
+            if workers is not None and workers > 1 and engine in ('c', 'python'):
+                frames = self._read_csv_parallel(file_or_filename, read_kwargs, workers, collector)
+                if frames is not None:
+                    if transform is not None:
+                        frames = [transform(frame) for frame in frames]
+                    if self.processing_type == FileformatBase.TYPE_OBJECT:
+                        return pd.concat(frames, ignore_index=True)
+                    for frame in frames:
+                        self.pass_list.append(frame)
+                        self._check_memory_limit()
+                    return None
+
+            df = None
+            if engine in ('pyarrow', 'auto'):
+                df = self._read_csv_arrow(file_or_filename, read_kwargs, engine, collector)
+            if df is None:
+                if engine in ('c', 'python'):
+                    read_kwargs['engine'] = engine
+                # file_or_filename 객체가 지원되는 file-like object 또는 filename string 인지 검사
+                fp, opened, read_kwargs = self._get_read_source(file_or_filename, read_kwargs)
+                if collector is not None:
+                    df = collector.read_csv(fp, read_kwargs)
+                else:
+                    # noinspection PyTypeChecker
+                    df = pd.read_csv(fp, **read_kwargs)
+            if transform is not None:
+                df = transform(df)
+            return df
+        finally:
+            self._safe_close(fp, opened)
+
+    def _read_csv_parallel(self, file_or_filename, read_kwargs: dict, workers: int,
+                           collector: _BadLineCollector = None) -> Optional[List[pd.DataFrame]]:
+        """내부메쏘드 큰 CSV 파일 하나를 byte 범위로 나누어 process pool 에서 읽기
+
+        헤더는 먼저 읽어서 모든 범위에 names 로 전달하고, 범위 경계는 인용문자 밖의 줄바꿈으로 맞춤.
+        나눌 수 없는 입력이나 옵션이면 None 을 리턴하여 한번에 읽도록 함.
+        범위마다 dtype 을 추론하므로 범위별 컬럼 dtype 이 한번에 읽은 결과와 다르게 합쳐지면 None 을 리턴
+
+        Returns:
+            파일 순서대로 범위별 dataframe 목록 또는 None
+        """
+        if not isinstance(file_or_filename, str) or not os.path.isfile(file_or_filename) \
+                or infer_compression(file_or_filename, 'rb', self.compression):
+            return None
+        header = read_kwargs.get('header')
+        skiprows = read_kwargs.get('skiprows') or 0
+        encoding = (read_kwargs.get('encoding') or 'utf-8').lower().replace('_', '-')
+        if read_kwargs.get('nrows') is not None or not isinstance(skiprows, int) \
+                or (header is not None and (not isinstance(header, int) or isinstance(header, bool))) \
+                or encoding.startswith(('utf-16', 'utf-32')) \
+                or any(key in read_kwargs for key in ('names', 'index_col', 'skipfooter', 'comment')):
+            return None
+        file_size = os.path.getsize(file_or_filename)
+        range_count = min(workers, file_size // CsvHandler.PARALLEL_MIN_RANGE_BYTES)
+        if range_count <= 1:
+            return None
+
+        head_kwargs = {key: value for key, value in read_kwargs.items()
+                       if key not in ('nrows', 'usecols', 'dtype', 'parse_dates', 'memory_map', 'engine')}
+        # noinspection PyTypeChecker
+        columns = pd.read_csv(file_or_filename, nrows=0, **head_kwargs).columns
+        quoting = read_kwargs.get('quoting', 0)
+        quotechar = None if quoting == 3 else read_kwargs.get('quotechar')
+        ranges = CsvHandler._split_csv_ranges(file_or_filename, file_size, range_count, skiprows,
+                                              0 if header is None else header + 1,
+                                              quotechar, read_kwargs.get('escapechar'))
+        if len(ranges) <= 1:
+            return None
+
+        range_kwargs = {key: value for key, value in read_kwargs.items() if key not in ('memory_map', 'nrows')}
+        range_kwargs.update(header=None, names=list(columns), skiprows=0)
+        if range_kwargs.get('encoding', '').lower().replace('_', '-') == 'utf-8-sig':
+            range_kwargs['encoding'] = 'utf-8'
+        logger.debug(f"{file_or_filename} parallel load {len(ranges)} ranges")
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [pool.submit(_parse_csv_range, file_or_filename, start, end, range_kwargs,
+                                   collector is not None)
+                       for start, end in ranges]
+            results = [future.result() for future in futures]
+        frames = []
+        bad_lines = []
+        for result, frame_columns, range_bad_lines in results:
+            if frame_columns is not None:
+                result = ipc_to_frame(result)
+                result.columns = frame_columns
+            frames.append(result)
+            bad_lines.extend(range_bad_lines)
+        mismatched = CsvHandler._mismatched_columns(frames)
+        if len(mismatched) > 0:
+            logger.debug(f"{file_or_filename} parallel ranges inferred different dtypes {mismatched}, read at once")
+            return None
+        if collector is not None:
+            collector.records.extend(bad_lines)
+        return frames
+
+    @staticmethod
+    def _mismatched_columns(frames: List[pd.DataFrame]) -> list:
+        """내부함수 범위별 dataframe 에서 dtype 이 달라 한번에 읽은 결과와 다르게 합쳐지는 컬럼 목록
+
+        int64 범위와 결측값이 있는 float64 범위는 pd.concat 으로 한번에 읽은 결과와 같은 float64 가 됨
+        """
+        numeric = {np.dtype(np.int64), np.dtype(np.float64)}
+        mismatched = []
+        for index, col in enumerate(frames[0].columns):
+            dtypes = {frame.dtypes.iloc[index] for frame in frames}
+            if len(dtypes) > 1 and not dtypes <= numeric:
+                mismatched.append(col)
+        return mismatched
+
+    @staticmethod
+    def _split_csv_ranges(filename: str, file_size: int, range_count: int, skiprows: int, header_records: int,
+                          quotechar: Optional[str], escapechar: Optional[str]) -> List[Tuple[int, int]]:
+        """내부함수 헤더 다음부터 파일 끝까지를 record 경계에 맞춘 range_count 개 이하의 byte 범위로 나눔
+
+        인용문자 안의 줄바꿈은 record 경계가 아니므로, 시작 위치부터 인용문자 수의 홀짝으로 인용 여부를 판별.
+        escapechar 바로 뒤의 인용문자는 세지 않음
+
+        Returns:
+            [(start, end), ...] byte 범위 목록
+        """
+        quote = ord(quotechar) if quotechar and len(quotechar.encode()) == 1 else None
+        escape = ord(escapechar) if escapechar and len(escapechar.encode()) == 1 else None
+        with open(filename, 'rb') as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = np.frombuffer(mm, dtype=np.uint8)
+            try:
+                ranges = CsvHandler._find_csv_ranges(mm, data, file_size, range_count, skiprows, header_records,
+                                                     quote, escape)
+            finally:
+                # mmap 을 닫기 전에 buffer 참조를 해제
+                del data
+        return ranges
+
+    @staticmethod
+    def _find_csv_ranges(mm, data: np.ndarray, file_size: int, range_count: int, skiprows: int,
+                         header_records: int, quote: Optional[int], escape: Optional[int]) -> List[Tuple[int, int]]:
+        """내부함수 _split_csv_ranges() 의 memory map 경계 계산"""
+        def count_quotes(start, end):
+            if quote is None or end <= start:
+                return 0
+            segment = data[start:end]
+            is_quote = segment == quote
+            count = int(np.count_nonzero(is_quote))
+            if escape is not None and count > 0:
+                count -= int(np.count_nonzero(is_quote[1:] & (segment[:-1] == escape)))
+            return count
+
+        def next_record(pos, parity):
+            # pos 부터 인용문자 밖의 줄바꿈 다음 위치와 그때까지의 홀짝
+            while pos < file_size:
+                newline = mm.find(b'\n', pos)
+                if newline < 0:
+                    return file_size, parity
+                parity = (parity + count_quotes(pos, newline)) % 2
+                pos = newline + 1
+                if parity == 0:
+                    return pos, parity
+            return file_size, parity
+
+        # skiprows 줄과 빈 줄을 제외한 header_records 개 record 를 건너뛴 위치가 데이터 시작
+        pos = 0
+        for _ in range(skiprows):
+            pos, _ = next_record(pos, 0)
+        remain = header_records
+        while remain > 0 and pos < file_size:
+            end, _ = next_record(pos, 0)
+            if mm[pos:end].strip(b'\r\n') != b'':
+                remain -= 1
+            pos = end
+        data_start = pos
+
+        ranges = []
+        step = max(1, (file_size - data_start) // range_count)
+        start = data_start
+        while start < file_size:
+            target = start + step if len(ranges) < range_count - 1 else file_size
+            if target >= file_size:
+                ranges.append((start, file_size))
+                break
+            # target 위치의 인용 여부를 이어서 계산하고 다음 record 경계로 이동
+            parity = count_quotes(start, target) % 2
+            end, _ = next_record(target, parity)
+            ranges.append((start, end))
+            start = end
+        return ranges
+
+    def _apply_schema_cache(self, schema_cache: SchemaCache, file_or_filename, read_kwargs: dict) -> Optional[str]:
+        """내부메쏘드 schema cache 의 dtype, parse_dates 를 read_kwargs 에 추가
+
+        파일명 또는 저장소 경로 입력이고 header 가 1줄이며 dtype, parse_dates 를 직접 지정하지 않은 경우만 사용.
+        처음 보는 layout 이면 sample_rows 개 row 를 읽어서 추론한 결과를 cache 에 저장
+
+        Returns:
+            사용한 cache key 또는 cache 를 사용하지 않으면 None
+        """
+        if not isinstance(file_or_filename, str) and resolve_storage_path(file_or_filename) is None:
+            return None
+        header = read_kwargs.get('header')
+        if not isinstance(header, int) or isinstance(header, bool) \
+                or 'dtype' in read_kwargs or 'parse_dates' in read_kwargs:
+            return None
+
+        key = schema_cache.pattern_key(file_or_filename)
+        if key is None:
+            columns = self._read_schema_sample(file_or_filename, read_kwargs, 0).columns
+            key = SchemaCache.header_key(columns, read_kwargs.get('sep'))
+        entry = schema_cache.get(key)
+        if entry is None:
+            sample = self._read_schema_sample(file_or_filename, read_kwargs, schema_cache.sample_rows)
+            entry = schema_cache.infer(sample)
+            schema_cache.put(key, entry)
+        read_kwargs.update(schema_cache.read_kwargs(entry, read_kwargs.get('usecols')))
+        return key
+
+    def _read_schema_sample(self, file_or_filename, read_kwargs: dict, nrows: int) -> pd.DataFrame:
+        """내부메쏘드 schema 추론을 위해서 앞 nrows 개 row 를 모든 컬럼으로 읽기"""
+        sample_kwargs = {key: value for key, value in read_kwargs.items()
+                         if key not in ('nrows', 'usecols', 'dtype', 'parse_dates', 'engine', 'memory_map')}
+        fp, opened, sample_kwargs = self._get_read_source(file_or_filename, sample_kwargs)
+        try:
+            # noinspection PyTypeChecker
+            return pd.read_csv(fp, nrows=nrows, **sample_kwargs)
+        finally:
+            self._safe_close(fp, opened)
+
+    def _load_chunks(self, fp, read_kwargs: dict, chunksize: int,
+                     transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]],
+                     collector: _BadLineCollector = None) -> Optional[pd.DataFrame]:
+        """내부메쏘드 load(chunksize=) 의 chunk 단위 읽기
+
+        'array' 는 chunk 마다 pass_list 를 거쳐 data_buffer 의 컬럼 배열에 바로 복사하여
+        chunk 가 쌓이지 않고 to_pandas() 는 배열 view 로 dataframe 을 만듦.
+        'object' 는 chunk 를 모두 읽은 뒤 한번 concat 하여 리턴.
+        categorize='auto' 이면 chunk 마다 categorical 로 변환하는 DataBuffer 에 누적하여 리턴
+        """
+        chunk_list = []
+        chunk_buffer = DataBuffer(categorize=self.categorize) if self.categorize is not None else None
+        for chunk_df in self._iter_read_chunks(fp, read_kwargs, chunksize, transform, collector):
+            if chunk_buffer is not None and self.processing_type == FileformatBase.TYPE_OBJECT:
+                chunk_buffer.append(chunk_df)
+            elif self.processing_type == FileformatBase.TYPE_OBJECT:
+                chunk_list.append(chunk_df)
+            else:
+                self.pass_list.append(chunk_df)
+                self._flush_pass_list()
+        if chunk_buffer is not None and self.processing_type == FileformatBase.TYPE_OBJECT:
+            return chunk_buffer.to_frame()
+        if self.processing_type == FileformatBase.TYPE_OBJECT:
+            return pd.concat(chunk_list) if len(chunk_list) > 0 else pd.DataFrame()
+
+    @staticmethod
+    def _iter_read_chunks(fp, read_kwargs: dict, chunksize: int,
+                          transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]],
+                          collector: _BadLineCollector = None) -> Iterator[pd.DataFrame]:
+        """내부함수 pd.read_csv(chunksize=) 로 읽은 chunk 에 transform 을 적용하여 생성
+
+        collector 를 지정하면 chunk 를 읽는 동안의 bad line 경고만 수집하고 yield 중에는 경고를 가로채지 않음
+        """
+        if read_kwargs.get('engine') in ('pyarrow', 'auto'):
+            # pd.read_csv 의 pyarrow 엔진은 chunksize 를 지원하지 않음
+            read_kwargs.pop('engine')
+        python_engine = read_kwargs.get('engine') == 'python'
+        if collector is not None and python_engine:
+            read_kwargs = collector.python_kwargs(read_kwargs)
+        # noinspection PyTypeChecker
+        with pd.read_csv(fp, chunksize=chunksize, **read_kwargs) as reader:
+            while True:
+                try:
+                    if collector is not None and not python_engine:
+                        with collector.capture():
+                            chunk_df = next(reader)
+                    else:
+                        chunk_df = next(reader)
+                except StopIteration:
+                    break
+                if transform is not None:
+                    chunk_df = transform(chunk_df)
+                yield chunk_df
+
+    def _read_tail(self, filename, incremental, header, skiprows, nrows, encoding: str) -> Optional[TailRead]:
+        """내부메쏘드 load(incremental=) 의 checkpoint 이후 추가된 완전한 record 읽기
+
+        처음 읽을 때는 skiprows 줄과 헤더 줄을 헤더 byte 로 저장하고, 이어서 읽을 때는 헤더 byte 를 앞에 붙여서
+        같은 header, skiprows 옵션으로 읽을 수 있도록 함
+
+        Returns:
+            TailRead 또는 새 record 가 없으면 None
+        """
+        if nrows is not None:
+            raise ValueError(f"incremental load not support {nrows=}")
+        if not isinstance(skiprows, int):
+            raise ValueError(f"incremental load not support {skiprows=}")
+        if header is None:
+            header_records = skiprows
+        elif isinstance(header, int):
+            header_records = skiprows + header + 1
+        else:
+            header_records = skiprows + max(header) + 1
+        checkpoint = get_checkpoint(filename, incremental)
+        if infer_compression(filename, 'rb', self.compression):
+            raise ValueError(f"incremental load not support compressed file '{filename}'")
+        quote = self.quotechar.encode(encoding) if self.quoting != 3 and self.quotechar else None
+
+        def header_end(data: bytes) -> int:
+            pos = 0
+            for _ in range(header_records):
+                end = CsvHandler._next_record_end(data, pos, quote)
+                if end < 0:
+                    return -1
+                pos = end
+            return pos
+
+        def record_end(data: bytes, start: int) -> int:
+            end = data.rfind(b'\n', start)
+            while end >= start:
+                # 인용문자 안의 줄바꿈은 record 끝이 아님
+                if quote is None or data.count(quote, start, end) % 2 == 0:
+                    return end + 1
+                end = data.rfind(b'\n', start, end)
+            return start
+
+        return read_appended(checkpoint, record_end, header_end)
+
+    @staticmethod
+    def _next_record_end(data: bytes, start: int, quote: Optional[bytes]) -> int:
+        """내부함수 start 에서 시작하는 record 의 끝 (줄바꿈 다음) 위치, 줄바꿈이 없으면 -1"""
+        end = data.find(b'\n', start)
+        while end >= 0 and quote is not None and data.count(quote, start, end) % 2 == 1:
+            end = data.find(b'\n', end + 1)
+        return end + 1 if end >= 0 else -1
+
+    @staticmethod
+    def _filter_transform(row_filter: Union[str, dict, Callable], read_kwargs: dict,
+                          transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]]
+                          ) -> Callable[[pd.DataFrame], pd.DataFrame]:
+        """내부함수 load(filter=) 의 row 조건을 transform 앞에 적용하는 chunk 변환 함수 생성
+
+        dictionary 조건의 컬럼이 이름 usecols 에 없으면 read_kwargs 의 usecols 에 추가하고 검사 후 버림
+
+        Returns:
+            chunk dataframe 을 받아서 조건에 맞는 row 만 남기고 transform 을 적용하는 함수
+        """
+        if not isinstance(row_filter, (str, dict)) and not callable(row_filter):
+            raise TypeError(f"filter {type(row_filter).__name__} must be str, dict or callable")
+        extra_columns = []
+        usecols = read_kwargs.get('usecols')
+        if isinstance(row_filter, dict) and usecols is not None and not callable(usecols) \
+                and all(isinstance(col, str) for col in usecols):
+            extra_columns = [col for col in row_filter if col not in usecols]
+            read_kwargs['usecols'] = list(usecols) + extra_columns
+
+        def to_mask(values) -> np.ndarray:
+            # nullable bool 의 결측값은 False
+            if isinstance(values, pd.Series):
+                return values.fillna(False).to_numpy(dtype=bool)
+            return np.asarray(values, dtype=bool)
+
+        def filter_chunk(df: pd.DataFrame) -> pd.DataFrame:
+            if isinstance(row_filter, str):
+                df = df.query(row_filter)
+            elif isinstance(row_filter, dict):
+                mask = np.ones(len(df), dtype=bool)
+                for col, condition in row_filter.items():
+                    if callable(condition):
+                        mask &= to_mask(condition(df[col]))
+                    elif isinstance(condition, (list, tuple, set, frozenset)):
+                        mask &= df[col].isin(condition).to_numpy()
+                    else:
+                        mask &= to_mask(df[col] == condition)
+                df = df[mask]
+            else:
+                df = df[to_mask(row_filter(df))]
+            if len(extra_columns) > 0:
+                df = df.drop(columns=extra_columns)
+            if transform is not None:
+                df = transform(df)
+            return df
+        return filter_chunk
+
+    @staticmethod
+    def _bad_line_collector(read_kwargs: dict) -> Optional[_BadLineCollector]:
+        """내부함수 on_bad_lines='collect' 이면 pd.read_csv 에는 'warn' 을 전달하고 bad line collector 생성"""
+        if not isinstance(read_kwargs.get('on_bad_lines'), str) or read_kwargs['on_bad_lines'] != 'collect':
+            return None
+        read_kwargs['on_bad_lines'] = 'warn'
+        return _BadLineCollector()
+
+    @staticmethod
+    def _read_position(file_or_filename) -> Optional[int]:
+        """내부함수 file object 입력의 읽기 시작 위치. 파일명이나 위치를 알 수 없는 입력은 None"""
+        if isinstance(file_or_filename, (str, bytes)) or not hasattr(file_or_filename, 'seekable'):
+            return None
+        try:
+            return file_or_filename.tell() if file_or_filename.seekable() else None
+        except (OSError, ValueError):
+            return None
+
+    def _append_bad_lines(self, collector: Optional[_BadLineCollector], file_or_filename,
+                          position: Optional[int], read_kwargs: dict) -> None:
+        """내부메쏘드 collector 에 수집한 bad line 을 (원문, 줄 번호, 이유) 로 fail_list 에 추가
+
+        pd.read_csv 엔진의 경고에는 원문이 없고 multithread pyarrow 엔진에는 줄 번호가 없으므로,
+        bad line 이 있을 때만 입력을 처음부터 다시 읽어서 빠진 원문이나 줄 번호를 찾음.
+        줄 번호는 읽기 시작 위치부터 헤더와 빈 줄을 포함하여 센 1 부터 시작하는 record 번호.
+        다시 읽을 수 없는 입력은 찾은 값 없이 추가
+        """
+        if collector is None or len(collector.records) == 0:
+            return
+        records = collector.records
+        if any(line is None or text is None for start, line, text, reason in records):
+            try:
+                records = self._find_bad_records(file_or_filename, position, records, read_kwargs)
+            except Exception as e:
+                logger.debug(f"{file_or_filename} bad line re-read raise: {e}")
+        for start, line, text, reason in records:
+            self.fail_list.append(text, source=file_or_filename, offset=line if start == 0 else None, reason=reason)
+        logger.warning(f"{file_or_filename} skip {len(records)} bad lines")
+        collector.clear()
+
+    def _find_bad_records(self, file_or_filename, position: Optional[int], records: list, read_kwargs: dict) -> list:
+        """내부메쏘드 입력을 다시 열거나 읽기 시작 위치로 돌아가서 bad line 의 원문과 줄 번호 찾기
+
+        범위 시작 위치는 record 경계이므로 그 앞의 record 수를 더해서 처음부터 센 줄 번호를 계산.
+        줄 번호가 없는 bad line 은 원문이 같은 record 를 파일 순서대로 대응시킴.
+        마지막 bad line 을 찾으면 멈추고, file object 는 원래 위치로 돌아감
+
+        Returns:
+            (0, 줄 번호, 원문, 이유) 목록. 찾지 못한 항목은 그대로
+        """
+        quotechar = None if read_kwargs.get('quoting', 0) == 3 else read_kwargs.get('quotechar')
+        encoding = read_kwargs.get('encoding') or 'utf-8'
+        end = None
+        if isinstance(file_or_filename, str) or resolve_storage_path(file_or_filename) is not None:
+            fp, binary_mode, opened = self._get_file_obj(file_or_filename, 'rb')
+        elif position is not None:
+            fp, opened = file_or_filename, False
+            end = fp.tell()
+            fp.seek(position)
+        else:
+            return records
+
+        # (범위 시작 위치, 범위 안 줄 번호) 또는 원문으로 찾을 항목 번호
+        by_line = {}
+        by_text = {}
+        for index, (start, line, text, reason) in enumerate(records):
+            if line is None:
+                by_text.setdefault(text, []).append(index)
+            elif text is None:
+                by_line[(start, line)] = index
+        starts = {start for start, line in by_line}
+        result = list(records)
+        pending = len(by_line) + sum(len(indexes) for indexes in by_text.values())
+        wanted = {}
+        try:
+            for pos, number, raw in CsvHandler._iter_records(fp, quotechar, encoding):
+                if pending == 0:
+                    break
+                if pos in starts:
+                    wanted.update({number - 1 + line: index for (start, line), index in by_line.items()
+                                   if start == pos})
+                index = wanted.pop(number, None)
+                if index is None and len(by_text) == 0:
+                    continue
+                if isinstance(raw, bytes):
+                    raw = raw.decode(encoding, errors='replace')
+                raw = raw.rstrip('\r\n')
+                if index is None:
+                    indexes = by_text.get(raw)
+                    if not indexes:
+                        continue
+                    index = indexes.pop(0)
+                start, line, text, reason = records[index]
+                result[index] = (0, number, raw if text is None else text, reason)
+                pending -= 1
+        finally:
+            if end is not None:
+                fp.seek(end)
+            self._safe_close(fp, opened)
+        return result
+
+    @staticmethod
+    def _iter_records(fp, quotechar: Optional[str], encoding: str) -> Iterator[Tuple[int, int, Union[str, bytes]]]:
+        """내부함수 줄 단위로 읽어서 (시작 위치, 1 부터 시작하는 record 번호, 원문 str 또는 bytes) 생성
+
+        인용문자 수가 홀수인 줄은 다음 줄과 같은 record 로 봄. 빈 줄도 record 로 셈
+        """
+        lines = []
+        pos = 0
+        start = 0
+        number = 0
+        in_quote = False
+        line = fp.readline()
+        binary_mode = isinstance(line, bytes)
+        if binary_mode and quotechar:
+            # utf-8-sig 는 BOM 없이 인코딩
+            codec = codecs.lookup(encoding).name
+            quote = quotechar.encode('utf-8' if codec == 'utf-8-sig' else codec)
+        else:
+            quote = quotechar
+        while line:
+            if len(lines) == 0:
+                start = pos
+            lines.append(line)
+            pos += len(line)
+            if quote and line.count(quote) % 2 == 1:
+                in_quote = not in_quote
+            if not in_quote:
+                number += 1
+                yield start, number, b''.join(lines) if binary_mode else ''.join(lines)
+                lines = []
+            line = fp.readline()
+
+    def _build_read_kwargs(self, header, skiprows, nrows, usecols, kwargs) -> dict:
+        """내부메쏘드 handler 설정과 kwargs 를 합쳐서 pd.read_csv() 키워드 옵션 생성
+
+        Args:
+            header, skiprows, nrows, usecols: load() 매개변수
+            kwargs: load() 의 추가 키워드 옵션, 사용한 키는 pop 됨
+
+        Returns:
+            pd.read_csv() 키워드 옵션 dictionary
+        """
+        read_kwargs = dict(
+            encoding=kwargs.pop('encoding', self.encoding),
+            sep=kwargs.pop('sep', self.delimiter),
+            quotechar=kwargs.pop('quotechar', self.quotechar),
+            escapechar=kwargs.pop('escapechar', self.escapechar),
+            header=header,
+            skiprows=skiprows,
+            nrows=nrows,
+            usecols=usecols,
+            on_bad_lines=kwargs.pop('on_bad_lines', 'collect'),
+        )
+        dtype_backend = kwargs.pop('dtype_backend', self.dtype_backend)
+        if dtype_backend is not None:
+            read_kwargs['dtype_backend'] = dtype_backend
+        # infer_datetime_format 은 pd.read_csv 에 전달하지 않음
+        kwargs.pop('infer_datetime_format', True)
+        read_kwargs.update(kwargs)
+        return read_kwargs
+
+    def _read_csv_arrow(self, file_or_filename, read_kwargs: dict, engine: str,
+                        collector: _BadLineCollector = None) -> Optional[pd.DataFrame]:
+        """내부메쏘드 pyarrow.csv 의 multithread reader 로 CSV 읽기
+
+        read_kwargs 를 pyarrow 옵션으로 바꿀 수 없거나 입력이 text 모드 file object 이면 None 을 리턴하여
+        호출한 곳에서 pd.read_csv 로 읽도록 함. engine='auto' 는 작은 입력에도 None 리턴.
+        pyarrow 는 날짜/시간 형식 컬럼을 datetime 으로 추론하고 usecols 이름 순서대로 컬럼을 만듦
+
+        Returns:
+            dataframe 또는 None
+        """
+        if engine == 'auto' and source_size(file_or_filename) < CsvHandler.ARROW_AUTO_MIN_BYTES:
+            return None
+        options, reason = self._arrow_csv_options(read_kwargs, collector)
+        if options is None or isinstance(file_or_filename, (io.TextIOBase, io.StringIO)):
+            reason = reason or f"text mode input {type(file_or_filename).__name__}"
+            if engine == 'pyarrow':
+                logger.warning(f"pyarrow csv engine not support {reason}, use 'c' engine")
+            return None
+
+        read_options, parse_options, convert_options, nrows, usecols_index = options
+        start = file_or_filename.tell() if hasattr(file_or_filename, 'tell') else None
+        fp = None
+        opened = False
+        try:
+            if self._can_mmap(file_or_filename):
+                fp, opened = pa.memory_map(file_or_filename), True
+            else:
+                fp, binary_mode, opened = self._get_file_obj(file_or_filename, 'rb')
+            if convert_options.include_columns is not None and len(convert_options.include_columns) > 1:
+                # pd.read_csv 와 같이 usecols 컬럼을 파일 헤더의 컬럼 순서로 읽음
+                include_columns = CsvHandler._arrow_header_order(fp, read_options, parse_options,
+                                                                 convert_options.include_columns)
+                if include_columns is None:
+                    logger.debug(f"{file_or_filename} is not seekable to read header, use 'c' engine")
+                    return None
+                convert_options.include_columns = include_columns
+            if nrows is None:
+                table = pa_csv.read_csv(fp, read_options=read_options, parse_options=parse_options,
+                                        convert_options=convert_options)
+            else:
+                # nrows 만큼 읽으면 streaming reader 를 멈춤
+                reader = pa_csv.open_csv(fp, read_options=read_options, parse_options=parse_options,
+                                         convert_options=convert_options)
+                batches = []
+                rows = 0
+                while rows < nrows:
+                    try:
+                        batch = reader.read_next_batch()
+                    except StopIteration:
+                        break
+                    batches.append(batch)
+                    rows += batch.num_rows
+                table = pa.Table.from_batches(batches, schema=reader.schema).slice(0, nrows)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            # 파일명은 다시 열고, file object 는 처음 위치로 돌아가서 pd.read_csv 로 읽음
+            logger.warning(f"{file_or_filename} pyarrow csv engine raise {e}, use 'c' engine")
+            if collector is not None:
+                collector.clear()
+            if start is not None:
+                file_or_filename.seek(start)
+            return None
+        finally:
+            self._safe_close(fp, opened)
+
+        if usecols_index is not None:
+            table = table.select(usecols_index)
+        if len(set(table.column_names)) != table.num_columns:
+            table = table.rename_columns(CsvHandler._dedup_names(table.column_names))
+        df = arrow_to_frame(table, dtype_backend=read_kwargs.get('dtype_backend'))
+        if read_options.autogenerate_column_names:
+            # pandas 의 header=None 처럼 0 부터 시작하는 컬럼 번호 사용
+            df.columns = usecols_index if usecols_index is not None else range(len(df.columns))
+        return df
+
+    def _arrow_csv_options(self, read_kwargs: dict,
+                           collector: _BadLineCollector = None) -> Tuple[Optional[tuple], Optional[str]]:
+        """내부메쏘드 pd.read_csv() 키워드 옵션을 pyarrow.csv 옵션으로 변환
+
+        collector 를 지정하면 on_bad_lines='warn' 대신 collector 를 invalid_row_handler 로 사용
+
+        Returns:
+            ((ReadOptions, ParseOptions, ConvertOptions, nrows, 컬럼 번호 usecols), None) tuple,
+            변환할 수 없으면 (None, 이유)
+        """
+        kwargs = dict(read_kwargs)
+        encoding = kwargs.pop('encoding', None) or 'utf-8'
+        sep = kwargs.pop('sep', ',')
+        quotechar = kwargs.pop('quotechar', '"')
+        escapechar = kwargs.pop('escapechar', None)
+        quoting = kwargs.pop('quoting', 0)
+        header = kwargs.pop('header', 0)
+        skiprows = kwargs.pop('skiprows', 0) or 0
+        nrows = kwargs.pop('nrows', None)
+        usecols = kwargs.pop('usecols', None)
+        dtype = kwargs.pop('dtype', None)
+        on_bad_lines = kwargs.pop('on_bad_lines', 'error')
+        kwargs.pop('memory_map', None)
+        kwargs.pop('dtype_backend', None)
+        if len(kwargs) > 0:
+            return None, f"options {list(kwargs.keys())}"
+        if not isinstance(sep, str) or len(sep) != 1:
+            return None, f"{sep=}"
+        if header is not None and (not isinstance(header, int) or isinstance(header, bool)):
+            return None, f"{header=}"
+        if not isinstance(skiprows, int):
+            return None, f"{skiprows=}"
+        if on_bad_lines not in ('error', 'warn', 'skip'):
+            return None, f"{on_bad_lines=}"
+
+        include_columns = None
+        usecols_index = None
+        if usecols is not None:
+            if callable(usecols) or isinstance(usecols, str):
+                return None, f"{usecols=}"
+            usecols = list(usecols)
+            if all(isinstance(col, str) for col in usecols):
+                include_columns = usecols
+            elif all(isinstance(col, (int, np.integer)) for col in usecols):
+                usecols_index = sorted(set(int(col) for col in usecols))
+            else:
+                return None, f"{usecols=}"
+
+        column_types = None
+        if dtype is not None:
+            if not isinstance(dtype, dict):
+                return None, f"{dtype=}"
+            try:
+                column_types = {col: CsvHandler._arrow_type(col_type) for col, col_type in dtype.items()}
+            except (TypeError, ValueError, pa.ArrowNotImplementedError):
+                return None, f"{dtype=}"
+
+        parse_kwargs = dict(
+            delimiter=sep,
+            quote_char=False if quoting == 3 or not quotechar else quotechar,
+            escape_char=escapechar or False,
+            newlines_in_values=quoting != 3 and bool(quotechar),
+        )
+        if collector is not None and on_bad_lines == 'warn':
+            parse_kwargs['invalid_row_handler'] = collector
+        elif on_bad_lines != 'error':
+            parse_kwargs['invalid_row_handler'] = CsvHandler._warn_invalid_row if on_bad_lines == 'warn' \
+                else CsvHandler._skip_invalid_row
+        try:
+            parse_options = pa_csv.ParseOptions(**parse_kwargs)
+        except TypeError:
+            # pyarrow 11 미만은 invalid_row_handler 미지원
+            return None, f"{on_bad_lines=}"
+        read_options = pa_csv.ReadOptions(use_threads=True, encoding=encoding,
+                                          skip_rows=skiprows + (header or 0),
+                                          autogenerate_column_names=header is None)
+        convert_options = pa_csv.ConvertOptions(include_columns=include_columns, column_types=column_types,
+                                                strings_can_be_null=True)
+        return (read_options, parse_options, convert_options, nrows, usecols_index), None
+
+    @staticmethod
+    def _arrow_header_order(fp, read_options: pa_csv.ReadOptions, parse_options: pa_csv.ParseOptions,
+                            columns: list) -> Optional[list]:
+        """내부함수 columns 를 파일 헤더의 컬럼 순서로 정렬
+
+        첫 block 을 읽어서 헤더를 확인한 뒤 fp 는 원래 위치로 돌아감. 돌아갈 수 없는 입력이면 None 리턴
+        """
+        seekable = getattr(fp, 'seekable', None)
+        if seekable is None or not seekable():
+            return None
+        position = fp.tell()
+        # 잘못된 줄은 본문을 읽을 때 처리하므로 헤더 확인에서는 건너뜀
+        header_options = pa_csv.ParseOptions(
+            delimiter=parse_options.delimiter, quote_char=parse_options.quote_char,
+            escape_char=parse_options.escape_char, newlines_in_values=parse_options.newlines_in_values,
+            invalid_row_handler=None if parse_options.invalid_row_handler is None else CsvHandler._skip_invalid_row)
+        try:
+            names = pa_csv.open_csv(fp, read_options=read_options, parse_options=header_options).schema.names
+        finally:
+            fp.seek(position)
+        order = {}
+        for i, name in enumerate(names):
+            order.setdefault(name, i)
+        # 파일에 없는 컬럼은 뒤에 두고 본문을 읽을 때 오류로 처리
+        return sorted(columns, key=lambda col: order.get(col, len(names)))
+
+    @staticmethod
+    def _dedup_names(names: list) -> list:
+        """내부함수 pd.read_csv 와 같이 중복 컬럼명에 '.1', '.2' 를 붙임"""
+        counts = {}
+        result = []
+        for name in names:
+            count = counts.get(name, 0)
+            new_name = name
+            while new_name in counts:
+                count += 1
+                new_name = f"{name}.{count}"
+            counts[name] = count
+            counts.setdefault(new_name, 0)
+            result.append(new_name)
+        return result
+
+    @staticmethod
+    def _arrow_type(col_type) -> pa.DataType:
+        """내부함수 pandas dtype 을 pyarrow.csv 컬럼 타입으로 변환"""
+        if col_type in (str, 'str', object, 'object', 'string'):
+            return pa.string()
+        if col_type == 'category':
+            return pa.dictionary(pa.int32(), pa.string())
+        return pa.from_numpy_dtype(np.dtype(col_type))
+
+    @staticmethod
+    def _warn_invalid_row(row) -> str:
+        """내부함수 on_bad_lines='warn' 의 pyarrow invalid_row_handler"""
+        logger.warning(f"skip bad line: {row.text[:100]}")
+        return 'skip'
+
+    @staticmethod
+    def _skip_invalid_row(row) -> str:
+        """내부함수 on_bad_lines='skip' 의 pyarrow invalid_row_handler"""
+        return 'skip'
+
+    @staticmethod
+    def _arrow_write_options(sep, quotechar, quoting, escapechar,
+                             index) -> Tuple[Optional[pa_csv.WriteOptions], Optional[str]]:
+        """내부함수 dump() 옵션을 pyarrow.csv.WriteOptions 로 변환
+
+        pyarrow 는 escapechar 가 없으므로 escapechar 를 지정하면 변환하지 않음
+
+        Returns:
+            (WriteOptions, None) tuple, 변환할 수 없으면 (None, 이유)
+        """
+        if not isinstance(sep, str) or len(sep) != 1 or sep in ('"', '\r', '\n'):
+            return None, f"{sep=}"
+        if quotechar != '"':
+            return None, f"{quotechar=}"
+        if quoting not in CsvHandler.ARROW_QUOTING_STYLES:
+            return None, f"{quoting=}"
+        if escapechar is not None:
+            return None, f"{escapechar=}"
+        if index:
+            return None, f"{index=}"
+        return pa_csv.WriteOptions(include_header=True, delimiter=sep,
+                                   quoting_style=CsvHandler.ARROW_QUOTING_STYLES[quoting]), None
+
+    def _write_csv_arrow(self, fp, binary_mode: bool, df_list, write_options: pa_csv.WriteOptions,
+                         chunk_rows: int, to_csv_kwargs: dict) -> None:
+        """내부메쏘드 dataframe 목록을 chunk_rows 단위 record batch 로 변환하여 CSVWriter 로 streaming 쓰기
+
+        첫 chunk 의 schema 로 모든 chunk 를 변환함. 한 파일에 두 형식이 섞이지 않도록 값 type 이 섞인 object 컬럼이 있는
+        dataframe 은 쓰기 전에 확인하여 전체를 dump() 와 같은 to_csv_kwargs 옵션의 df.to_csv 로 씀.
+        그래도 Arrow 로 변환할 수 없는 chunk 가 있으면 그 chunk 부터 나머지 전체를 df.to_csv 로 씀
+        """
+        sink = fp if binary_mode else _TextSink(fp)
+        writer = None
+        schema = None
+        header = True
+        use_to_csv = False
+        try:
+            for df in df_list:
+                if not use_to_csv and not CsvHandler._arrow_writable(df):
+                    if writer is not None:
+                        logger.warning("pyarrow csv writer not support mixed type object column, use df.to_csv")
+                    use_to_csv = True
+                for start in range(0, max(len(df), 1), chunk_rows):
+                    chunk = df.iloc[start:start + chunk_rows]
+                    if use_to_csv:
+                        chunk.to_csv(fp, header=header, **to_csv_kwargs)
+                        header = False
+                        continue
+                    try:
+                        with stat_timer(self._stats, 'convert_time'):
+                            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError) as e:
+                        use_to_csv = True
+                        if writer is not None:
+                            logger.warning(f"pyarrow csv writer convert raise {e}, use df.to_csv")
+                            # CSVWriter 가 buffer 에 남긴 byte 를 먼저 씀
+                            writer.close()
+                            writer = None
+                        else:
+                            logger.debug(f"pyarrow csv writer convert raise {e}, use df.to_csv")
+                        chunk.to_csv(fp, header=header, **to_csv_kwargs)
+                        header = False
+                        continue
+                    if writer is None:
+                        if not header:
+                            write_options.include_header = False
+                        schema = table.schema
+                        writer = pa_csv.CSVWriter(sink, schema, write_options=write_options)
+                    writer.write_table(table)
+                    header = False
+        finally:
+            if writer is not None:
+                writer.close()
+
+    @staticmethod
+    def _arrow_writable(df: pd.DataFrame) -> bool:
+        """내부함수 값 type 이 섞인 object 컬럼이 없어서 pyarrow Table 로 변환할 수 있는 dataframe 여부"""
+        for i in np.flatnonzero(df.dtypes == object):
+            if pd.api.types.infer_dtype(df.iloc[:, i], skipna=True) in ('mixed', 'mixed-integer'):
+                return False
+        return True
+
     def _check_file_or_filename(self, file_or_filename):
         """파일 변수의 유형 체크
         Args:
@@ -0,0 +1,869 @@
+"""
+    echoss AI Bigdata Center Solution - file format utilty (append-only data buffer)
+"""
+import json
+import numpy as np
+import os
+import pandas as pd
+import pyarrow as pa
+import tempfile
+import warnings
+import weakref
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from echoss_fileformat.echoss_logger import get_logger
+
+logger = get_logger("echoss_fileformat")
+
+# pd.concat 에서 빈 조각/결측값 조각의 dtype 결정이 바뀐다는 deprecation 경고
+CONCAT_NA_WARNING = 'The behavior of DataFrame concatenation with empty or all-NA entries'
+
+
+def frame_to_ipc(df: pd.DataFrame) -> pa.Buffer:
+    """dataframe 을 Arrow IPC stream 버퍼로 변환
+
+    process 간 dataframe 전달 시에 pickle 대신 사용
+
+    Args:
+        df: 변환할 dataframe
+
+    Returns:
+        Arrow IPC stream 형식의 pa.Buffer
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def ipc_to_frame(buffer) -> pd.DataFrame:
+    """frame_to_ipc() 로 만든 Arrow IPC stream 버퍼를 dataframe 으로 변환
+
+    Args:
+        buffer: pa.Buffer 또는 bytes
+
+    Returns:
+        pandas DataFrame
+    """
+    table = pa.ipc.open_stream(buffer).read_all()
+    return arrow_to_frame(table)
+
+
+# dtype_backend='numpy_nullable' 에서 사용하는 Arrow type 별 pandas nullable dtype
+NULLABLE_DTYPES = {
+    pa.int8(): pd.Int8Dtype(),
+    pa.int16(): pd.Int16Dtype(),
+    pa.int32(): pd.Int32Dtype(),
+    pa.int64(): pd.Int64Dtype(),
+    pa.uint8(): pd.UInt8Dtype(),
+    pa.uint16(): pd.UInt16Dtype(),
+    pa.uint32(): pd.UInt32Dtype(),
+    pa.uint64(): pd.UInt64Dtype(),
+    pa.bool_(): pd.BooleanDtype(),
+    pa.float32(): pd.Float32Dtype(),
+    pa.float64(): pd.Float64Dtype(),
+    pa.string(): pd.StringDtype(),
+    pa.large_string(): pd.StringDtype(),
+}
+
+
+def arrow_to_frame(table: pa.Table, dtype_backend: str = None) -> pd.DataFrame:
+    """Arrow table 을 dataframe 으로 변환
+
+    Arrow null 은 object 컬럼에서 None 이 되므로 pandas 결측값 NaN 으로 통일
+
+    Args:
+        table: pa.Table
+        dtype_backend (str): None 이면 numpy dtype, 'numpy_nullable' 이면 pandas nullable dtype,
+            'pyarrow' 이면 pd.ArrowDtype 컬럼
+
+    Returns:
+        pandas DataFrame
+    """
+    if dtype_backend == 'pyarrow':
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    elif dtype_backend == 'numpy_nullable':
+        return table.to_pandas(types_mapper=NULLABLE_DTYPES.get)
+    elif dtype_backend is not None:
+        raise ValueError(f"{dtype_backend=} is not supported, use 'numpy_nullable' or 'pyarrow'")
+    frame = table.to_pandas()
+    for col in frame.columns[frame.dtypes == object]:
+        values = frame[col]
+        if values.hasnans:
+            frame[col] = values.where(values.notna(), np.nan)
+    return frame
+
+
+# categorize='auto' 의 categorical 후보 조건: 조각의 고유값 수가 row 수의 비율 이하이고 컬럼의 전체 고유값 수가 최대값 이하
+CATEGORY_RATIO = 0.5
+CATEGORY_MAX_VALUES = 1000
+CATEGORIZE_OPTIONS = (None, 'auto')
+
+
+def check_categorize(categorize) -> None:
+    """categorize 옵션 값 검사. 지원하지 않는 값이면 ValueError"""
+    if categorize not in CATEGORIZE_OPTIONS:
+        raise ValueError(f"{categorize=} is not supported, use one of {CATEGORIZE_OPTIONS}")
+
+
+def low_cardinality_values(series: pd.Series, max_values: int = CATEGORY_MAX_VALUES):
+    """문자열 컬럼이 categorical 후보이면 고유값 목록, 아니면 None
+
+    object 또는 string dtype 이고 결측값을 뺀 값이 모두 문자열이며
+    고유값 수가 row 수의 CATEGORY_RATIO 이하이고 max_values 이하인 컬럼이 후보
+
+    Args:
+        series: 검사할 컬럼
+        max_values (int): 최대 고유값 수
+
+    Returns:
+        pd.Index 또는 None
+    """
+    if series.dtype != object and not isinstance(series.dtype, pd.StringDtype):
+        return None
+    values = series.dropna()
+    if len(values) == 0:
+        return None
+    uniques = pd.Index(values.unique())
+    if len(uniques) > max_values or len(uniques) > max(1, len(series) * CATEGORY_RATIO):
+        return None
+    if uniques.inferred_type != 'string':
+        return None
+    return uniques
+
+
+def categorize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """dataframe 의 low cardinality 문자열 컬럼을 pandas categorical 로 변환. 값은 바뀌지 않음
+
+    Args:
+        df: 변환할 dataframe
+
+    Returns:
+        변환한 컬럼이 있으면 새 dataframe, 없으면 df
+    """
+    converted = {}
+    for i, col in enumerate(df.columns):
+        series = df.iloc[:, i]
+        if low_cardinality_values(series) is not None:
+            converted[i] = series.astype('category')
+    if len(converted) == 0:
+        return df
+    df = df.copy(deep=False)
+    for i, series in converted.items():
+        df.isetitem(i, series)
+    return df
+
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """dataframe 목록을 pd.concat 으로 합치면서 모든 조각이 categorical 인 컬럼은 categorical 로 유지
+
+    pd.concat 은 category 목록이 다른 categorical 컬럼을 object 로 합치므로 먼저 category 목록을 통일
+
+    Args:
+        frames: dataframe 목록
+
+    Returns:
+        RangeIndex 를 가진 pandas DataFrame
+    """
+    frames = list(frames)
+    if len(frames) > 1:
+        for col in frames[0].columns:
+            if not all(col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype)
+                       for frame in frames):
+                continue
+            try:
+                categories = pd.api.types.union_categoricals([frame[col] for frame in frames]).categories
+            except TypeError:
+                continue
+            dtype = pd.CategoricalDtype(categories)
+            frames = [frame if frame[col].dtype == dtype else _set_column(frame, col, frame[col].astype(dtype))
+                      for frame in frames]
+    return _concat(frames)
+
+
+def _concat(frames) -> pd.DataFrame:
+    """내부함수 pd.concat(ignore_index=True) 실행
+
+    DataBuffer 는 현재 pd.concat 의 dtype 결정을 따르므로 빈 조각/결측값 조각의 deprecation 경고는 이 호출에서만 출력하지 않음
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message=CONCAT_NA_WARNING, category=FutureWarning)
+        return pd.concat(frames, ignore_index=True)
+
+
+def _unit_frame(unit) -> pd.DataFrame:
+    """내부함수 컬럼 값 조각을 pd.concat 에 넘길 컬럼 0 의 dataframe 으로 변환. 정수는 컬럼이 없는 row 수"""
+    if isinstance(unit, int):
+        # 컬럼이 하나도 없는 빈 dataframe 은 pd.concat 에서 무시되므로 다른 컬럼 1 을 둠
+        return pd.DataFrame(index=pd.RangeIndex(unit), columns=[1])
+    # object 배열의 Timestamp 등을 datetime 컬럼으로 다시 추론하지 않도록 dtype 지정
+    return pd.DataFrame({0: pd.Series(unit, dtype=unit.dtype, copy=False)}, copy=False)
+
+
+def _concat_units(units: list, probes=()) -> pd.Series:
+    """내부함수 컬럼 값 조각 목록을 pd.concat 으로 합친 컬럼
+
+    Args:
+        units: 값 배열 또는 컬럼이 없는 row 수 목록
+        probes: 결과 dtype 결정에만 사용하고 결과에서 뺄 대표값 dataframe 목록
+    """
+    rows = sum(unit if isinstance(unit, int) else len(unit) for unit in units)
+    frame = _concat([_unit_frame(unit) for unit in units] + list(probes))
+    return frame[0].iloc[:rows]
+
+
+def _frame_column(values):
+    """내부함수 dataframe 을 만들 컬럼 값. object 배열의 Timestamp 등을 datetime 컬럼으로 다시 추론하지 않도록 Series 로 감쌈"""
+    if isinstance(values, np.ndarray) and values.dtype == object:
+        return pd.Series(values, dtype=object, copy=False)
+    return values
+
+
+def _set_column(frame: pd.DataFrame, col, values) -> pd.DataFrame:
+    """내부함수 frame 을 얕은 복사하여 col 컬럼을 values 로 교체"""
+    frame = frame.copy(deep=False)
+    frame[col] = values
+    return frame
+
+
+# ColumnAccumulator 에서 늦게 나타난 키의 앞 row 와 키가 없는 row 를 채우는 값.
+# JSON 에서 읽은 NaN 과 구분하기 위해서 별도 객체를 사용
+_MISSING = float('nan')
+# DataBuffer numpy 컬럼에서 원래 dtype 그대로 배열에 있는 row 표시
+_IN_ARRAY = object()
+
+
+class ColumnAccumulator:
+    """handler 의 pass_list 로 사용하는 컬럼 단위 row 누적 목록
+
+    dictionary row 를 보관하지 않고 키마다 컬럼 list 하나에 값만 추가하므로 row 마다 dictionary 와
+    키 문자열을 보관하지 않음. 늦게 나타난 키의 앞 row 와 키가 없는 row 는 NaN 으로 채움 (null backfill).
+    to_frame() 은 pd.DataFrame(list of dict) 와 같은 컬럼 순서와 dtype 의 dataframe 을 만듦.
+
+    dataframe 항목은 목록으로 보관하고, dataframe 을 추가하면 앞에 누적된 row 를 먼저 dataframe 으로 바꿔서 순서를 유지.
+    dictionary 가 아닌 row 가 추가되면 이후에는 pd.DataFrame(list) 로 변환하는 row 목록으로 보관.
+    len() 은 list 와 같이 dataframe 수와 row 수의 합
+    """
+
+    def __init__(self):
+        # 컬럼 이름 -> 값 list. 길이가 row 수보다 짧은 컬럼은 to_frame() 또는 값 추가 시에 채움
+        self._columns: Dict[Any, list] = {}
+        self._rows = 0
+        # dictionary 가 아닌 row 가 있으면 row 목록으로 보관
+        self._records: Optional[list] = None
+        self._frames: List[pd.DataFrame] = []
+
+    def __len__(self):
+        return len(self._frames) + self.rows
+
+    def __iter__(self) -> Iterator:
+        """dataframe 항목과 row 를 추가한 순서대로 생성. row 는 dictionary 로 다시 만듦"""
+        yield from self._frames
+        if self._records is not None:
+            yield from self._records
+        else:
+            yield from self._iter_dicts()
+
+    @property
+    def rows(self) -> int:
+        """dataframe 으로 바꾸지 않은 row 수"""
+        return len(self._records) if self._records is not None else self._rows
+
+    @property
+    def frames(self) -> List[pd.DataFrame]:
+        """추가된 dataframe 항목 목록"""
+        return self._frames
+
+    def append(self, item) -> None:
+        """row (dictionary) 또는 dataframe 추가"""
+        if isinstance(item, pd.DataFrame):
+            if self.rows > 0:
+                self._frames.append(self.to_frame())
+            self._frames.append(item)
+        elif self._records is not None:
+            self._records.append(item)
+        elif isinstance(item, dict):
+            self._append_dict(item)
+        else:
+            self._records = list(self._iter_dicts())
+            self._records.append(item)
+            self._columns = {}
+            self._rows = 0
+
+    def extend(self, items) -> None:
+        """row 또는 dataframe 목록 추가"""
+        for item in items:
+            self.append(item)
+
+    def to_frame(self) -> pd.DataFrame:
+        """누적된 row 를 dataframe 으로 만들고 row 를 비움. dataframe 항목은 그대로 둠"""
+        if self._records is not None:
+            df = pd.DataFrame(self._records)
+        else:
+            rows = self._rows
+            for column in self._columns.values():
+                if len(column) < rows:
+                    column.extend([_MISSING] * (rows - len(column)))
+            df = pd.DataFrame(self._columns, index=pd.RangeIndex(rows))
+        self._clear_rows()
+        return df
+
+    def clear(self) -> None:
+        """dataframe 항목과 row 를 모두 비움"""
+        self._frames = []
+        self._clear_rows()
+
+    """
+
+    클래스 내부 메쏘드
+
+    """
+
+    def _append_dict(self, row: dict):
+        """내부메쏘드 dictionary row 의 값을 키별 컬럼에 추가"""
+        rows = self._rows
+        columns = self._columns
+        for key, value in row.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [_MISSING] * rows
+            elif len(column) < rows:
+                column.extend([_MISSING] * (rows - len(column)))
+            column.append(value)
+        self._rows = rows + 1
+
+    def _iter_dicts(self) -> Iterator[dict]:
+        """내부메쏘드 컬럼에 누적된 row 를 dictionary 로 다시 만들어 생성"""
+        items = list(self._columns.items())
+        for index in range(self._rows):
+            yield {key: column[index] for key, column in items
+                   if index < len(column) and column[index] is not _MISSING}
+
+    def _clear_rows(self):
+        """내부메쏘드 누적된 row 만 비움"""
+        self._columns = {}
+        self._rows = 0
+        self._records = None
+
+
+class DataBuffer:
+    """handler 의 처리 결과를 누적하는 append-only 컬럼 버퍼
+
+    컬럼마다 용량을 2배씩 늘리는 numpy 배열에 row 를 추가하므로
+    load() + to_pandas() 를 반복해도 매번 전체 dataframe 을 복사하지 않음.
+    to_frame() 은 배열의 view 로 dataframe 을 만들고 새로 추가된 row 가 없으면 이전 결과를 재사용
+
+    category, Int64, string 등 pandas extension dtype 컬럼은 조각 목록으로 보관하고
+    to_frame() 시에 pd.concat 규칙으로 합침. numpy 컬럼의 dtype 이 조각마다 다르면 pd.concat 과 같은 dtype, 값으로 변환
+
+    memory_limit 을 지정하면 메모리에 누적된 크기가 limit 을 넘을 때마다
+    Arrow IPC 임시 파일로 내보내고(spill), to_frame() 이나 iter_frames() 시에 memory map 으로 다시 읽음
+
+    categorize='auto' 이면 추가하는 조각마다 low cardinality 문자열 컬럼을 pandas categorical 로 보관하고
+    (spill 파일은 Arrow dictionary 컬럼) 조각의 category 목록을 합쳐서 categorical 컬럼을 만듦.
+    조각이 조건을 넘으면 그 컬럼은 이후 object 컬럼으로 보관
+    """
+    INITIAL_CAPACITY = 1024
+    # spill Arrow 파일에서 결측값이 NaN 인 object 컬럼 위치 목록을 저장하는 schema metadata 키
+    SPILL_NAN_COLUMNS_KEY = b'echoss_nan_columns'
+
+    def __init__(self, memory_limit: int = None, spill_dir: str = None, categorize: str = None):
+        """
+        Args:
+            memory_limit (int): 메모리에 누적할 최대 byte 크기. None 이면 제한 없음
+            spill_dir (str): spill 임시 파일 디렉토리. None 이면 시스템 임시 디렉토리 사용
+            categorize (str): 'auto' 이면 low cardinality 문자열 컬럼을 categorical 로 보관
+        """
+        check_categorize(categorize)
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self.categorize = categorize
+        # categorical 로 보관 중인 컬럼 -> 지금까지의 category 목록
+        self._categories: Dict[Any, pd.Index] = {}
+        self._nbytes = 0
+        self._spill_files: List[str] = []
+        self._spill_rows = 0
+        self._all_columns: List[Any] = []
+        # 버퍼가 정리되지 않고 사라질 때도 임시 파일 삭제
+        self._finalizer = weakref.finalize(self, DataBuffer._remove_files, self._spill_files)
+        # 컬럼 이름 -> numpy 배열 (용량 capacity) 또는 extension dtype 조각 목록 (정수는 컬럼이 없던 row 수)
+        self._arrays: Dict[Any, np.ndarray] = {}
+        self._pieces: Dict[Any, List[Any]] = {}
+        # numpy 컬럼 이름 -> 추가한 조각의 (dtype, 빈 배열/결측값/값/컬럼 없음 여부) 키 별 대표값 dataframe
+        self._probes: Dict[Any, Dict[tuple, pd.DataFrame]] = {}
+        # numpy 컬럼 이름 -> [끝 위치, 원래 값] 목록. 원래 값은 컬럼이 없던 row 는 None,
+        # 배열에 그대로 있으면 _IN_ARRAY, 배열 dtype 으로 바뀐 row 는 원래 값 배열
+        self._runs: Dict[Any, List[list]] = {}
+        # 메모리 버퍼에 추가한 dataframe 수. 앞서 추가한 dataframe 에 없던 컬럼은 row 가 없어도 결측값 조각으로 합침
+        self._chunks = 0
+        self._order: List[Any] = []
+        self._column_names = None
+        self._size = 0
+        self._capacity = 0
+        self._frame: Optional[pd.DataFrame] = None
+
+    def __len__(self):
+        return self._spill_rows + self._size
+
+    @property
+    def columns(self) -> list:
+        return list(self._all_columns)
+
+    @property
+    def nbytes(self) -> int:
+        """메모리에 누적된 row 의 추정 byte 크기 (memory_limit 지정 시에만 계산)"""
+        return self._nbytes
+
+    @property
+    def spilled(self) -> bool:
+        """임시 파일로 내보낸 row 가 있는지 여부"""
+        return len(self._spill_files) > 0
+
+    def append(self, df: pd.DataFrame) -> None:
+        """dataframe 의 row 를 버퍼 끝에 추가
+
+        모든 컬럼의 추가할 값을 먼저 만든 뒤에 버퍼를 바꾸므로 변환 중에 예외가 발생하면 버퍼는 그대로 유지
+
+        Args:
+            df: 추가할 dataframe, 컬럼 이름은 중복되지 않아야 함
+        """
+        if not df.columns.is_unique:
+            raise ValueError(f"duplicated columns {list(df.columns[df.columns.duplicated()])} not supported")
+
+        categories, demoted = {}, []
+        if self.categorize is not None:
+            df, categories, demoted = self._categorize(df)
+        start = self._size
+        end = start + len(df)
+        capacity = self._grown_capacity(end)
+        commits = [self._prepare_column(col, df[col], start, end, capacity) for col in df.columns]
+        commits += [self._prepare_missing(col, start, end, capacity) for col in self._order if col not in df.columns]
+        new_columns = [col for col in df.columns if col not in self._arrays and col not in self._pieces]
+
+        if len(self._order) == 0 and self._column_names is None:
+            self._column_names = df.columns.names
+        for col in demoted:
+            self._demote(col)
+        self._categories.update(categories)
+        self._reserve(end)
+        for commit in commits:
+            commit()
+        self._order.extend(new_columns)
+        self._all_columns.extend(col for col in new_columns if col not in self._all_columns)
+        self._size = end
+        self._chunks += 1
+        self._frame = None
+
+        if self.memory_limit is not None:
+            self._nbytes += int(df.memory_usage(index=False, deep=True).sum())
+            if self._nbytes > self.memory_limit:
+                self.spill()
+
+    def to_frame(self) -> pd.DataFrame:
+        """누적된 row 로 dataframe 생성
+
+        numpy 컬럼은 복사 없이 view 를 사용하고, 추가된 row 가 없으면 이전 결과를 그대로 리턴
+        spill 된 파일이 있으면 memory map 으로 읽어서 메모리 row 와 함께 합침
+
+        Returns:
+            RangeIndex 를 가진 pandas DataFrame
+        """
+        if self._frame is not None:
+            return self._frame
+
+        if self.spilled and self.categorize is not None:
+            frame = concat_frames(self.iter_frames())
+        elif self.spilled:
+            frame = _concat(list(self.iter_frames()))
+        else:
+            frame = self._memory_frame()
+        self._frame = frame
+        return frame
+
+    def iter_frames(self) -> Iterator[pd.DataFrame]:
+        """spill 된 파일과 메모리 row 를 순서대로 dataframe 으로 생성
+
+        모든 dataframe 은 전체 컬럼 순서로 맞추어 생성하므로 chunk 단위 dump 에 사용할 수 있음
+
+        Returns:
+            pd.DataFrame generator
+        """
+        columns = self._column_index(self._all_columns)
+        for path in list(self._spill_files):
+            frame = self._read_spill_file(path)
+            if not frame.columns.equals(columns):
+                frame = frame.reindex(columns=columns)
+            yield frame
+        if self._size > 0 or not self.spilled:
+            frame = self._memory_frame()
+            if self.spilled and not frame.columns.equals(columns):
+                frame = frame.reindex(columns=columns)
+            yield frame
+
+    def spill(self) -> None:
+        """메모리에 누적된 row 를 임시 파일로 내보내고 메모리 버퍼를 비움
+
+        Arrow IPC 파일로 저장하고, Arrow 로 변환할 수 없거나 다시 읽은 값이 달라지는 컬럼이 있으면 pickle 파일로 저장
+        """
+        if self._size == 0:
+            return
+        frame = self._memory_frame()
+        fd, path = tempfile.mkstemp(prefix='echoss_spill_', suffix='.arrow', dir=self.spill_dir)
+        os.close(fd)
+        try:
+            table = self._spill_table(frame)
+            with pa.OSFile(path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            logger.debug(f"spill {len(frame)} rows to pickle by arrow raise: {e}")
+            os.remove(path)
+            path = path[:-len('.arrow')] + '.pkl'
+            frame.to_pickle(path)
+        self._spill_files.append(path)
+        self._spill_rows += self._size
+        logger.debug(f"spill {self._size} rows {self._nbytes} bytes to '{path}'")
+        self._clear_memory()
+        self._frame = None
+
+    def clear(self) -> None:
+        """버퍼 초기화, spill 임시 파일도 삭제"""
+        self._clear_memory()
+        DataBuffer._remove_files(self._spill_files)
+        self._spill_rows = 0
+        self._categories.clear()
+        self._all_columns.clear()
+        self._column_names = None
+        self._frame = None
+
+    """
+    클래스 내부 메쏘드
+    """
+
+    def _memory_frame(self) -> pd.DataFrame:
+        """내부메쏘드 메모리 버퍼의 row 로 dataframe 생성"""
+        data = {}
+        for col in self._order:
+            if col in self._arrays:
+                data[col] = _frame_column(self._arrays[col][:self._size])
+                continue
+            pieces = self._pieces[col]
+            if len(pieces) == 1 and not isinstance(pieces[0], int):
+                data[col] = _frame_column(pieces[0])
+            elif col in self._categories:
+                merged = pd.api.types.union_categoricals(pieces)
+                self._pieces[col] = [merged]
+                data[col] = _frame_column(merged)
+            else:
+                merged = _concat_units(pieces)
+                merged = merged.to_numpy() if isinstance(merged.dtype, np.dtype) else merged.array
+                # dtype 이 모두 같은 조각만 합친 조각으로 교체. 다르면 다음 추가 때 원래 조각으로 다시 합침
+                if all(not isinstance(piece, int) and piece.dtype == merged.dtype for piece in pieces):
+                    self._pieces[col] = [merged]
+                data[col] = _frame_column(merged)
+        frame = pd.DataFrame(data, index=pd.RangeIndex(self._size), copy=False)
+        if len(self._order) > 0 and isinstance(self._order[0], tuple):
+            frame.columns = self._column_index(self._order)
+        return frame
+
+    def _categorize(self, df: pd.DataFrame) -> tuple:
+        """내부메쏘드 categorize='auto' 에서 추가할 조각의 문자열 컬럼을 categorical 로 변환
+
+        새 컬럼과 categorical 로 보관 중인 컬럼만 검사하고,
+        조각이 조건을 넘으면 보관 중인 조각을 object 배열로 바꾸어 이후 object 컬럼으로 보관
+
+        Returns:
+            (변환한 dataframe, 컬럼 -> 새 category 목록, object 로 바꿀 컬럼 목록) tuple
+        """
+        categories, demoted = {}, []
+        converted = {}
+        for col in df.columns:
+            series = df[col]
+            known = self._categories.get(col)
+            if known is None and (col in self._arrays or col in self._pieces or col in self._all_columns):
+                continue
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                continue
+            if known is not None and series.isna().all():
+                converted[col] = pd.Categorical(series, categories=known)
+                continue
+            uniques = low_cardinality_values(series)
+            if uniques is not None and known is not None:
+                uniques = known.append(uniques.difference(known))
+                if len(uniques) > CATEGORY_MAX_VALUES:
+                    uniques = None
+            if uniques is None:
+                if known is not None:
+                    demoted.append(col)
+                continue
+            categories[col] = uniques
+            converted[col] = pd.Categorical(series, categories=uniques)
+        if len(converted) > 0:
+            df = df.copy(deep=False)
+            for col, values in converted.items():
+                df[col] = values
+        return df, categories, demoted
+
+    def _demote(self, col) -> None:
+        """내부메쏘드 categorical 로 보관 중인 컬럼을 object 조각 목록으로 전환"""
+        del self._categories[col]
+        if col in self._pieces:
+            self._pieces[col] = [piece if isinstance(piece, int) else np.asarray(piece, dtype=object)
+                                 for piece in self._pieces[col]]
+
+    def _column_index(self, columns: list) -> pd.Index:
+        """내부메쏘드 컬럼 목록을 pd.Index 또는 pd.MultiIndex 로 변환"""
+        if len(columns) > 0 and isinstance(columns[0], tuple):
+            return pd.MultiIndex.from_tuples(columns, names=self._column_names)
+        return pd.Index(columns, dtype=object)
+
+    def _clear_memory(self) -> None:
+        """내부메쏘드 메모리 버퍼 초기화"""
+        self._arrays.clear()
+        self._pieces.clear()
+        self._probes.clear()
+        self._runs.clear()
+        self._chunks = 0
+        self._order.clear()
+        self._size = 0
+        self._capacity = 0
+        self._nbytes = 0
+
+    @staticmethod
+    def _spill_table(frame: pd.DataFrame) -> pa.Table:
+        """내부메쏘드 spill 할 dataframe 을 다시 읽었을 때 값이 같은 Arrow table 로 변환
+
+        object 컬럼은 문자열과 결측값만 있고 결측값이 모두 None 이거나 모두 NaN 인 경우만 변환하고,
+        NaN 인 컬럼 위치는 schema metadata 에 기록. list, dict 등 다른 값은 Arrow 에서 타입이 바뀌므로 ValueError
+        """
+        nan_columns = []
+        for index, dtype in enumerate(frame.dtypes):
+            if dtype != object:
+                continue
+            values = frame.iloc[:, index]
+            if pd.api.types.infer_dtype(values, skipna=True) not in ('string', 'empty'):
+                raise ValueError(f"column {frame.columns[index]!r} has not string values")
+            missing = values.to_numpy()[values.isna().to_numpy()]
+            if len(missing) == 0 or all(value is None for value in missing):
+                continue
+            if not all(isinstance(value, float) for value in missing):
+                raise ValueError(f"column {frame.columns[index]!r} has mixed missing values")
+            nan_columns.append(index)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[DataBuffer.SPILL_NAN_COLUMNS_KEY] = json.dumps(nan_columns).encode()
+        return table.replace_schema_metadata(metadata)
+
+    @staticmethod
+    def _read_spill_file(path: str) -> pd.DataFrame:
+        """내부메쏘드 spill 파일을 memory map 으로 읽어서 dataframe 생성
+
+        object 컬럼의 결측값은 spill 할 때와 같이 None 또는 NaN 으로 읽음
+        """
+        if path.endswith('.pkl'):
+            return pd.read_pickle(path)
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        nan_columns = json.loads(table.schema.metadata[DataBuffer.SPILL_NAN_COLUMNS_KEY])
+        frame = table.to_pandas()
+        for index in nan_columns:
+            values = frame.iloc[:, index]
+            frame.isetitem(index, values.where(values.notna(), np.nan))
+        return frame
+
+    @staticmethod
+    def _remove_files(paths: List[str]) -> None:
+        """내부메쏘드 spill 임시 파일 삭제"""
+        while len(paths) > 0:
+            path = paths.pop()
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"spill file '{path}' remove raise: {e}")
+
+    def _grown_capacity(self, need_rows: int) -> int:
+        """내부메쏘드 need_rows 를 담을 numpy 컬럼 용량. 부족하면 2배씩 늘림"""
+        if need_rows <= self._capacity:
+            return self._capacity
+        return max(self._capacity * 2, need_rows, DataBuffer.INITIAL_CAPACITY)
+
+    def _reserve(self, need_rows: int) -> None:
+        """내부메쏘드 numpy 컬럼 용량이 need_rows 보다 작으면 2배씩 늘림"""
+        capacity = self._grown_capacity(need_rows)
+        if capacity == self._capacity:
+            return
+        for col, array in self._arrays.items():
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._arrays[col] = grown
+        self._capacity = capacity
+
+    def _prepare_column(self, col, series: pd.Series, start: int, end: int, capacity: int) -> Callable[[], None]:
+        """내부메쏘드 컬럼 1개의 값을 [start, end) 위치에 추가하는 함수를 만듦. 버퍼는 리턴한 함수를 호출할 때 바뀜"""
+        if not isinstance(series.dtype, np.dtype):
+            values = series.array
+            if col in self._arrays:
+                # numpy 컬럼에 extension dtype 이 추가되면 원래 값 조각 목록으로 전환
+                pieces = [end - begin if original is None else original
+                          for begin, end, original in self._iter_runs(col)] + [values]
+                return lambda: self._set_pieces(col, pieces)
+        else:
+            values = series.to_numpy()
+            if col in self._arrays:
+                return self._prepare_values(col, values, start, end, capacity)
+        if col in self._pieces:
+            return lambda: self._pieces[col].append(values)
+        if not isinstance(values, np.ndarray):
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                pieces = [pd.array([None] * start, dtype=values.dtype)] if start > 0 else []
+            else:
+                pieces = [start] if self._chunks > 0 else []
+            return lambda: self._set_pieces(col, pieces + [values])
+
+        # 새 numpy 컬럼
+        if self._chunks == 0:
+            array = np.empty(capacity, dtype=values.dtype)
+            array[:end] = values
+            probes = dict([DataBuffer._probe(values)])
+            return lambda: self._set_array(col, array, probes, [[end, _IN_ARRAY]])
+        probes = dict([DataBuffer._probe(None), DataBuffer._probe(values)])
+        return self._prepare_rebuild(col, [[start, None], [end, values.copy()]], probes, end, capacity)
+
+    def _prepare_missing(self, col, start: int, end: int, capacity: int) -> Callable[[], None]:
+        """내부메쏘드 추가된 dataframe 에 없는 컬럼의 [start, end) 위치를 결측값으로 채우는 함수를 만듦"""
+        if col in self._arrays:
+            return self._prepare_values(col, None, start, end, capacity)
+        last = self._pieces[col][-1] if len(self._pieces[col]) > 0 else None
+        if last is not None and not isinstance(last, int) and isinstance(last.dtype, pd.CategoricalDtype):
+            missing = pd.array([None] * (end - start), dtype=last.dtype)
+        else:
+            missing = end - start
+        return lambda: self._pieces[col].append(missing)
+
+    def _prepare_values(self, col, values: Optional[np.ndarray], start: int, end: int,
+                        capacity: int) -> Callable[[], None]:
+        """내부메쏘드 numpy 컬럼의 [start, end) 위치에 값 배열을 추가하는 함수를 만듦. values 가 None 이면 결측값
+
+        pd.concat 은 조각의 키 (dtype, 빈 조각/결측값 조각 여부 등) 집합에 따라 결과 dtype 과 각 조각의 변환을 정하므로
+        이미 추가한 키의 조각은 키 별 대표값과 함께 pd.concat 으로 변환하고 배열과 같은 dtype 의 값 조각은 바로 넣음.
+        새 키의 조각은 앞의 값도 바뀔 수 있으므로 원래 값 조각 전체를 pd.concat 으로 다시 합침
+        """
+        array = self._arrays[col]
+        probes = self._probes[col]
+        key = DataBuffer._unit_key(values)
+        if key in probes:
+            if key == (array.dtype, 'valid'):
+                return lambda: self._assign(col, start, end, values, _IN_ARRAY)
+            # 결과가 float, datetime, timedelta 이면 결측값은 NaN, NaT 이고 숫자는 float 로 변환
+            kind = array.dtype.kind
+            if kind in 'fmM' and (values is None or key[1] == 'na' and values.dtype == array.dtype):
+                missing = np.datetime64('NaT') if kind == 'M' else np.timedelta64('NaT') if kind == 'm' else np.nan
+                original = None if values is None else values.copy()
+                return lambda: self._assign(col, start, end, missing, original)
+            if kind == 'f' and values is not None and values.dtype.kind in 'iuf':
+                original = values.copy()
+                return lambda: self._assign(col, start, end, original, original)
+            if values is None or key[1] == 'na' and (values.dtype != object or len(key[3]) == 1):
+                # 모두 같은 결측값인 조각은 한 row 만 변환하여 채움
+                converted = _concat_units([1 if values is None else values[:1]], probes.values()).to_numpy()
+                converted = np.repeat(converted, end - start)
+            else:
+                converted = _concat_units([values], probes.values()).to_numpy()
+            if converted.dtype == array.dtype:
+                original = None if values is None else values.copy()
+                return lambda: self._assign(col, start, end, converted, original)
+        probes = dict(probes)
+        probes[key] = DataBuffer._probe(values)[1]
+        runs = [[end, original] for _, end, original in self._iter_runs(col)]
+        runs.append([end, None if values is None else values.copy()])
+        return self._prepare_rebuild(col, runs, probes, end, capacity)
+
+    def _prepare_rebuild(self, col, runs: List[list], probes: dict, end: int, capacity: int) -> Callable[[], None]:
+        """내부메쏘드 원래 값 조각 runs 를 pd.concat 으로 다시 합친 배열로 컬럼을 바꾸는 함수를 만듦"""
+        units = []
+        begin = 0
+        for run_end, original in runs:
+            units.append(run_end - begin if original is None else original)
+            begin = run_end
+        values = _concat_units(units).to_numpy()
+        array = np.empty(capacity, dtype=values.dtype)
+        array[:end] = values
+        # 결과 배열에 그대로 있는 값 조각은 보관하지 않음. 빈 조각과 모두 결측값인 조각은 다시 합칠 때 구분하도록 보관
+        merged = []
+        for run_end, original in runs:
+            if original is not None and DataBuffer._unit_key(original) == (array.dtype, 'valid'):
+                original = _IN_ARRAY
+            if len(merged) > 0 and (original is None or original is _IN_ARRAY) and merged[-1][1] is original:
+                merged[-1][0] = run_end
+            else:
+                merged.append([run_end, original])
+        return lambda: self._set_array(col, array, probes, merged)
+
+    def _iter_runs(self, col) -> Iterator[tuple]:
+        """내부메쏘드 numpy 컬럼의 (시작, 끝, 원래 값) 생성. 배열에 그대로 있는 row 는 배열의 view"""
+        array = self._arrays[col]
+        begin = 0
+        for end, original in self._runs[col]:
+            yield begin, end, array[begin:end] if original is _IN_ARRAY else original
+            begin = end
+
+    def _assign(self, col, start: int, end: int, values: np.ndarray, original) -> None:
+        """내부메쏘드 numpy 컬럼 [start, end) 위치에 값을 넣고 원래 값 기록. 앞의 row 와 같은 표시이면 합침"""
+        self._arrays[col][start:end] = values
+        runs = self._runs[col]
+        if len(runs) > 0 and (original is None or original is _IN_ARRAY) and runs[-1][1] is original:
+            runs[-1][0] = end
+        else:
+            runs.append([end, original])
+
+    def _set_array(self, col, array: np.ndarray, probes: dict, runs: List[list]) -> None:
+        """내부메쏘드 numpy 컬럼의 배열, 대표값, 원래 값 목록 교체"""
+        self._arrays[col] = array
+        self._probes[col] = probes
+        self._runs[col] = runs
+
+    def _set_pieces(self, col, pieces: list) -> None:
+        """내부메쏘드 컬럼을 extension dtype 조각 목록으로 교체"""
+        self._arrays.pop(col, None)
+        self._probes.pop(col, None)
+        self._runs.pop(col, None)
+        self._pieces[col] = pieces
+
+    @staticmethod
+    def _unit_key(values: Optional[np.ndarray]) -> tuple:
+        """내부메쏘드 값 배열의 pd.concat 결과를 정하는 키. values 가 None 이면 컬럼이 없는 조각 (None, 'missing')
+
+        (dtype, 'empty' | 'na' | 'valid') 이고, 모두 결측값인 object 조각은 첫 값이 None 인지와 결측값 타입에 따라
+        다르게 합쳐지므로 키에 추가
+        """
+        if values is None:
+            return None, 'missing'
+        if len(values) == 0:
+            return values.dtype, 'empty'
+        if values.dtype.kind in 'biu' or not pd.isna(values[:1])[0] or not pd.isna(values).all():
+            return values.dtype, 'valid'
+        if values.dtype == object:
+            types = ('NoneType',) if np.equal(values, None).all() else \
+                tuple(sorted({type(value).__name__ for value in values}))
+            return values.dtype, 'na', values[0] is None, types
+        return values.dtype, 'na'
+
+    @staticmethod
+    def _probe(values: Optional[np.ndarray]) -> tuple:
+        """내부메쏘드 값 배열의 (키, 대표값 dataframe). 대표값은 같은 키를 갖는 가장 작은 조각"""
+        key = DataBuffer._unit_key(values)
+        if values is None:
+            return key, _unit_frame(1)
+        if key[1] == 'valid':
+            index = 0 if values.dtype.kind in 'biu' else int(np.flatnonzero(~pd.isna(values))[0])
+            probe = values[index:index + 1]
+        elif key[1] == 'na' and values.dtype == object and len(key[3]) > 1:
+            # 첫 값과 결측값 타입 별 첫 값
+            firsts = {}
+            for index, value in enumerate(values):
+                firsts.setdefault(type(value), index)
+            probe = values[sorted(set(firsts.values()) | {0})]
+        else:
+            probe = values[:1]
+        return key, _unit_frame(probe.copy())
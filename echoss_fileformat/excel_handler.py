@@ -1,12 +1,15 @@
 import io
 import pandas as pd
+from pandas.io.parsers import TextParser
 # for new format xlsx
 from openpyxl import load_workbook
 # for old format xls
 import xlrd
-from typing import Literal, Optional, Union
+from typing import Iterator, Literal, Optional, Union
 from .csv_handler import CsvHandler
+from .metrics import instrument
 from .echoss_logger import get_logger, set_logger_level
+from .storage import resolve_storage_path
 
 logger = get_logger('echoss_fileformat')
 
@@ -34,7 +37,10 @@ class ExcelHandler(CsvHandler):
     """
     format = "xlsx"
 
-    def __init__(self, processing_type: str = 'array', encoding='utf-8', error_log='error.log'):
+    def __init__(self, processing_type: str = 'array', encoding='utf-8', error_log='error.log',
+                 memory_limit: int = None, spill_dir: str = None,
+                 compression: Union[str, dict, None] = 'infer', use_mmap: bool = False,
+                 categorize: str = None):
         """Excel 파일 핸들러 초기화
 
         Args:
@@ -43,12 +49,20 @@ class ExcelHandler(CsvHandler):
                 'object' 는 처리 없이 그대로 읽어들임
             encoding: 문서 인코딩 'utf-8' 기본값
             error_log: 에러 발생 시에 저장되는 파일 'error.log' 기본값
+            memory_limit (int): 누적 데이터의 메모리 최대 byte 크기. 넘으면 임시 파일로 spill
+            spill_dir (str): spill 임시 파일 디렉토리
+            compression: 파일명 사용 시의 압축 형식. 'infer' 는 확장자와 첫 byte 로 판별, None 은 압축하지 않음
+            use_mmap (bool): True 이면 압축하지 않은 파일명 입력을 memory map 으로 읽음
+            categorize (str): 'auto' 이면 low cardinality 문자열 컬럼을 pandas categorical 로 읽음
         """
-        super().__init__(processing_type=processing_type, encoding=encoding, error_log=error_log)
+        super().__init__(processing_type=processing_type, encoding=encoding, error_log=error_log,
+                         memory_limit=memory_limit, spill_dir=spill_dir,
+                         compression=compression, use_mmap=use_mmap, categorize=categorize)
         # self.engine = 'openpyxl' , 멀티헤더 처리 이슈로 분리해서 테스트 후 효과가 없었음
         self.read_engine = 'openpyxl'
         self.write_engine = 'openpyxl'
 
+    @instrument('load')
     def load(self, file_or_filename: Union[io.TextIOWrapper, io.BytesIO, io.BufferedIOBase, str],
              sheet_name=0, skiprows=0, header=0, nrows=None, usecols=None, **kwargs) -> Optional[pd.DataFrame]:
         """Excel 파일 읽기
@@ -63,6 +77,14 @@ class ExcelHandler(CsvHandler):
             nrows (int): skiprows 부터 N개의 데이터 row 만 읽을 경우 숫자 지정
             usecols (Union[int, list]): 전체 컬럼 사용시 None, 컬럼 번호나 이름의 리스트 [0, 1, 2] or ['foo', 'bar', 'baz']
         """
+        if resolve_storage_path(file_or_filename) is not None:
+            fp, binary_mode, opened = self._get_file_obj(file_or_filename, 'rb', seekable=True)
+            try:
+                return self.load(fp, sheet_name=sheet_name, skiprows=skiprows, header=header, nrows=nrows,
+                                 usecols=usecols, **kwargs)
+            finally:
+                self._safe_close(fp, opened)
+
         mode = self._check_file_or_filename(file_or_filename)
 
         try:
@@ -84,17 +106,110 @@ class ExcelHandler(CsvHandler):
                 # 모든 column 값이 NaN 인 row는 제거
                 df.dropna(how='all', inplace=True)
                 self.pass_list.append(df)
+                self._check_memory_limit()
             elif self.processing_type == CsvHandler.TYPE_OBJECT:
-                return df
+                return self._categorize_frame(df)
         except Exception as e:
             # debuging ord() expected a character bu string of length 4 found
             find_problematic_cells(file_or_filename)
 
-            self.fail_list.append(str(file_or_filename))
+            self.fail_list.append(None, source=file_or_filename, reason=e)
             logger.error(f"{file_or_filename} load raise {e}")
             if self.processing_type == CsvHandler.TYPE_OBJECT:
                 return None
 
+    @instrument('iter_chunks')
+    def iter_chunks(self, file_or_filename: Union[io.BytesIO, io.BufferedIOBase, str], chunk_rows: int = 10000,
+                    sheet_name=0, skiprows=0, header=0, nrows=None, usecols=None, **kwargs) -> Iterator[pd.DataFrame]:
+        """Excel 파일을 chunk_rows 단위 dataframe 으로 나누어 읽기
+
+        xlsx 파일은 openpyxl read_only 모드로 row 를 순차적으로 읽어서 메모리 사용량이 chunk 크기에 비례함
+        컬럼 이름은 load() 와 같도록 pd.read_excel(nrows=0) 결과를 사용
+        멀티헤더, skiprows 목록, xls 파일은 전체를 읽은 후 나누어 생성
+
+        Args:
+            file_or_filename (file-like object): file object or file name
+            chunk_rows (int): chunk 1개의 최대 row 수
+            sheet_name: 1개의 sheet 만 지정. 0으로 시작하는 일련 번호 또는 쉬트 이름
+            skiprows (int) : 데이터가 시작되는 row index. header 보다 먼저 적용
+            header (int): 헤더로 사용될 row index
+            nrows (int): skiprows 부터 N개의 데이터 row 만 읽을 경우 숫자 지정
+            usecols (Union[int, list]): 전체 컬럼 사용시 None, 컬럼 번호나 이름의 리스트 [0, 1, 2] or ['foo', 'bar', 'baz']
+
+        Returns:
+            pd.DataFrame generator
+        """
+        if chunk_rows is None or chunk_rows <= 0:
+            raise ValueError(f"{chunk_rows=} must be positive")
+
+        if resolve_storage_path(file_or_filename) is not None:
+            fp, binary_mode, opened = self._get_file_obj(file_or_filename, 'rb', seekable=True)
+            try:
+                yield from self.iter_chunks(fp, chunk_rows=chunk_rows, sheet_name=sheet_name, skiprows=skiprows,
+                                            header=header, nrows=nrows, usecols=usecols, **kwargs)
+            finally:
+                self._safe_close(fp, opened)
+            return
+
+        engine = kwargs.get('engine', self.read_engine)
+        streamable = (engine == 'openpyxl' and isinstance(header, int) and isinstance(skiprows, int)
+                      and sheet_name is not None and set(kwargs.keys()) <= {'engine'})
+        if not streamable:
+            try:
+                df = pd.read_excel(file_or_filename, sheet_name=sheet_name, header=header, skiprows=skiprows,
+                                   nrows=nrows, usecols=usecols, parse_dates=True, **kwargs)
+                if self.processing_type == CsvHandler.TYPE_ARRAY and isinstance(df.columns, pd.MultiIndex):
+                    df = df.drop([col for col in df.columns if 'Unnamed' in str(col)], axis=1)
+            except Exception as e:
+                self.fail_list.append(None, source=file_or_filename, reason=e)
+                logger.error(f"{file_or_filename} iter_chunks raise {e}")
+                return
+            for offset in range(0, len(df), chunk_rows):
+                chunk_df = df.iloc[offset:offset + chunk_rows]
+                if self.processing_type == CsvHandler.TYPE_ARRAY:
+                    chunk_df = chunk_df.dropna(how='all')
+                yield chunk_df
+            return
+
+        workbook = None
+        try:
+            # load() 와 같은 컬럼 이름을 얻기 위해서 헤더만 읽음
+            all_columns = pd.read_excel(file_or_filename, sheet_name=sheet_name, header=header,
+                                        skiprows=skiprows, nrows=0, engine=engine).columns
+            columns = pd.read_excel(file_or_filename, sheet_name=sheet_name, header=header,
+                                    skiprows=skiprows, nrows=0, usecols=usecols, engine=engine).columns
+            positions = [all_columns.get_loc(col) for col in columns]
+            if hasattr(file_or_filename, 'seek'):
+                file_or_filename.seek(0)
+
+            workbook = load_workbook(file_or_filename, read_only=True, data_only=True)
+            if isinstance(sheet_name, int):
+                sheet = workbook.worksheets[sheet_name]
+            else:
+                sheet = workbook[sheet_name]
+
+            data_start = skiprows + header + 1
+            batch = []
+            read_rows = 0
+            for row in sheet.iter_rows(min_row=data_start + 1, values_only=True):
+                if nrows is not None and read_rows >= nrows:
+                    break
+                read_rows += 1
+                values = [self._convert_cell(row[pos]) if pos < len(row) else None for pos in positions]
+                batch.append(values)
+                if len(batch) >= chunk_rows:
+                    yield self._rows_to_frame(batch, columns)
+                    batch = []
+            if len(batch) > 0:
+                yield self._rows_to_frame(batch, columns)
+        except Exception as e:
+            self.fail_list.append(None, source=file_or_filename, reason=e)
+            logger.error(f"{file_or_filename} iter_chunks raise {e}")
+        finally:
+            if workbook is not None:
+                workbook.close()
+
+    @instrument('loads')
     def loads(self, str_or_bytes: Union[str, bytes],
               sheet_name=0, header=0, skiprows=0, nrows=None, usecols=None, **kwargs):
         """문자열이나 bytes 에서 Excel 읽기
@@ -121,8 +236,8 @@ class ExcelHandler(CsvHandler):
                 if self.processing_type == CsvHandler.TYPE_OBJECT:
                     return df
         except Exception as e:
-            self.fail_list.append(str_or_bytes)
-            logger.error(f"'{str_or_bytes}' loads raise {e}")
+            self.fail_list.append(str_or_bytes, reason=e)
+            logger.error(f"loads [{len(str_or_bytes)}] raise {e}")
             if self.processing_type == CsvHandler.TYPE_OBJECT:
                 return None
 
@@ -130,6 +245,7 @@ class ExcelHandler(CsvHandler):
     # def to_pandas() 는 data_list 에 dataframe 을 저장하는 방식이 CsvHandler 와 동일하여 따로 정의하지 않음
     #
 
+    @instrument('dump')
     def dump(self, file_or_filename, sheet_name='Sheet1', data: pd.DataFrame = None, **kwargs) -> None:
         """데이터를 Excel 파일로 쓰기
 
@@ -144,6 +260,13 @@ class ExcelHandler(CsvHandler):
                 logger.error(f"processing_type '{self.processing_type}' need data parameter")
                 raise TypeError(f"processing_type '{self.processing_type}' need data parameter")
 
+        if resolve_storage_path(file_or_filename) is not None:
+            fp, binary_mode, opened = self._get_file_obj(file_or_filename, 'wb')
+            try:
+                return self.dump(fp, sheet_name=sheet_name, data=data, **kwargs)
+            finally:
+                self._safe_close(fp, opened)
+
         try:
             if data is None:
                 df = self.to_pandas()
@@ -176,6 +299,7 @@ class ExcelHandler(CsvHandler):
         except Exception as e:
             logger.error(f"'{str(file_or_filename)}' dump raise {e}")
 
+    @instrument('dumps')
     def dumps(self, sheet_name='Sheet1', data: pd.DataFrame = None, **kwargs) -> str:
         """데이터를 CSV 파일로 쓰기
 
@@ -193,3 +317,23 @@ class ExcelHandler(CsvHandler):
             logger.error(f"{self} dumps raise: {e}")
 
         return file_obj.getvalue()
+
+    """
+    클래스 내부 메쏘드
+    """
+
+    @staticmethod
+    def _convert_cell(value):
+        """내부메쏘드 pd.read_excel 과 같이 정수값 float 셀은 int 로 변환"""
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+
+    def _rows_to_frame(self, rows: list, columns: pd.Index) -> pd.DataFrame:
+        """내부메쏘드 iter_chunks 의 row 목록을 pd.read_excel 과 같은 TextParser 타입 추정으로 dataframe 변환"""
+        with TextParser(rows, header=None, names=list(columns)) as parser:
+            df = parser.read()
+        if self.processing_type == CsvHandler.TYPE_ARRAY:
+            # 모든 column 값이 NaN 인 row는 제거
+            df = df.dropna(how='all')
+        return df
@@ -0,0 +1,271 @@
+import atexit
+import json
+import multiprocessing.util
+import queue
+import threading
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+from echoss_fileformat.echoss_logger import get_logger
+from echoss_fileformat.json_codec import get_json_codec
+
+try:
+    import fcntl
+except ImportError:
+    # Windows 는 파일 잠금 없이 한 번의 write 로 batch 를 추가
+    fcntl = None
+
+logger = get_logger("echoss_fileformat")
+
+
+class ErrorLogWriter:
+    """실패 기록 batch 를 background thread 에서 error log 파일에 추가하는 writer
+
+    batch 하나를 파일 잠금(fcntl.flock) 상태에서 한 번에 쓰기 때문에
+    여러 worker process 가 같은 error log 를 공유해도 줄이 섞이지 않음
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def submit(self, error_log: str, data: bytes) -> None:
+        """error log 파일에 추가할 batch 를 background thread 에 전달
+
+        Args:
+            error_log (str): error log 파일명
+            data (bytes): 추가할 JSON line 들
+        """
+        self._start()
+        self._queue.put((error_log, data))
+
+    def join(self) -> None:
+        """전달된 batch 를 모두 쓸 때까지 대기"""
+        if self._thread is not None:
+            self._queue.join()
+
+    """
+
+    클래스 내부 메쏘드
+
+    """
+
+    def _start(self):
+        """내부메쏘드 background thread 가 없으면 시작"""
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='echoss_error_log', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """내부메쏘드 queue 의 batch 를 순서대로 파일에 추가"""
+        while True:
+            error_log, data = self._queue.get()
+            try:
+                self._write(error_log, data)
+            except Exception as e:
+                logger.error(f"error log '{error_log}' append raise: {e}")
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _write(error_log: str, data: bytes):
+        """내부메쏘드 파일 잠금 후 batch 를 한 번에 추가"""
+        with open(error_log, mode='ab') as fp:
+            if fcntl is not None:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+            try:
+                fp.write(data)
+                fp.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+
+
+# process 당 하나의 writer 를 공유하고, 종료 시에 남은 batch 를 모두 씀
+error_log_writer = ErrorLogWriter()
+atexit.register(error_log_writer.join)
+# multiprocessing worker process 는 atexit 를 실행하지 않고 종료함
+multiprocessing.util.Finalize(None, error_log_writer.join, exitpriority=0)
+
+
+class FailList:
+    """크기가 제한된 파일 처리 실패 기록 목록
+
+    각 실패는 {'source', 'offset', 'reason', 'payload', 'size'} 형태의 dictionary 로 저장하고
+    payload 는 PAYLOAD_LIMIT 길이로 잘라서 보관함. size 는 bytes, 문자열 payload 의 원래 길이이고
+    DataFrame, dict, list payload 는 row 또는 원소 수.
+    메모리의 기록 수가 max_records 또는 payload 의 인코딩 byte 크기가 max_bytes 를 넘으면 error log 로 옮기고 비움.
+    len() 은 clear() 이후에 기록된 전체 실패 수
+    """
+    MAX_RECORDS = 10000
+    MAX_BYTES = 1024 * 1024
+    PAYLOAD_LIMIT = 1024
+
+    def __init__(self, error_log: Optional[str] = 'error.log', encoding='utf-8', max_records: int = None,
+                 max_bytes: int = None, payload_limit: int = None):
+        """
+        Args:
+            error_log (str): 실패 기록을 JSON line 으로 추가할 파일명. None 이면 제한을 넘는 기록은 버림
+            encoding (str): bytes payload 의 인코딩
+            max_records (int): 메모리에 보관하는 최대 기록 수
+            max_bytes (int): 메모리에 보관하는 payload 의 최대 byte 크기
+            payload_limit (int): 기록 하나에 보관하는 payload 의 최대 길이
+        """
+        self.error_log = error_log
+        self.encoding = encoding
+        self.max_records = max_records if max_records is not None else FailList.MAX_RECORDS
+        self.max_bytes = max_bytes if max_bytes is not None else FailList.MAX_BYTES
+        self.payload_limit = payload_limit if payload_limit is not None else FailList.PAYLOAD_LIMIT
+        # error log 의 JSON line 을 만드는 codec. JsonHandler 는 자신의 json_codec 으로 교체
+        self.json_codec = get_json_codec('json')
+        self._records = []
+        self._nbytes = 0
+        self._count = 0
+        self._dropped = 0
+        # clear() 로 초기화하지 않는 누적 실패 수
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(list(self._records))
+
+    def __getitem__(self, index):
+        return self._records[index]
+
+    def __repr__(self):
+        return f"FailList(count={self._count}, records={len(self._records)}, dropped={self._dropped})"
+
+    @property
+    def records(self) -> List[dict]:
+        """메모리에 보관 중인 실패 기록 목록"""
+        return list(self._records)
+
+    @property
+    def dropped(self) -> int:
+        """error_log 가 없어서 버린 기록 수"""
+        return self._dropped
+
+    @property
+    def total(self) -> int:
+        """생성 이후 추가된 전체 실패 수. clear() 로 초기화하지 않음"""
+        return self._total
+
+    def append(self, payload, source=None, offset=None, reason=None) -> None:
+        """실패 기록 추가
+
+        Args:
+            payload: 처리에 실패한 데이터. PAYLOAD_LIMIT 길이로 잘라서 보관
+            source: 파일명 등 실패한 데이터의 출처
+            offset: 실패한 데이터의 줄 번호 또는 위치
+            reason: 실패 이유 (예외 객체 또는 문자열)
+        """
+        text, size = self._truncate(payload)
+        if isinstance(reason, BaseException):
+            reason = f"{type(reason).__name__}: {reason}"
+        record = {
+            'source': None if source is None else str(source),
+            'offset': offset,
+            'reason': None if reason is None else str(reason),
+            'payload': text,
+            'size': size,
+        }
+        with self._lock:
+            self._records.append(record)
+            self._nbytes += len(text.encode(self.encoding, errors='replace'))
+            self._count += 1
+            self._total += 1
+            if len(self._records) >= self.max_records or self._nbytes >= self.max_bytes:
+                self._flush_locked()
+
+    def extend(self, payloads, source=None, reason=None) -> None:
+        """여러 실패 기록 추가
+
+        Args:
+            payloads: 처리에 실패한 데이터 목록
+            source: 파일명 등 실패한 데이터의 출처
+            reason: 실패 이유
+        """
+        for payload in payloads:
+            self.append(payload, source=source, reason=reason)
+
+    def flush(self, wait: bool = False) -> None:
+        """메모리의 기록을 error log 로 옮기고 비움
+
+        Args:
+            wait (bool): True 이면 파일에 모두 쓸 때까지 대기
+        """
+        with self._lock:
+            self._flush_locked()
+        if wait:
+            error_log_writer.join()
+
+    def clear(self) -> None:
+        """메모리의 기록과 실패 수를 초기화"""
+        with self._lock:
+            self._records = []
+            self._nbytes = 0
+            self._count = 0
+            self._dropped = 0
+
+    """
+
+    클래스 내부 메쏘드
+
+    """
+
+    def _flush_locked(self):
+        """내부메쏘드 lock 을 잡은 상태에서 메모리의 기록을 writer 로 전달"""
+        if len(self._records) == 0:
+            return
+        records, self._records, self._nbytes = self._records, [], 0
+        if not self.error_log:
+            self._dropped += len(records)
+            return
+        try:
+            dumps = self.json_codec.dumps
+            data = b''.join(dumps(record, default=str) + b'\n' for record in records)
+            error_log_writer.submit(self.error_log, data)
+        except Exception as e:
+            self._dropped += len(records)
+            logger.error(f"fail_list[{len(records)}] error log append raise: {e}")
+
+    def _truncate(self, payload):
+        """내부메쏘드 payload 를 최대 payload_limit 길이의 문자열로 변환
+
+        Returns:
+            (잘린 문자열, 원래 크기) tuple. DataFrame, dict, list 의 크기는 row 또는 원소 수
+        """
+        limit = self.payload_limit
+        if payload is None:
+            return '', 0
+        if isinstance(payload, (bytes, bytearray, memoryview)):
+            size = len(payload)
+            return bytes(payload[:limit]).decode(self.encoding, errors='replace'), size
+        if isinstance(payload, pd.DataFrame):
+            return f"DataFrame(shape={payload.shape})", len(payload)
+        if isinstance(payload, (dict, list)):
+            return FailList._json_prefix(payload, limit), len(payload)
+        text = payload if isinstance(payload, str) else str(payload)
+        return text[:limit], len(text)
+
+    @staticmethod
+    def _json_prefix(payload, limit: int) -> str:
+        """내부함수 큰 dict, list 를 모두 직렬화하지 않도록 JSON 문자열의 앞 limit 길이까지만 만듦"""
+        chunks = []
+        length = 0
+        try:
+            # iterencode 는 조각 단위로 직렬화하므로 limit 을 넘으면 멈춤
+            for chunk in json.JSONEncoder(ensure_ascii=False, default=str).iterencode(payload):
+                chunks.append(chunk)
+                length += len(chunk)
+                if length >= limit:
+                    break
+        except Exception:
+            return str(payload)[:limit]
+        return ''.join(chunks)[:limit]
@@ -1,9 +1,13 @@
 import io
 import pandas as pd
+import pyarrow as pa
 import pyarrow.feather as feather
-from typing import Dict, Literal, Optional, Union
+from typing import Dict, Iterator, List, Literal, Optional, Union
 
+from .compression import infer_compression
 from .fileformat_base import FileformatBase
+from .metrics import instrument
+from .storage import resolve_storage_path
 from .echoss_logger import get_logger, set_logger_level
 
 logger = get_logger('echoss_fileformat')
@@ -22,14 +26,25 @@ class FeatherHandler(FileformatBase):
     format = "feather"
 
     def __init__(self, processing_type: str = 'object',
-                 encoding='utf-8', error_log='error.log'):
+                 encoding='utf-8', error_log='error.log',
+                 memory_limit: int = None, spill_dir: str = None,
+                 compression: Union[str, dict, None] = 'infer', use_mmap: bool = False,
+                 categorize: str = None):
         """Initialize feather file format
 
         Args:
             processing_type (): Literal['array', 'multiline', 'object']
+            memory_limit (int): 누적 데이터의 메모리 최대 byte 크기. 넘으면 임시 파일로 spill
+            spill_dir (str): spill 임시 파일 디렉토리
+            compression: 파일명 사용 시의 압축 형식. 'infer' 는 확장자와 첫 byte 로 판별, None 은 압축하지 않음
+            use_mmap (bool): True 이면 압축하지 않은 파일명 입력을 memory map 으로 읽음
+            categorize (str): 'auto' 이면 low cardinality 문자열 컬럼을 pandas categorical 로 읽음
         """
-        super().__init__(processing_type = processing_type, encoding=encoding, error_log=error_log)
+        super().__init__(processing_type=processing_type, encoding=encoding, error_log=error_log,
+                         memory_limit=memory_limit, spill_dir=spill_dir,
+                         compression=compression, use_mmap=use_mmap, categorize=categorize)
 
+    @instrument('load')
     def load(self, file_or_filename: Union[io.TextIOWrapper, io.BytesIO, str], **kwargs) -> Optional[pd.DataFrame]:
         """파일 객체나 파일명에서 feather 데이터 읽기
 
@@ -42,22 +57,92 @@ class FeatherHandler(FileformatBase):
         read_df = None
         open_mode = self._decide_rw_open_mode('load')
         # file_or_filename 클래스 유형에 따라서 처리 방법이 다름
-        fp, binary_mode, opened = self._get_file_obj(file_or_filename, open_mode)
+        if self._can_mmap(file_or_filename):
+            # pyarrow 가 파일을 memory map 으로 직접 읽음
+            fp, binary_mode, opened = file_or_filename, True, False
+            kwargs.setdefault('memory_map', True)
+        else:
+            # pyarrow 는 random access 가 필요하여 압축 파일은 압축 해제한 io.BytesIO 사용
+            fp, binary_mode, opened = self._get_file_obj(file_or_filename, open_mode, seekable=True)
 
         try:
             read_df = feather.read_feather(fp, **kwargs)
         except Exception as e:
-            self.fail_list.append(str(fp))
+            self.fail_list.append(None, source=fp, reason=e)
             logger.error(f"{fp=}, {binary_mode=}, {opened=}, {self.processing_type=} load raise: {e}")
 
         # close opened file if filename
         self._safe_close(fp, opened)
 
         if self.processing_type == FileformatBase.TYPE_OBJECT:
-            return read_df
-        else:
+            return self._categorize_frame(read_df)
+        elif read_df is not None:
             self.pass_list.append(read_df)
+            self._check_memory_limit()
+
+    @instrument('iter_chunks')
+    def iter_chunks(self, file_or_filename: Union[io.BytesIO, io.BufferedIOBase, str],
+                    chunk_rows: int = 10000, columns: List[str] = None) -> Iterator[pd.DataFrame]:
+        """feather 파일을 record batch 단위로 읽어서 chunk_rows 단위 dataframe 으로 생성
+
+        파일명은 memory map 으로 열기 때문에 전체 파일을 메모리에 올리지 않음. 압축 파일은 압축 해제 후 나누어 생성
+        feather V1 파일은 record batch 가 없어서 전체를 읽은 후 나누어 생성
+
+        Args:
+            file_or_filename (): file-like object which has read() method or filename string
+            chunk_rows (int): chunk 1개의 최대 row 수
+            columns (list): 사용할 컬럼 이름 목록, None 이면 전체 컬럼 사용
+
+        Returns:
+            pd.DataFrame generator
+        """
+        if chunk_rows is None or chunk_rows <= 0:
+            raise ValueError(f"{chunk_rows=} must be positive")
 
+        source = None
+        opened = False
+        try:
+            if isinstance(file_or_filename, str) and resolve_storage_path(file_or_filename) is None \
+                    and not infer_compression(file_or_filename, 'rb', self.compression):
+                source = pa.memory_map(file_or_filename, 'r')
+                opened = True
+            else:
+                source, binary_mode, opened = self._get_file_obj(file_or_filename, self._decide_rw_open_mode('load'),
+                                                                 seekable=True)
+
+            try:
+                reader = pa.ipc.open_file(source)
+            except pa.ArrowInvalid:
+                # feather V1 형식
+                source.seek(0)
+                table = feather.read_table(source, columns=columns)
+                for offset in range(0, table.num_rows, chunk_rows):
+                    yield table.slice(offset, chunk_rows).to_pandas()
+                return
+
+            pending = []
+            pending_rows = 0
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                pending.append(batch)
+                pending_rows += batch.num_rows
+                while pending_rows >= chunk_rows:
+                    table = pa.Table.from_batches(pending)
+                    yield table.slice(0, chunk_rows).to_pandas()
+                    rest = table.slice(chunk_rows)
+                    pending = rest.to_batches()
+                    pending_rows = rest.num_rows
+            if pending_rows > 0:
+                yield pa.Table.from_batches(pending).to_pandas()
+        except Exception as e:
+            self.fail_list.append(None, source=file_or_filename, reason=e)
+            logger.error(f"{file_or_filename=}, {self.processing_type=} iter_chunks raise: {e}")
+        finally:
+            self._safe_close(source, opened)
+
+    @instrument('loads')
     def loads(self, str_or_bytes: Union[str, bytes]) -> Optional[pd.DataFrame]:
         """문자열이나 bytes 에서 feather 객체 읽기
 
@@ -78,16 +163,17 @@ class FeatherHandler(FileformatBase):
                 file_obj = io.BytesIO(str_or_bytes)
                 read_df = self.load(file_obj )
         except Exception as e:
-            self.fail_list.append(str_or_bytes)
-            logger.error(f"'{str_or_bytes}' loads raise {e}")
+            self.fail_list.append(str_or_bytes, reason=e)
+            logger.error(f"loads [{len(str_or_bytes)}] raise {e}")
         finally:
             if self.processing_type == FileformatBase.TYPE_OBJECT:
                 return read_df
 
+    @instrument('to_pandas')
     def to_pandas(self) -> pd.DataFrame:
         """클래스 내부메쏘드 feather 파일 처리 결과를 pd.DataFrame 형태로 받음
 
-        내부적으로 추가할 데이터(pass_list)가 있으면 추가하여 새로운 pd.DataFrame 생성
+        내부적으로 추가할 데이터(pass_list)가 있으면 data_buffer 에 추가하여 pd.DataFrame 생성
         실패 목록(fail_list)가 있으면 파일로 저장
         (검토 중) 학습을 위한 dataframe 이기 떄문에 dot('.') 문자로 normalize 된 flatten 컬럼과 값을 가진다.
 
@@ -97,46 +183,11 @@ class FeatherHandler(FileformatBase):
             logger.error(f"{self.processing_type} not support to_pandas() method")
             return None
 
-        if len(self.pass_list) > 0:
-            try:
-                # 검토 중. flatten 할 것인가 말 것인가?
-                append_df = pd.DataFrame(self.pass_list)
-                # append_df = pd.feather_normalize(self.pass_list)
-                merge_df = pd.concat([self.data_df, append_df], ignore_index=True)
-                self.data_df = merge_df
-            except Exception as e:
-                logger.error(f"pass_list[{len(self.pass_list)}] to_pandas raise {e}")
-                self.fail_list.extend(self.pass_list)
-            finally:
-                self.pass_list.clear()
-        if len(self.fail_list) > 0:
-            error_fp = None
-            try:
-                error_fp = open(self.error_log, mode='ab')
-            except Exception as e:
-                logger.error(f"fail_list[{len(self.fail_list)}] error log append raise {e}")
-
-            if error_fp:
-                for fail in self.fail_list:
-                    try:
-                        fail_str = None
-                        if isinstance(fail, dict):
-                            fail_str = feather.dumps(fail, ensure_ascii=False, separators=(',', ':'))
-                        elif isinstance(fail, list):
-                            fail_str = str(fail)
-                        elif not isinstance(fail, str):
-                            fail_str = str(fail)
-
-                        if fail_str:
-                            fail_bytes = fail_str.encode(self.encoding)
-                            error_fp.write(fail_bytes)
-                            error_fp.write(b'\n')
-                    except Exception as e:
-                        logger.exception(e)
-                error_fp.close()
-                self.fail_list.clear()
+        self._merge_pass_list()
+        self._flush_fail_list()
         return self.data_df
 
+    @instrument('dump')
     def dump(self, file_or_filename: Union[io.TextIOWrapper, io.BytesIO, str], data=None, **kwargs) -> None:
         """데이터를 feather 파일로 쓰기
 
@@ -162,18 +213,19 @@ class FeatherHandler(FileformatBase):
                 # dataframe 에 추가할 것 있으면 concat
                 data = self.to_pandas()
         except Exception as e:
-            self.fail_list.append(data)
+            self.fail_list.append(data, source=fp, reason=e)
             logger.error(f"{fp=}, {binary_mode=}, {opened=}, '{self.processing_type}' dump raise: {e}")
 
         # 파일로 저장
         try:
             feather.write_feather(data, fp)
         except Exception as e:
-            self.fail_list.append(data)
+            self.fail_list.append(data, source=fp, reason=e)
             logger.error(f"{fp=}, {binary_mode=}, {opened=}, '{self.processing_type}' dump raise: {e}")
 
         self._safe_close(fp, opened)
 
+    @instrument('dumps')
     def dumps(self, data=None ) -> str:
         """feather 데이터를 문자열 또는 바이너리 형태로 출력
 
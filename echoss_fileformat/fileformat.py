@@ -1,28 +1,70 @@
 """
     echoss AI Bigdata Center Solution - file format utilty (static version)
 """
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
 import configparser
+import functools
 import io
 import json
 import numpy as np
 import os
 import pandas as pd
-from typing import Union, Literal, Optional, Dict, List, Any
+from typing import Union, Literal, Optional, Dict, Iterator, List, Any, Tuple
 import unicodedata
 import wcwidth
 import yaml
 
+from echoss_fileformat.compression import infer_compression, split_compression_ext
 from echoss_fileformat.csv_handler import CsvHandler
+from echoss_fileformat.data_buffer import categorize_frame, check_categorize, concat_frames, frame_to_ipc, ipc_to_frame
 from echoss_fileformat.echoss_logger import get_logger
 from echoss_fileformat.excel_handler import ExcelHandler
+from echoss_fileformat.fail_list import FailList
 from echoss_fileformat.feather_handler import FeatherHandler
+from echoss_fileformat.fileformat_base import get_async_executor
 from echoss_fileformat.json_handler import JsonHandler
+from echoss_fileformat.metrics import global_stats, measure_call
+from echoss_fileformat.sniffer import get_sniffer
+from echoss_fileformat.storage import resolve_storage_path
 from echoss_fileformat.xml_handler import XmlHandler
 
 logger = get_logger("echoss_fileformat")
 EMPTY_DATAFRAME = pd.DataFrame()
 EMPTY_DICT = dict()
 
+def _append_fail(fail_list: Union[FailList, list, None], path, e: BaseException) -> None:
+    """FileUtil.load_many(), aload_many() 에서 읽기 실패한 파일을 FailList 와 같은 형식의 기록으로 추가"""
+    if isinstance(fail_list, FailList):
+        fail_list.append(None, source=path, reason=e)
+    elif fail_list is not None:
+        record_list = FailList(error_log=None)
+        record_list.append(None, source=path, reason=e)
+        fail_list.extend(record_list.records)
+
+
+def _load_file(file_path, file_format, kwargs) -> pd.DataFrame:
+    """FileUtil.load_many() 의 worker 함수. 읽기 실패로 결과가 없으면 예외 발생"""
+    df = FileUtil.load(file_path, file_format=file_format, **dict(kwargs))
+    if df is None:
+        raise IOError(f"'{file_path}' load fail")
+    return df
+
+
+def _load_file_to_ipc(file_path, file_format, kwargs):
+    """FileUtil.load_many() 의 process worker 함수. 결과를 Arrow IPC 버퍼로 리턴
+
+    Arrow 로 변환할 수 없는 컬럼이 있으면 dataframe 을 그대로 리턴
+    """
+    df = _load_file(file_path, file_format, kwargs)
+    try:
+        return frame_to_ipc(df)
+    except Exception as e:
+        logger.debug(f"load_many '{file_path}' arrow ipc raise: {e}")
+        return df
+
+
 class FileUtil:
     """AI 학습을 위한 파일 포맷 지원 static 클래스
 
@@ -54,14 +96,13 @@ class FileUtil:
         """파일에서 데이터 읽기
 
         Args:
-            file_path (str): 파일명
+            file_path (str): 파일명, 's3://bucket/key' 같은 저장소 URL 또는 StoragePath
             file_format (str): explict file format name if is not None
             kwargs : option key value args
 
         """
         if file_format is None:
-            _, ext = os.path.splitext(file_path)
-            file_format = ext[1:].lower() if ext else None
+            file_format = FileUtil._infer_file_format(file_path)
 
         if "csv" == file_format:
             return FileUtil.load_csv(file_path, **kwargs)
@@ -78,43 +119,272 @@ class FileUtil:
         elif "xml" == file_format:
             return FileUtil.load_xml(file_path, **kwargs)
         elif "parquet" == file_format:
-            return pd.read_parquet(file_path, **kwargs)
+            categorize = kwargs.pop('categorize', None)
+            check_categorize(categorize)
+            df = measure_call('parquet', 'load', file_path, FileUtil._read_parquet, file_path, **kwargs)
+            return categorize_frame(df) if categorize is not None else df
         elif "feather" == file_format:
-            return pd.read_feather(file_path, **kwargs)
+            if resolve_storage_path(file_path) is not None \
+                    or infer_compression(file_path, 'rb', kwargs.get('compression', 'infer')):
+                kwargs['processing_type'] = 'object'
+                handler = FileUtil._init_featherhandler(kwargs)
+                return handler.load(file_path, **kwargs)
+            categorize = kwargs.pop('categorize', None)
+            check_categorize(categorize)
+            df = measure_call('feather', 'load', file_path, pd.read_feather, file_path, **kwargs)
+            return categorize_frame(df) if categorize is not None else df
         else:
             logger.error(f"File {file_path} format {file_format} is not supported")
             return EMPTY_DATAFRAME
 
+    @staticmethod
+    def stats() -> Dict[str, dict]:
+        """process 안의 모든 handler 와 FileUtil 처리 누적 통계
+
+        load_many(executor='process') 의 worker process 통계는 포함하지 않음
+
+        Returns:
+            {파일 포맷: 통계 dictionary, 'total': 전체 합계} 형태. 통계 항목은 handler.stats() 와 같음
+        """
+        return global_stats.to_dict()
+
+    @staticmethod
+    def reset_stats() -> None:
+        """FileUtil.stats() 누적 통계 초기화"""
+        global_stats.reset()
+
+    @staticmethod
+    def add_observer(callback) -> None:
+        """모든 handler 와 FileUtil 의 처리가 끝날 때마다 통계 event dictionary 로 호출할 observer 등록
+
+        Args:
+            callback: event dictionary 를 받는 함수. handler.add_observer() 의 event 와 같은 형태
+        """
+        global_stats.add_observer(callback)
+
+    @staticmethod
+    def remove_observer(callback) -> None:
+        """FileUtil.add_observer() 로 등록한 observer 제거"""
+        global_stats.remove_observer(callback)
+
+    @staticmethod
+    def _read_parquet(file_path, **kwargs) -> pd.DataFrame:
+        """내부함수 parquet 파일 읽기. 저장소 경로는 pyarrow 가 footer 와 필요한 column chunk 만 range read"""
+        storage_path = resolve_storage_path(file_path)
+        if storage_path is not None:
+            with storage_path.open('rb') as fp:
+                return pd.read_parquet(fp, **kwargs)
+        return pd.read_parquet(file_path, **kwargs)
+
+    @staticmethod
+    def _write_parquet(df: pd.DataFrame, file_path, **kwargs) -> None:
+        """내부함수 parquet 파일 쓰기"""
+        storage_path = resolve_storage_path(file_path)
+        if storage_path is not None:
+            with storage_path.open('wb') as fp:
+                return df.to_parquet(fp, **kwargs)
+        return df.to_parquet(file_path, **kwargs)
+
+    @staticmethod
+    def _infer_file_format(file_path: str) -> Optional[str]:
+        """파일 확장자로 파일 포맷 결정. 압축 확장자는 제외하고 판별 예) 'data.jsonl.zst' -> 'jsonl'
+
+        Args:
+            file_path (str): 파일명
+
+        Returns:
+            소문자 파일 포맷 이름 또는 확장자가 없으면 None
+        """
+        base, _ = split_compression_ext(str(file_path))
+        _, ext = os.path.splitext(base)
+        return ext[1:].lower() if ext else None
+
+    @staticmethod
+    def load_many(paths: List[str], workers: int = None, executor: Literal['thread', 'process'] = 'thread',
+                  ordered: bool = True, combine: bool = True, fail_list: Union[FailList, list] = None, file_format=None,
+                  **kwargs) -> Union[pd.DataFrame, Iterator[Tuple[str, pd.DataFrame]]]:
+        """여러 파일을 thread 또는 process pool 에서 병렬로 읽기
+
+        각 파일은 FileUtil.load() 로 읽고, 실패한 파일은 전체를 중단하지 않고 fail_list 에 수집함.
+        'process' 는 dataframe 을 pickle 하지 않고 Arrow IPC 버퍼로 부모 프로세스에 전달.
+        동시에 읽는 파일은 worker 수의 2배까지이고 결과를 가져간 파일부터 다음 파일을 읽으므로
+        combine=False 의 generator 는 아직 가져가지 않은 몇 개 파일의 dataframe 만 메모리에 보관함
+
+        Args:
+            paths (list): 파일명 목록
+            workers (int): 동시 실행 worker 수, None 이면 os.cpu_count()
+            executor (str): 'thread' 또는 'process'
+            ordered (bool): True 이면 paths 순서, False 이면 완료 순서로 결과 생성
+            combine (bool): True 이면 하나의 dataframe 으로 합쳐서 리턴, False 이면 (path, dataframe) generator 리턴
+            fail_list (FailList): 실패한 파일을 기록할 FailList. list 이면 FailList 와 같은 형식의
+                {'source': path, 'offset', 'reason': 에러 메시지, 'payload', 'size'} 기록을 추가
+            file_format (str): explict file format name if is not None
+            kwargs : FileUtil.load() 의 option key value args
+
+        Returns:
+            combine=True 이면 pd.DataFrame, combine=False 이면 (path, pd.DataFrame) generator
+        """
+        results = FileUtil._iter_load_many(paths, workers, executor, ordered, fail_list, file_format, kwargs)
+        if not combine:
+            return results
+        df_list = [df for _, df in results]
+        if len(df_list) == 0:
+            return pd.DataFrame()
+        return concat_frames(df_list)
+
+    @staticmethod
+    def _iter_load_many(paths, workers, executor, ordered, fail_list, file_format,
+                        kwargs) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """내부메쏘드 load_many() 의 (path, dataframe) generator
+
+        worker 수의 2배까지만 제출하고 결과를 넘긴 future 는 바로 버림. generator 를 닫으면 시작하지 않은 읽기는 취소
+        """
+        if executor == 'thread':
+            pool = ThreadPoolExecutor(max_workers=workers)
+            load_func = _load_file
+        elif executor == 'process':
+            pool = ProcessPoolExecutor(max_workers=workers)
+            load_func = _load_file_to_ipc
+        else:
+            raise ValueError(f"{executor=} must be 'thread' or 'process'")
+
+        paths = deque(paths)
+        max_pending = 2 * (workers or os.cpu_count() or 1)
+        # 제출 순서의 (future, path) 목록
+        pending = deque()
+
+        def submit_next():
+            if len(paths) > 0:
+                path = paths.popleft()
+                pending.append((pool.submit(load_func, path, file_format, kwargs), path))
+
+        try:
+            for _ in range(max_pending):
+                submit_next()
+            while len(pending) > 0:
+                if ordered:
+                    future, path = pending.popleft()
+                else:
+                    done, _ = wait([future for future, _ in pending], return_when=FIRST_COMPLETED)
+                    index = next(i for i, (future, _) in enumerate(pending) if future in done)
+                    future, path = pending[index]
+                    del pending[index]
+                submit_next()
+                try:
+                    df = future.result()
+                    if not isinstance(df, pd.DataFrame):
+                        df = ipc_to_frame(df)
+                except Exception as e:
+                    logger.error(f"load_many '{path}' raise: {e}")
+                    _append_fail(fail_list, path, e)
+                else:
+                    future = None
+                    yield path, df
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    async def aload(file_path: str, file_format=None, executor: Executor = None, **kwargs) -> pd.DataFrame:
+        """load() 의 asyncio 버전. 파일 읽기와 파싱을 executor 에서 실행
+
+        Args:
+            file_path (str): 파일명
+            file_format (str): explict file format name if is not None
+            executor: 사용할 executor, None 이면 공유 thread pool
+            kwargs : option key value args
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(FileUtil.load, file_path, file_format, **kwargs)
+        return await loop.run_in_executor(executor or get_async_executor(), call)
+
+    @staticmethod
+    async def aload_many(paths: List[str], limit: int = 8, combine: bool = True,
+                         fail_list: Union[FailList, list] = None,
+                         file_format=None, executor: Executor = None,
+                         **kwargs) -> Union[pd.DataFrame, List[Tuple[str, pd.DataFrame]]]:
+        """여러 파일을 최대 limit 개까지 동시에 asyncio 로 읽기
+
+        실패한 파일은 전체를 중단하지 않고 fail_list 에 수집함.
+        task 를 cancel 하면 아직 시작하지 않은 파일 읽기는 모두 취소됨
+
+        Args:
+            paths (list): 파일명 목록
+            limit (int): 동시에 읽을 최대 파일 수
+            combine (bool): True 이면 하나의 dataframe 으로 합쳐서 리턴, False 이면 (path, dataframe) 목록 리턴
+            fail_list (FailList): 실패한 파일을 기록할 FailList. list 이면 FailList 와 같은 형식의 기록을 추가
+            file_format (str): explict file format name if is not None
+            executor: 사용할 executor, None 이면 공유 thread pool
+            kwargs : FileUtil.load() 의 option key value args
+
+        Returns:
+            combine=True 이면 pd.DataFrame, combine=False 이면 paths 순서의 (path, pd.DataFrame) 목록
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(limit)
+
+        async def load_one(path):
+            async with semaphore:
+                return await loop.run_in_executor(executor or get_async_executor(),
+                                                  _load_file, path, file_format, kwargs)
+
+        results = await asyncio.gather(*[load_one(path) for path in paths], return_exceptions=True)
+        path_dfs = []
+        for path, result in zip(paths, results):
+            if isinstance(result, BaseException):
+                logger.error(f"aload_many '{path}' raise: {result}")
+                _append_fail(fail_list, path, result)
+            else:
+                path_dfs.append((path, result))
+
+        if not combine:
+            return path_dfs
+        if len(path_dfs) == 0:
+            return pd.DataFrame()
+        return concat_frames([df for _, df in path_dfs])
+
     @staticmethod
     def load_csv(file_or_filename, **kwargs) -> pd.DataFrame:
-        handler = FileUtil._init_csv_handler(kwargs)
+        handler = FileUtil._init_csv_handler(kwargs, file_or_filename)
         df = handler.load(file_or_filename, **kwargs)
         return df
 
     @staticmethod
-    def _init_csv_handler(kwargs):
+    def _init_csv_handler(kwargs, file_or_filename=None):
         # processing_type='array', encoding='utf-8',
         # delimiter=',', quotechar='"', quoting=0, escapechar='\\'
+        # sniff=True, cache 파일명 또는 CsvSniffer 이면 지정하지 않은 encoding, delimiter, quotechar, header 를 판별
+        sniffer = get_sniffer(kwargs.pop('sniff', None))
+        if sniffer is not None and file_or_filename is not None:
+            sniffed = sniffer.sniff(file_or_filename, kwargs.get('compression', 'infer'))
+            if sniffed is not None:
+                for key, value in sniffed.items():
+                    kwargs.setdefault(key, value)
         processing_type = kwargs.pop('processing_type', 'object')
         encoding = kwargs.pop('encoding', 'utf-8')
         delimiter = kwargs.pop('delimiter', ',')
         quotechar = kwargs.pop('quotechar', '"')
         quoting = kwargs.pop('quoting', 0)
         escapechar = kwargs.pop('escapechar', '\\')
+        compression = kwargs.pop('compression', 'infer')
+        use_mmap = kwargs.pop('use_mmap', False)
+        categorize = kwargs.pop('categorize', None)
         handler = CsvHandler(
             processing_type=processing_type,
             encoding=encoding,
             delimiter=delimiter,
             quotechar=quotechar,
             quoting=quoting,
-            escapechar=escapechar
+            escapechar=escapechar,
+            compression=compression,
+            use_mmap=use_mmap,
+            categorize=categorize
         )
         return handler
 
     @staticmethod
     def load_tsv(file_or_filename, **kwargs) -> pd.DataFrame:
         kwargs['delimiter'] = '\t'
-        handler = FileUtil._init_csv_handler(kwargs)
+        handler = FileUtil._init_csv_handler(kwargs, file_or_filename)
         df = handler.load(file_or_filename, **kwargs)
         return df
 
@@ -130,9 +400,15 @@ class FileUtil:
         # processing_type: str = 'array', encoding='utf-8',
         processing_type = kwargs.pop('processing_type', 'object')
         encoding = kwargs.pop('encoding', 'utf-8')
+        compression = kwargs.pop('compression', 'infer')
+        use_mmap = kwargs.pop('use_mmap', False)
+        categorize = kwargs.pop('categorize', None)
         handler = ExcelHandler(
             processing_type=processing_type,
-            encoding=encoding
+            encoding=encoding,
+            compression=compression,
+            use_mmap=use_mmap,
+            categorize=categorize
         )
         kwargs.pop('engine', 'openpyxl')
         return handler
@@ -156,9 +432,15 @@ class FileUtil:
         # processing_type: str = 'array', encoding='utf-8',
         processing_type = kwargs.pop('processing_type', 'object')
         encoding = kwargs.pop('encoding', 'utf-8')
+        compression = kwargs.pop('compression', 'infer')
+        use_mmap = kwargs.pop('use_mmap', False)
+        categorize = kwargs.pop('categorize', None)
         handler = FeatherHandler(
             processing_type=processing_type,
-            encoding=encoding
+            encoding=encoding,
+            compression=compression,
+            use_mmap=use_mmap,
+            categorize=categorize
         )
         return handler
 
@@ -174,9 +456,17 @@ class FileUtil:
         # processing_type: str = 'array', encoding='utf-8',
         processing_type = kwargs.pop('processing_type', 'object')
         encoding = kwargs.pop('encoding', 'utf-8')
+        compression = kwargs.pop('compression', 'infer')
+        use_mmap = kwargs.pop('use_mmap', False)
+        categorize = kwargs.pop('categorize', None)
+        json_backend = kwargs.pop('json_backend', 'auto')
         handler = JsonHandler(
             processing_type=processing_type,
-            encoding=encoding
+            encoding=encoding,
+            compression=compression,
+            use_mmap=use_mmap,
+            categorize=categorize,
+            json_backend=json_backend
         )
         return handler
 
@@ -200,9 +490,15 @@ class FileUtil:
         # processing_type: str = 'array', encoding='utf-8',
         processing_type = kwargs.pop('processing_type', 'object')
         encoding = kwargs.pop('encoding', 'utf-8')
+        compression = kwargs.pop('compression', 'infer')
+        use_mmap = kwargs.pop('use_mmap', False)
+        categorize = kwargs.pop('categorize', None)
         handler = XmlHandler(
             processing_type=processing_type,
-            encoding=encoding
+            encoding=encoding,
+            compression=compression,
+            use_mmap=use_mmap,
+            categorize=categorize
         )
         return handler
 
@@ -217,7 +513,7 @@ class FileUtil:
         파일은 text, binary 모드 파일객체이거나 파일명 문자열
         Args:
             df (DataFrame) : write dataframe
-            file_path (str): 파일명
+            file_path (str): 파일명, 's3://bucket/key' 같은 저장소 URL 또는 StoragePath
             file_format (str): file extension name if you want explict format
             force_write (bool): overwrite exist file ?
 
@@ -225,10 +521,11 @@ class FileUtil:
             없음
         """
         if file_format is None:
-            _, ext = os.path.splitext(file_path)
-            file_format = ext[1:].lower() if ext else None
+            file_format = FileUtil._infer_file_format(file_path)
 
-        if os.path.exists(file_path) and force_write is False:
+        storage_path = resolve_storage_path(file_path)
+        exists = storage_path.exists() if storage_path is not None else os.path.exists(file_path)
+        if exists and force_write is False:
             logger.error(f"Can not overwrite exist config file [{file_path}] use force_write=True if need")
             return
 
@@ -247,12 +544,30 @@ class FileUtil:
         elif "xml" == file_format:
             FileUtil.dump_xml(df, file_path, **kwargs)
         elif "parquet" == file_format:
-            return df.to_parquet(file_path, **kwargs)
+            return measure_call('parquet', 'dump', file_path, FileUtil._write_parquet, df, file_path, **kwargs)
         elif "feather" == file_format:
-            return df.to_feather(file_path, **kwargs)
+            if storage_path is not None or infer_compression(file_path, 'wb', kwargs.get('compression', 'infer')):
+                return FileUtil.dump_feather(df, file_path, **kwargs)
+            return measure_call('feather', 'dump', file_path, pd.DataFrame.to_feather, df, file_path, **kwargs)
         else:
             logger.error(f"File {file_path} format {file_format} is not supported")
 
+    @staticmethod
+    async def adump(df: pd.DataFrame, file_path: str, file_format=None, force_write=False,
+                    executor: Executor = None, **kwargs) -> None:
+        """dump() 의 asyncio 버전. 파일 쓰기를 executor 에서 실행
+
+        Args:
+            df (DataFrame) : write dataframe
+            file_path (str): 파일명
+            file_format (str): file extension name if you want explict format
+            force_write (bool): overwrite exist file ?
+            executor: 사용할 executor, None 이면 공유 thread pool
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(FileUtil.dump, df, file_path, file_format, force_write, **kwargs)
+        return await loop.run_in_executor(executor or get_async_executor(), call)
+
     @staticmethod
     def dump_csv(df: pd.DataFrame, file_or_filename, **kwargs) -> None:
         handler = FileUtil._init_csv_handler(kwargs)
@@ -314,8 +629,7 @@ class FileUtil:
             dict
         """
         if file_format is None:
-            _, ext = os.path.splitext(file_path)
-            file_format = ext[1:].lower() if ext else None
+            file_format = FileUtil._infer_file_format(file_path)
         if not os.path.exists(file_path):
             logger.error(f"load config file [{file_path}] is not exist")
             return EMPTY_DICT
@@ -366,8 +680,7 @@ class FileUtil:
             kwargs : keyword arguments
         """
         if file_format is None:
-            _, ext = os.path.splitext(file_path)
-            file_format = ext[1:].lower() if ext else None
+            file_format = FileUtil._infer_file_format(file_path)
 
         if os.path.exists(file_path) and force_write is False:
             logger.error(f"Can not overwrite exist config file [{file_path}] use force_write=True if need")
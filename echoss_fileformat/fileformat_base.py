@@ -1,14 +1,47 @@
 """
     echoss AI Bigdata Center Solution - file format utilty
 """
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+import functools
 import io
+import mmap
+import os
 import pandas as pd
-from typing import Literal, Optional, Tuple, Union
+import threading
+from typing import Callable, Iterable, Iterator, Literal, Optional, Tuple, Union
 
+from echoss_fileformat.compression import (compression_from_magic, infer_compression, open_compressed,
+                                           parse_compression, split_compression_ext)
+from echoss_fileformat.data_buffer import ColumnAccumulator, DataBuffer, categorize_frame
 from echoss_fileformat.echoss_logger import get_logger
+from echoss_fileformat.fail_list import FailList
+from echoss_fileformat.metrics import HandlerStats, stat_timer
+from echoss_fileformat.storage import StoragePath, resolve_storage_path
 
 logger = get_logger("echoss_fileformat")
 
+# aload/adump 에서 공유하는 thread pool 의 최대 worker 수
+ASYNC_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+_async_executor = None
+_async_executor_lock = threading.Lock()
+
+
+def get_async_executor() -> Executor:
+    """aload/adump 에서 파일 처리를 실행할 공유 thread pool
+
+    최초 호출 시에 ASYNC_MAX_WORKERS 크기로 생성
+
+    Returns:
+        concurrent.futures.Executor
+    """
+    global _async_executor
+    with _async_executor_lock:
+        if _async_executor is None:
+            _async_executor = ThreadPoolExecutor(max_workers=ASYNC_MAX_WORKERS,
+                                                 thread_name_prefix='echoss_fileformat')
+        return _async_executor
+
 
 class FileformatBase:
     """AI 학습을 위한 파일 포맷 지원 기반 클래스
@@ -41,19 +74,44 @@ class FileformatBase:
     TYPE_OBJECT = 'object'
 
 
-    def __init__(self, processing_type='array', encoding='utf-8', error_log='error.log'):
+    # memory_limit 지정 시에 pass_list 의 dictionary 를 data_buffer 로 옮기는 row 단위
+    SPILL_CHECK_ROWS = 10000
+
+    def __init__(self, processing_type='array', encoding='utf-8', error_log='error.log',
+                 memory_limit: int = None, spill_dir: str = None, compression: Union[str, dict, None] = 'infer',
+                 use_mmap: bool = False, categorize: str = None):
         """       
         Args:
             processing_type (): Literal['array', 'multiline', 'object']
             encoding: 파일 인코팅 
             error_log: 파일 처리 실패 시 에러 저장 파일명 
+            memory_limit (int): 누적 데이터의 메모리 최대 byte 크기. 넘으면 임시 파일로 spill. None 이면 제한 없음
+            spill_dir (str): spill 임시 파일 디렉토리. None 이면 시스템 임시 디렉토리 사용
+            compression: 파일명 사용 시의 압축 형식. 'infer' 는 확장자와 첫 byte 로 판별, None 은 압축하지 않음,
+                'gzip', 'bz2', 'xz', 'zstd' 또는 {'method': 'zstd', 'level': 3, 'threads': 4} 형태로 지정
+            use_mmap (bool): True 이면 압축하지 않은 파일명 입력을 memory map 으로 읽어서 buffer 복사를 줄임
+            categorize (str): 'auto' 이면 low cardinality 문자열 컬럼을 pandas categorical 로 누적하여 메모리를 줄임
         """
         self.processing_type = processing_type;
         self.data_df = pd.DataFrame()
+        # to_pandas() 에서 pass_list 를 누적하는 append-only 버퍼
+        self.memory_limit = memory_limit
+        self.categorize = categorize
+        self.data_buffer = DataBuffer(memory_limit=memory_limit, spill_dir=spill_dir, categorize=categorize)
         self.encoding = encoding
         self.error_log = error_log
-        self.pass_list = []
-        self.fail_list = []
+        self.compression = compression
+        self.use_mmap = use_mmap
+        # dictionary row 는 키별 컬럼 list 로, dataframe 은 그대로 누적
+        self.pass_list = ColumnAccumulator()
+        # 실패 기록은 크기를 제한하고 넘치면 error_log 로 옮김
+        self.fail_list = FailList(error_log=error_log, encoding=encoding)
+        # aload/adump 동시 호출 시에 내부 목록을 보호
+        self._lock = threading.Lock()
+        # 처리 통계와 처리 완료 시에 호출할 observer 목록
+        self._stats = HandlerStats()
+        self._observers = []
+        self._instrument_depth = 0
 
     def __str__(self):
         return f"('format': {self.format}, 'processing_type': {self.processing_type}, 'encoding': {self.encoding})"
@@ -80,6 +138,23 @@ class FileformatBase:
         """
         pass
 
+    def iter_chunks(self, file_or_filename: Union[io.TextIOWrapper, io.BytesIO, str],
+                    chunk_rows: int = 10000, **kwargs) -> Iterator[pd.DataFrame]:
+        """파일을 chunk_rows 크기 이하의 dataframe 으로 나누어 순차적으로 읽기
+
+        load() 와 같은 header, usecols, data_key 옵션을 사용하지만 pass_list 에 누적하지 않음.
+        메모리 사용량은 파일 크기가 아니라 chunk 크기에 비례함
+
+        Args:
+            file_or_filename (file, str): 파일객체 또는 파일명
+            chunk_rows (int): chunk 1개의 최대 row 수
+            **kwargs : 자식 클래스 load() 와 동일한 키워드 옵션
+
+        Returns:
+            pd.DataFrame generator
+        """
+        raise NotImplementedError(f"{self.format} handler not support iter_chunks() method")
+
     def to_pandas(self) -> pd.DataFrame:
         """파일 처리 결과를 모두 반영하여 pd.DataFrame 형태로 출력함
 
@@ -114,12 +189,79 @@ class FileformatBase:
         """
         pass
 
+    async def aload(self, file_or_filename, *args, executor: Executor = None, **kwargs):
+        """load() 의 asyncio 버전
+
+        event loop 를 막지 않도록 파일 읽기와 파싱을 executor 에서 실행.
+        같은 handler 의 aload/adump 는 순서대로 실행되고, 다른 handler 는 동시에 실행됨.
+        task 를 cancel 하면 아직 시작하지 않은 작업은 실행되지 않음
+
+        Args:
+            file_or_filename (file, str): 파일객체 또는 파일명
+            *args: load() 의 위치 매개변수
+            executor: 사용할 executor, None 이면 get_async_executor() 의 공유 thread pool
+            **kwargs: load() 의 키워드 옵션
+
+        Returns:
+            load() 의 리턴값
+        """
+        return await self._run_in_executor(self.load, file_or_filename, *args, executor=executor, **kwargs)
+
+    async def adump(self, file_or_filename, *args, executor: Executor = None, **kwargs) -> None:
+        """dump() 의 asyncio 버전
+
+        Args:
+            file_or_filename (file, str): 파일객체 또는 파일명
+            *args: dump() 의 위치 매개변수
+            executor: 사용할 executor, None 이면 get_async_executor() 의 공유 thread pool
+            **kwargs: dump() 의 키워드 옵션
+        """
+        return await self._run_in_executor(self.dump, file_or_filename, *args, executor=executor, **kwargs)
+
+    def stats(self) -> dict:
+        """handler 생성 또는 reset_stats() 이후의 누적 처리 통계
+
+        Returns:
+            bytes_read, bytes_written, rows_parsed, rows_written, rows_failed, calls 와
+            open_time, parse_time, convert_time, concat_time, write_time (초) 를 담은 dictionary
+        """
+        return self._stats.to_dict()
+
+    def reset_stats(self) -> None:
+        """누적 처리 통계 초기화"""
+        self._stats.reset()
+
+    def add_observer(self, callback: Callable[[dict], None]) -> None:
+        """load, loads, iter_chunks, to_pandas, dump, dumps 호출이 끝날 때마다 호출할 observer 등록
+
+        Args:
+            callback: 1회 호출의 통계 event dictionary 를 받는 함수.
+                event 에는 stats() 항목과 'handler', 'format', 'operation', 'source', 'elapsed' 가 포함됨
+        """
+        self._observers.append(callback)
+
+    def remove_observer(self, callback: Callable[[dict], None]) -> None:
+        """등록한 observer 제거"""
+        if callback in self._observers:
+            self._observers.remove(callback)
+
     """
     
     클래스 내부 메쏘드 
     
     """
 
+    async def _run_in_executor(self, func, *args, executor: Executor = None, **kwargs):
+        """내부메쏘드 handler lock 을 잡고 func 를 executor 에서 실행"""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self._call_locked, func, *args, **kwargs)
+        return await loop.run_in_executor(executor or get_async_executor(), call)
+
+    def _call_locked(self, func, *args, **kwargs):
+        """내부메쏘드 handler lock 을 잡고 func 실행"""
+        with self._lock:
+            return func(*args, **kwargs)
+
     def _decide_rw_open_mode(self, method_name) -> str:
         """내부메쏘드 json_type 과 method_name 에 따라서 파일 일기/쓰기 오픈 모드 결정
 
@@ -140,14 +282,25 @@ class FileformatBase:
         else:
             raise TypeError(f"'{self.processing_type}' method_name='{method_name}'] not supported yet.")
 
-    def _get_file_obj(self, file_or_filename, open_mode: str) -> Tuple[object, bool, bool]:
+    def _get_file_obj(self, file_or_filename, open_mode: str, seekable=False) -> Tuple[object, bool, bool]:
+        """클래스 내부 메쏘드 _open_file_obj() 를 호출하고 소요 시간을 open_time 통계에 누적"""
+        with stat_timer(self._stats, 'open_time'):
+            return self._open_file_obj(file_or_filename, open_mode, seekable=seekable)
+
+    def _open_file_obj(self, file_or_filename, open_mode: str, seekable=False) -> Tuple[object, bool, bool]:
         """클래스 내부 메쏘드 file_or_filename 의 instance type 을 확인하여 사용하기 편한 file object 로 변환
 
+        filename 이 압축 파일이면 streaming 으로 압축 해제/압축하는 file object 를 사용
+        use_mmap 이면 'rb' 모드의 filename 은 읽기 전용 mmap.mmap 객체를 사용
+        StoragePath 또는 's3://bucket/key' 같은 URL 문자열은 등록된 저장소의 file object 를 사용
+
         Args:
             file_or_filename: file 관련 객체 또는 filename
 
             open_mode(): Literal['r', 'w', 'a', 'rb', 'wb', 'ab']
 
+            seekable (bool): True 이면 압축 파일 읽기 시에 압축 해제한 내용을 io.BytesIO 로 제공
+
         Returns: file_obj, binary_mode, opened
             file_obj: file object to read, write and split lines
 
@@ -162,7 +315,16 @@ class FileformatBase:
         if open_mode not in ['r', 'w', 'a', 'rb', 'wb', 'ab']:
             raise TypeError(f"{open_mode=} is not supported")
 
-        if isinstance(file_or_filename, (io.TextIOWrapper, io.StringIO)):
+        storage_path = resolve_storage_path(file_or_filename)
+        if storage_path is not None:
+            try:
+                fp = self._open_storage_path(storage_path, open_mode, seekable=seekable)
+            except Exception as e:
+                logger.error(f"{storage_path} is not exist or can not open mode='{open_mode}' {e}")
+                raise e
+            binary_mode = 'b' in open_mode
+            opened = True
+        elif isinstance(file_or_filename, (io.TextIOWrapper, io.StringIO)):
             binary_mode = False
         # AWS s3 use io.BytesIO
         elif isinstance(file_or_filename, (io.BytesIO, io.RawIOBase)):
@@ -174,7 +336,20 @@ class FileformatBase:
                 binary_mode = True
         elif isinstance(file_or_filename, str):
             try:
-                if 'b' in open_mode:
+                method = infer_compression(file_or_filename, open_mode, self.compression)
+                if open_mode == 'rb' and self._can_mmap(file_or_filename):
+                    with open(file_or_filename, 'rb') as raw_fp:
+                        fp = mmap.mmap(raw_fp.fileno(), 0, access=mmap.ACCESS_READ)
+                    binary_mode = True
+                elif method:
+                    _, level, threads = parse_compression(self.compression)
+                    fp = open_compressed(file_or_filename, open_mode, method, encoding=self.encoding,
+                                         level=level, threads=threads)
+                    if seekable and 'r' in open_mode:
+                        with fp:
+                            fp = io.BytesIO(fp.read())
+                    binary_mode = 'b' in open_mode
+                elif 'b' in open_mode:
                     fp = open(file_or_filename, open_mode)
                     binary_mode = True
                 else:
@@ -188,6 +363,133 @@ class FileformatBase:
             raise TypeError(f"{file_or_filename} is not file obj")
         return fp, binary_mode, opened
 
+    def _open_storage_path(self, storage_path: StoragePath, open_mode: str, seekable=False):
+        """내부메쏘드 StoragePath 를 압축 형식과 open_mode 에 맞는 file object 로 열기
+
+        확장자가 없으면 앞 10 byte 를 range read 하여 압축 형식을 판별
+        """
+        if 'a' in open_mode:
+            raise TypeError(f"{open_mode=} is not supported for {storage_path}")
+        reading = 'r' in open_mode
+        method, level, threads = parse_compression(self.compression)
+        if method == 'infer':
+            _, method = split_compression_ext(storage_path.path)
+            if method is None and reading:
+                method = compression_from_magic(storage_path.read_range(0, 10))
+
+        fp = storage_path.open('rb' if reading else 'wb')
+        if method:
+            fp = open_compressed(fp, open_mode, method, encoding=self.encoding, level=level, threads=threads)
+            if seekable and reading:
+                with fp:
+                    fp = io.BytesIO(fp.read())
+        elif 'b' not in open_mode:
+            fp = io.TextIOWrapper(fp, encoding=self.encoding)
+        return fp
+
+    def _can_mmap(self, file_or_filename) -> bool:
+        """내부메쏘드 use_mmap 설정 시에 memory map 으로 읽을 수 있는 파일명인지 확인
+
+        압축 파일과 memory map 할 수 없는 빈 파일은 제외
+        """
+        if not self.use_mmap or not isinstance(file_or_filename, str):
+            return False
+        if infer_compression(file_or_filename, 'rb', self.compression):
+            return False
+        return os.path.isfile(file_or_filename) and os.path.getsize(file_or_filename) > 0
+
+    def _merge_pass_list(self) -> pd.DataFrame:
+        """내부메쏘드 pass_list 를 data_buffer 에 추가하고 data_df 갱신
+
+        data_buffer 는 append-only 버퍼라서 반복 호출해도 새로 추가된 row 만 복사함
+
+        Returns:
+            누적된 전체 dataframe
+        """
+        self._flush_pass_list()
+        with stat_timer(self._stats, 'concat_time'):
+            self.data_df = self.data_buffer.to_frame()
+        return self.data_df
+
+    def _flush_pass_list(self) -> None:
+        """내부메쏘드 pass_list 를 data_buffer 로 옮기고 pass_list 를 비움
+
+        pass_list 의 dataframe 항목은 그대로, 컬럼으로 누적된 dictionary row 는 dataframe 으로 변환하여 추가
+        """
+        if len(self.pass_list) > 0:
+            row_df = None
+            try:
+                # row 는 dataframe 항목 다음에 추가된 것이므로 마지막에 추가
+                if self.pass_list.rows > 0:
+                    with stat_timer(self._stats, 'convert_time'):
+                        row_df = self.pass_list.to_frame()
+                with stat_timer(self._stats, 'concat_time'):
+                    for df in self.pass_list.frames:
+                        self.data_buffer.append(df)
+                    if row_df is not None:
+                        self.data_buffer.append(row_df)
+            except Exception as e:
+                logger.error(f"pass_list[{len(self.pass_list)}] to_pandas raise: {e}")
+                self.fail_list.extend(list(self.pass_list) + ([row_df] if row_df is not None else []), reason=e)
+            finally:
+                self.pass_list.clear()
+
+    def _flush_fail_list(self) -> None:
+        """내부메쏘드 메모리의 실패 기록을 error_log 로 옮기고 fail_list 를 초기화
+
+        error_log 쓰기는 background thread 에서 batch 단위로 진행됨
+        """
+        if len(self.fail_list) > 0:
+            self.fail_list.error_log = self.error_log
+            self.fail_list.flush()
+            self.fail_list.clear()
+
+    def _check_memory_limit(self) -> None:
+        """내부메쏘드 memory_limit 지정 시에 pass_list 를 data_buffer 로 옮겨서 spill 대상으로 만듦
+
+        dataframe 항목은 바로 옮기고, dictionary 항목은 SPILL_CHECK_ROWS 건 단위로 옮김
+        """
+        if self.memory_limit is None or len(self.pass_list) == 0:
+            return
+        if len(self.pass_list.frames) > 0 or self.pass_list.rows >= FileformatBase.SPILL_CHECK_ROWS:
+            self._flush_pass_list()
+
+    def _categorize_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """내부메쏘드 categorize='auto' 이면 'object' 처리 결과 dataframe 의 low cardinality 문자열 컬럼을 categorical 로 변환"""
+        if self.categorize is None or not isinstance(df, pd.DataFrame):
+            return df
+        with stat_timer(self._stats, 'convert_time'):
+            return categorize_frame(df)
+
+    def _accumulated_rows(self) -> int:
+        """내부메쏘드 data_buffer 와 pass_list 에 누적된 row 수
+
+        pass_list 항목은 dataframe 이면 row 수, dictionary 이면 1 row 로 계산
+        """
+        return len(self.data_buffer) + sum(len(df) for df in self.pass_list.frames) + self.pass_list.rows
+
+    @staticmethod
+    def _records_to_chunks(records: Iterable[dict], chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """내부메쏘드 dictionary 목록을 chunk_rows 단위의 dataframe 으로 묶어서 생성
+
+        Args:
+            records: dictionary iterable
+            chunk_rows: chunk 1개의 최대 row 수
+
+        Returns:
+            pd.DataFrame generator
+        """
+        if chunk_rows is None or chunk_rows <= 0:
+            raise ValueError(f"{chunk_rows=} must be positive")
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= chunk_rows:
+                yield pd.DataFrame(batch)
+                batch = []
+        if len(batch) > 0:
+            yield pd.DataFrame(batch)
+
     def _safe_close(self, fp, opened):
         if opened and fp:
             if hasattr(fp, 'close') and callable(getattr(fp, 'close')):
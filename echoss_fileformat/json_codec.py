@@ -0,0 +1,166 @@
+import codecs
+import json
+import math
+import re
+from typing import Dict, Optional, Union
+
+from echoss_fileformat.echoss_logger import get_logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+logger = get_logger("echoss_fileformat")
+
+# 'auto' 에서 설치 여부를 확인하는 순서 (빠른 순)
+JSON_BACKENDS = ('orjson', 'simdjson', 'ujson', 'json')
+
+# 표준 json 과 다르게 출력될 수 있는 지수 표기 숫자. 예) 1e-05 (json) 와 1e-5 (orjson)
+EXPONENT_PATTERN = re.compile(rb'\d[eE]')
+
+
+class JsonCodec:
+    """표준 json 모듈 codec. 다른 backend codec 의 기본 클래스
+
+    loads() 는 str 과 bytes 를 모두 받고, dumps() 는 ensure_ascii=False 와 compact separator 로 만든 UTF-8 bytes 를 리턴.
+    빠른 backend 가 읽거나 쓸 수 없는 데이터 (NaN, 64 bit 를 넘는 정수, 문자열이 아닌 키 등)는 표준 json 으로 다시 처리하여
+    모든 backend 의 결과를 표준 json 과 같게 유지함
+    """
+    name = 'json'
+
+    def loads(self, data: Union[str, bytes]):
+        """JSON 문자열 또는 UTF-8 bytes 를 Python 객체로 변환"""
+        return json.loads(data)
+
+    def dumps(self, obj, default=None) -> bytes:
+        """Python 객체를 compact JSON UTF-8 bytes 로 변환
+
+        Args:
+            obj: 변환할 객체
+            default: 변환할 수 없는 객체에 호출할 함수. None 이면 TypeError
+        """
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=default).encode('utf-8')
+
+    def __repr__(self):
+        return f"{type(self).__name__}(name='{self.name}')"
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson backend codec"""
+    name = 'orjson'
+    # datetime, dataclass, str/int/dict 하위 클래스는 표준 json 처럼 default 로 넘김
+    OPTION = 0 if orjson is None else \
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS
+
+    def loads(self, data):
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            return json.loads(data)
+
+    def dumps(self, obj, default=None) -> bytes:
+        try:
+            data = orjson.dumps(obj, default=default, option=OrjsonCodec.OPTION)
+        except TypeError:
+            return super().dumps(obj, default=default)
+        # orjson 은 NaN, Infinity 를 null 로 쓰고 지수 표기가 다르므로 표준 json 으로 다시 씀
+        if EXPONENT_PATTERN.search(data) is not None or (b'null' in data and _has_non_finite(obj)):
+            return super().dumps(obj, default=default)
+        return data
+
+
+class SimdjsonCodec(JsonCodec):
+    """pysimdjson backend codec. 읽기만 simdjson 을 사용하고 쓰기는 표준 json 사용"""
+    name = 'simdjson'
+
+    def loads(self, data):
+        try:
+            return simdjson.loads(data)
+        except ValueError:
+            return json.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    """ujson backend codec"""
+    name = 'ujson'
+
+    def loads(self, data):
+        try:
+            return ujson.loads(data)
+        except ValueError:
+            return json.loads(data)
+
+    def dumps(self, obj, default=None) -> bytes:
+        try:
+            text = ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, reject_bytes=True,
+                               default=default)
+        except (TypeError, ValueError, OverflowError):
+            return super().dumps(obj, default=default)
+        data = text.encode('utf-8')
+        if EXPONENT_PATTERN.search(data) is not None or (b'NaN' in data or b'Infinity' in data):
+            return super().dumps(obj, default=default)
+        return data
+
+
+_CODEC_CLASSES = {
+    'orjson': (OrjsonCodec, lambda: orjson),
+    'simdjson': (SimdjsonCodec, lambda: simdjson),
+    'ujson': (UjsonCodec, lambda: ujson),
+    'json': (JsonCodec, lambda: json),
+}
+_codecs: Dict[str, JsonCodec] = {}
+
+
+def get_json_codec(backend: Union[str, JsonCodec, None] = 'auto') -> JsonCodec:
+    """json_backend 옵션을 JsonCodec 으로 변환
+
+    Args:
+        backend: 'auto' 또는 None 이면 설치된 backend 중 가장 빠른 것, 'orjson', 'simdjson', 'ujson', 'json'
+            중 하나의 이름, 또는 JsonCodec 객체
+
+    Returns:
+        JsonCodec
+    """
+    if isinstance(backend, JsonCodec):
+        return backend
+    if backend is None or backend == 'auto':
+        backend = next(name for name in JSON_BACKENDS if _CODEC_CLASSES[name][1]() is not None)
+    if backend not in _CODEC_CLASSES:
+        raise ValueError(f"json_backend={backend!r} must be 'auto' or one of {JSON_BACKENDS}")
+    codec = _codecs.get(backend)
+    if codec is None:
+        codec_class, module = _CODEC_CLASSES[backend]
+        if module() is None:
+            raise ImportError(f"json_backend '{backend}' need '{backend}' package, pip install {backend}")
+        codec = _codecs[backend] = codec_class()
+    return codec
+
+
+def is_utf8(encoding: Optional[str]) -> bool:
+    """인코딩이 UTF-8 이면 True. UTF-8 bytes 는 decode 없이 codec 에 바로 전달"""
+    try:
+        return encoding is not None and codecs.lookup(encoding).name == 'utf-8'
+    except LookupError:
+        return False
+
+
+def _has_non_finite(obj) -> bool:
+    """내부함수 obj 안에 NaN 또는 Infinity float 가 있으면 True"""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(value) for value in obj)
+    return False
@@ -1,14 +1,45 @@
+from concurrent.futures import ProcessPoolExecutor
 import io
 import json
+import mmap
+import os
 import pandas as pd
-from typing import Dict, Literal, Optional, Union
-
+import pyarrow as pa
+import pyarrow.json as pa_json
+import sys
+from typing import Dict, Iterator, List, Literal, Optional, Tuple, Union
+
+from .checkpoint import TailCheckpoint, get_checkpoint, read_appended
+from .compression import infer_compression
+from .fail_list import FailList
 from .fileformat_base import FileformatBase
+from .json_codec import JsonCodec, get_json_codec, is_utf8
+from .json_stream import JsonArrayStream
+from .metrics import instrument, source_size, stat_timer
 from .echoss_logger import get_logger, set_logger_level
 
 logger = get_logger("echoss_fileformat")
 
 
+def _parse_json_range(filename: str, start: int, end: int, encoding: str, data_key: Optional[str],
+                      json_backend: str = 'auto'):
+    """JsonHandler.load(workers=) 의 process worker 함수. 'multiline' 파일의 [start, end) byte 범위의 줄을 읽어서
+    (dataframe 또는 None, 범위의 줄 수, [(범위 안 줄 번호, payload, 이유), ...]) 로 리턴
+
+    줄 처리는 'multiline' 의 순차 읽기와 같은 JsonHandler 내부 메쏘드를 사용
+    """
+    with open(filename, 'rb') as fp:
+        fp.seek(start)
+        data = fp.read(end - start)
+    handler = JsonHandler('multiline', encoding=encoding, error_log=None, json_backend=json_backend)
+    # 실패 기록은 모두 부모 process 로 전달하므로 worker 에서는 버리지 않음
+    handler.fail_list = FailList(error_log=None, encoding=encoding, max_records=sys.maxsize, max_bytes=sys.maxsize)
+    rows = list(handler._iter_json_lines(io.BytesIO(data), True, False, data_key))
+    line_count = data.count(b'\n') + (0 if data.endswith(b'\n') or len(data) == 0 else 1)
+    failures = [(record['offset'], record['payload'], record['reason']) for record in handler.fail_list]
+    return (pd.DataFrame(rows) if len(rows) > 0 else None), line_count, failures
+
+
 class JsonHandler(FileformatBase):
     """JSON file handler
 
@@ -24,61 +55,159 @@ class JsonHandler(FileformatBase):
     """
     format = "json"
 
+    # load(workers=) 에서 process 하나가 맡는 최소 byte 범위
+    PARALLEL_MIN_RANGE_BYTES = 16 * 1024 * 1024
+    # load(workers=) 에서 범위 하나의 최대 byte 크기. 처리 중인 범위 수를 제한하여 결과 대기 메모리를 줄임
+    PARALLEL_MAX_RANGE_BYTES = 64 * 1024 * 1024
+    ENGINES = ('python', 'pyarrow', 'auto')
+    # engine='auto' 에서 pyarrow 를 사용하는 최소 입력 byte 크기
+    ARROW_AUTO_MIN_BYTES = 1024 * 1024
+    # engine='pyarrow' 에서 pyarrow.json 으로 한번에 읽는 byte 크기. 읽을 수 없는 block 만 줄 단위로 다시 읽음
+    ARROW_BLOCK_BYTES = 16 * 1024 * 1024
+
     def __init__(self, processing_type: str = 'array',
-                 encoding='utf-8', error_log='error.log'):
+                 encoding='utf-8', error_log='error.log',
+                 memory_limit: int = None, spill_dir: str = None,
+                 compression: Union[str, dict, None] = 'infer', use_mmap: bool = False,
+                 categorize: str = None, json_backend: Union[str, JsonCodec, None] = 'auto',
+                 engine: Literal['python', 'pyarrow', 'auto'] = 'python'):
         """Initialize json file format
 
         Args:
             processing_type (): Literal['array', 'multiline', 'object']
+            memory_limit (int): 누적 데이터의 메모리 최대 byte 크기. 넘으면 임시 파일로 spill
+            spill_dir (str): spill 임시 파일 디렉토리
+            compression: 파일명 사용 시의 압축 형식. 'infer' 는 확장자와 첫 byte 로 판별, None 은 압축하지 않음
+            use_mmap (bool): True 이면 압축하지 않은 파일명 입력을 memory map 으로 읽음
+            categorize (str): 'auto' 이면 low cardinality 문자열 컬럼을 pandas categorical 로 읽음
+            json_backend: JSON 읽기/쓰기 backend. 'auto' 이면 설치된 orjson, simdjson, ujson, json 중 가장 빠른 것 사용.
+                backend 와 관계없이 표준 json 과 같은 결과를 만듦
+            engine: 'multiline' load() 의 parser. 'python' 은 줄마다 dictionary 를 만들어 누적,
+                'pyarrow' 는 data_key 가 없으면 pyarrow.json 의 multithread reader 로 block 단위 컬럼을 바로 만듦,
+                'auto' 는 ARROW_AUTO_MIN_BYTES 이상 크기의 입력에만 'pyarrow' 사용
         """
-        super().__init__(processing_type = processing_type, encoding=encoding, error_log=error_log)
-
+        if engine not in JsonHandler.ENGINES:
+            raise ValueError(f"{engine=} is not supported, use one of {JsonHandler.ENGINES}")
+        super().__init__(processing_type=processing_type, encoding=encoding, error_log=error_log,
+                         memory_limit=memory_limit, spill_dir=spill_dir,
+                         compression=compression, use_mmap=use_mmap, categorize=categorize)
+        self.json_codec = get_json_codec(json_backend)
+        self.fail_list.json_codec = self.json_codec
+        # UTF-8 bytes 는 decode 없이 json_codec 으로 바로 읽고 씀
+        self._utf8 = is_utf8(encoding)
+        self.engine = engine
+
+    @instrument('load')
     def load(self, file_or_filename: Union[io.TextIOWrapper, io.BytesIO, str],
-             data_key: str = None) -> Optional[dict]:
+             data_key: str = None, incremental: Union[bool, str, TailCheckpoint] = False,
+             workers: int = None, engine: str = None) -> Optional[dict]:
         """파일 객체나 파일명에서 JSON 데이터 읽기
 
+        'array' 는 문서 전체를 읽지 않고 JsonArrayStream 으로 array 원소를 json_codec 으로 변환하여 batch 단위로 누적하므로
+        memory_limit 을 지정하면 큰 JSON array 파일도 일정한 메모리로 읽음. 읽을 수 없는 원소만 fail_list 에 추가
+
         Args:
             file_or_filename (): file-like object which has read() method or filename string
             data_key (str): if given use only data_key value, else use whole. for example 'data'
+            incremental: 'multiline' 에서 checkpoint 에 저장된 byte 위치 이후에 추가된 완전한 줄만 읽고 checkpoint 갱신.
+                True 이면 '<파일명>.checkpoint' sidecar 파일, 문자열이면 그 checkpoint 파일명, 또는 TailCheckpoint 사용.
+                파일이 rotation 되거나 잘린 경우에는 처음부터 다시 읽음. 압축하지 않은 로컬 파일명만 지원
+            workers (int): 'multiline' 에서 1 보다 크면 압축하지 않은 큰 파일을 줄바꿈에 맞춘 byte 범위로 나누어
+                최대 workers 개 process 에서 읽고 범위별 dataframe 을 파일 순서대로 누적.
+                실패한 줄은 파일 전체의 줄 번호로 fail_list 에 추가. 작은 파일이나 file object 는 순차로 읽음
+            engine (str): 'multiline' 의 parser. None 이면 handler 의 engine 사용.
+                'pyarrow' 는 UTF-8 bytes 입력이고 data_key 가 없을 때 pyarrow.json 으로 읽고, 읽을 수 없는 줄이 있는
+                block 은 줄 단위로 다시 읽어서 실패한 줄만 fail_list 에 추가. 빈 줄은 건너뛰고
+                날짜/시간 문자열은 문자열 그대로, 중첩된 object 는 모든 key 를 가진 dictionary 로 읽음
         Returns:
             dictionary object if processing_type is 'object', else None
 
         """
         root_json = None
+        tail = None
+        if incremental:
+            if self.processing_type != FileformatBase.TYPE_MULTILINE:
+                logger.error(f"{self.processing_type} not support incremental load")
+                raise TypeError(f"processing_type '{self.processing_type}' not support incremental load")
+            checkpoint = get_checkpoint(file_or_filename, incremental)
+            if infer_compression(file_or_filename, 'rb', self.compression):
+                raise ValueError(f"incremental load not support compressed file '{file_or_filename}'")
+            tail = read_appended(checkpoint, JsonHandler._line_end)
+            if tail is None:
+                return None
+            file_or_filename = io.BytesIO(tail.data)
+        elif workers is not None and workers > 1 and self.processing_type == FileformatBase.TYPE_MULTILINE:
+            if self._load_lines_parallel(file_or_filename, data_key, workers):
+                return None
         open_mode = self._decide_rw_open_mode('load')
         # file_or_filename 클래스 유형에 따라서 처리 방법이 다름
         fp, binary_mode, opened = self._get_file_obj(file_or_filename, open_mode)
 
         if self.processing_type == FileformatBase.TYPE_ARRAY:
             try:
-                root_json = json.load(fp)
-                self._update_json_data(root_json, data_key)
+                for rows in self._json_array_stream(fp, data_key).iter_batches(FileformatBase.SPILL_CHECK_ROWS):
+                    self.pass_list.extend(rows)
+                    self._check_memory_limit()
             except Exception as e:
-                self.fail_list.append(str(fp))
+                self.fail_list.append(None, source=fp, reason=e)
                 logger.error(f"{fp=}, {binary_mode=}, {opened=}, {self.processing_type=} load raise: {e}")
         elif self.processing_type == FileformatBase.TYPE_MULTILINE:
-            for line in fp:
-                try:
-                    if binary_mode:
-                        line_str = line.decode(self.encoding)
-                    else:
-                        line_str = line
-                    line_obj = json.loads(line_str)
-                    self._update_json_data(line_obj, data_key)
-                except Exception as e:
-                    self.fail_list.append(line)
-                    logger.error(f"{fp=}, {binary_mode=} {opened=} json_type='{self.processing_type}' load raise {e}")
+            engine = engine if engine is not None else self.engine
+            if self._use_arrow_lines(file_or_filename, binary_mode, data_key, engine):
+                self._load_lines_arrow(fp, binary_mode, opened)
+            else:
+                for row in self._iter_json_lines(fp, binary_mode, opened, data_key):
+                    self.pass_list.append(row)
+                    self._check_memory_limit()
+            if tail is not None:
+                tail.commit()
         elif self.processing_type == FileformatBase.TYPE_OBJECT:
             try:
-                root_json = json.load(fp)
+                root_json = self._parse_json(fp.read())
             except Exception as e:
-                self.fail_list.append(str(fp))
+                self.fail_list.append(None, source=fp, reason=e)
                 logger.error(f"{fp=}, {binary_mode=}, {opened=}, {self.processing_type=} load raise: {e}")
         # close opened file if filename
         self._safe_close(fp, opened)
         if self.processing_type == FileformatBase.TYPE_OBJECT:
             return root_json
 
+    @instrument('iter_chunks')
+    def iter_chunks(self, file_or_filename: Union[io.TextIOWrapper, io.BytesIO, str],
+                    chunk_rows: int = 10000, data_key: str = None) -> Iterator[pd.DataFrame]:
+        """JSON 파일을 chunk_rows 단위 dataframe 으로 나누어 읽기
+
+        'multiline' 은 줄 단위로, 'array' 는 JsonArrayStream 으로 array 원소 단위로 읽어서 chunk 를 생성하므로
+        메모리 사용량이 chunk 크기에 비례함
+
+        Args:
+            file_or_filename (): file-like object which has read() method or filename string
+            chunk_rows (int): chunk 1개의 최대 row 수
+            data_key (str): if given use only data_key value, else use whole. for example 'data'
+
+        Returns:
+            pd.DataFrame generator
+        """
+        if self.processing_type == FileformatBase.TYPE_OBJECT:
+            logger.error(f"{self.processing_type} not support iter_chunks() method")
+            raise TypeError(f"processing_type '{self.processing_type}' not support iter_chunks() method")
+
+        open_mode = self._decide_rw_open_mode('load')
+        fp, binary_mode, opened = self._get_file_obj(file_or_filename, open_mode)
+        try:
+            if self.processing_type == FileformatBase.TYPE_ARRAY:
+                try:
+                    yield from self._records_to_chunks(self._json_array_stream(fp, data_key), chunk_rows)
+                except ValueError as e:
+                    self.fail_list.append(None, source=fp, reason=e)
+                    logger.error(f"{fp=}, {binary_mode=}, {opened=}, {self.processing_type=} iter_chunks raise: {e}")
+            elif self.processing_type == FileformatBase.TYPE_MULTILINE:
+                rows = self._iter_json_lines(fp, binary_mode, opened, data_key)
+                yield from self._records_to_chunks(rows, chunk_rows)
+        finally:
+            self._safe_close(fp, opened)
+
+    @instrument('loads')
     def loads(self, str_or_bytes: Union[str, bytes],
               data_key: str = None) -> Optional[Dict]:
         """문자열이나 bytes 에서 JSON 객체 읽기
@@ -100,16 +229,17 @@ class JsonHandler(FileformatBase):
                 file_obj = io.BytesIO(str_or_bytes)
                 root_json = self.load(file_obj, data_key=data_key)
         except Exception as e:
-            self.fail_list.append(str_or_bytes)
-            logger.error(f"'{str_or_bytes}' loads raise {e}")
+            self.fail_list.append(str_or_bytes, reason=e)
+            logger.error(f"loads [{len(str_or_bytes)}] raise {e}")
         finally:
             if self.processing_type == FileformatBase.TYPE_OBJECT:
                 return root_json
 
+    @instrument('to_pandas')
     def to_pandas(self) -> pd.DataFrame:
         """클래스 내부메쏘드 JSON 파일 처리 결과를 pd.DataFrame 형태로 받음
 
-        내부적으로 추가할 데이터(pass_list)가 있으면 추가하여 새로운 pd.DataFrame 생성
+        내부적으로 추가할 데이터(pass_list)가 있으면 data_buffer 에 추가하여 pd.DataFrame 생성
         실패 목록(fail_list)가 있으면 파일로 저장
         (검토 중) 학습을 위한 dataframe 이기 떄문에 dot('.') 문자로 normalize 된 flatten 컬럼과 값을 가진다.
 
@@ -119,46 +249,11 @@ class JsonHandler(FileformatBase):
             logger.error(f"{self.processing_type} not support to_pandas() method")
             return None
 
-        if len(self.pass_list) > 0:
-            try:
-                # 검토 중. flatten 할 것인가 말 것인가?
-                append_df = pd.DataFrame(self.pass_list)
-                # append_df = pd.json_normalize(self.pass_list)
-                merge_df = pd.concat([self.data_df, append_df], ignore_index=True)
-                self.data_df = merge_df
-            except Exception as e:
-                logger.error(f"pass_list[{len(self.pass_list)}] to_pandas raise {e}")
-                self.fail_list.extend(self.pass_list)
-            finally:
-                self.pass_list.clear()
-        if len(self.fail_list) > 0:
-            error_fp = None
-            try:
-                error_fp = open(self.error_log, mode='ab')
-            except Exception as e:
-                logger.error(f"fail_list[{len(self.fail_list)}] error log append raise {e}")
-
-            if error_fp:
-                for fail in self.fail_list:
-                    try:
-                        fail_str = None
-                        if isinstance(fail, dict):
-                            fail_str = json.dumps(fail, ensure_ascii=False, separators=(',', ':'))
-                        elif isinstance(fail, list):
-                            fail_str = str(fail)
-                        elif not isinstance(fail, str):
-                            fail_str = str(fail)
-
-                        if fail_str:
-                            fail_bytes = fail_str.encode(self.encoding)
-                            error_fp.write(fail_bytes)
-                            error_fp.write(b'\n')
-                    except Exception as e:
-                        logger.exception(e)
-                error_fp.close()
-                self.fail_list.clear()
+        self._merge_pass_list()
+        self._flush_fail_list()
         return self.data_df
 
+    @instrument('dump')
     def dump(self, file_or_filename: Union[io.TextIOWrapper, io.BytesIO, str],
              data=None, data_key=None) -> None:
         """데이터를 JSON 파일로 쓰기
@@ -199,7 +294,7 @@ class JsonHandler(FileformatBase):
                     json_list = data
                 else:
                     json_list = []
-                    self.fail_list.append(data)
+                    self.fail_list.append(data, source=fp, reason=f"{type(data)} is not list")
                     logger.error(f"{fp=}, {binary_mode=}, {opened=}, '{self.processing_type}', {type(data)} is not list")
 
                 if data_key:
@@ -211,7 +306,7 @@ class JsonHandler(FileformatBase):
                 if "object" == self.processing_type:
                     return e
                 else:
-                    self.fail_list.append(data)
+                    self.fail_list.append(data, source=fp, reason=e)
                     logger.error(f"{fp=}, {binary_mode=}, {opened=}, '{self.processing_type}' dump raise: {e}")
 
         # 'multiline' 유형에서는 강제로 binary 모드를 사용한다
@@ -241,15 +336,16 @@ class JsonHandler(FileformatBase):
                                 json_obj = row
 
                             # 결과적으로 mode 에 관계없이 binary 로 저장하게됨
-                            json_str = json.dumps(json_obj, ensure_ascii=False, separators=(',', ':'))
-                            json_bytes = json_str.encode(self.encoding)
+                            json_bytes = self.json_codec.dumps(json_obj)
+                            if not self._utf8:
+                                json_bytes = json_bytes.decode('utf-8').encode(self.encoding)
                             fp.write(json_bytes)
                             fp.write(b'\n')
                         except Exception as e:
-                            self.fail_list.append(row)
+                            self.fail_list.append(row, source=fp, reason=e)
                             logger.error(f"{fp=}, {binary_mode=}, {opened=}, {self.processing_type=} raise: {e}")
             except Exception as e:
-                self.fail_list.append(data)
+                self.fail_list.append(data, source=fp, reason=e)
                 logger.error(f"{fp=}, {binary_mode=}, {opened=}, {self.processing_type=} dump raise: {e}")
 
         if self.processing_type == FileformatBase.TYPE_OBJECT:
@@ -275,11 +371,12 @@ class JsonHandler(FileformatBase):
                 else:
                     json.dump(json_obj, fp)
             except Exception as e:
-                self.fail_list.append(data)
+                self.fail_list.append(data, source=fp, reason=e)
                 logger.error(f"{fp=}, {binary_mode=}, {opened=}, {self.processing_type=} dump raise: {e}")
 
         self._safe_close(fp, opened)
 
+    @instrument('dumps')
     def dumps(self, data=None, data_key='') -> str:
         """JSON 데이터를 문자열 또는 바이너리 형태로 출력
 
@@ -309,6 +406,11 @@ class JsonHandler(FileformatBase):
     클래스 내부 메쏘드 
     """
 
+    @staticmethod
+    def _line_end(data: bytes, start: int) -> int:
+        """내부함수 start 이후 마지막 줄바꿈 다음 위치, 줄바꿈이 없으면 start"""
+        return data.rfind(b'\n', start) + 1 or start
+
     # 내부 함수 for object and array json_type
     def _update_json_data(self, json_obj, data_key) -> None:
         """내부메쏘드 json_obj 처리 결과 반영
@@ -317,39 +419,264 @@ class JsonHandler(FileformatBase):
             json_obj: 설정할 json object
 
         """
+        self.pass_list.extend(self._select_json_rows(json_obj, data_key))
+
+    def _json_array_stream(self, fp, data_key) -> JsonArrayStream:
+        """내부메쏘드 'array' 파일의 array 원소를 문서 전체를 읽지 않고 순서대로 읽는 JsonArrayStream
+
+        data_key 가 있으면 최상위 object 의 data_key 값 array 를 읽음.
+        읽을 수 없는 원소는 array 안의 원소 번호를 offset 으로 fail_list 에 추가
+        """
+        def on_error(text, index, e):
+            self.fail_list.append(text, source=fp, offset=index, reason=e)
+            logger.error(f"{fp=} json_type='{self.processing_type}' element[{index}] load raise {e}")
+        return JsonArrayStream(fp, data_key=data_key, loads=self.json_codec.loads, encoding=self.encoding,
+                               on_error=on_error)
+
+    def _parse_json(self, data: Union[str, bytes]):
+        """내부메쏘드 JSON 문자열 또는 bytes 를 json_codec 으로 읽기
+
+        UTF-8 이 아닌 인코딩의 bytes 만 self.encoding 으로 decode 함
+        """
+        if not self._utf8 and not isinstance(data, str):
+            data = bytes(data).decode(self.encoding)
+        return self.json_codec.loads(data)
+
+    def _select_json_rows(self, json_obj, data_key) -> list:
+        """내부메쏘드 json_obj 에서 data_key 와 processing_type 에 맞는 row 목록 선택
+
+        조건에 맞지 않는 json_obj 는 fail_list 에 추가
+
+        Args:
+            json_obj: 처리할 json object
+            data_key: 사용할 키, None 이면 전체 사용
+
+        Returns:
+            pass_list 에 추가할 row 목록
+        """
         # data_key 처리
         if data_key and self.processing_type is not FileformatBase.TYPE_OBJECT:
             if data_key in json_obj:
                 json_value = json_obj[data_key]
                 if isinstance(json_value, str):
-                    json_obj = json.loads(json_value)
+                    json_obj = self.json_codec.loads(json_value)
                 elif isinstance(json_value, list):
                     json_obj = json_value
                 else:
-                    self.fail_list.append(json_obj)
+                    self.fail_list.append(json_obj, reason=f"json_obj['{data_key}'] {type(json_value)} not supported")
                     logger.error(f"json_obj['{data_key}'] {type(json_value)} not supported")
             else:
-                self.fail_list.append(json_obj)
+                self.fail_list.append(json_obj, reason=f"json_obj['{data_key}'] must exist")
                 logger.error(f"json_obj['{data_key}'] must exist")
 
         # json_obj 처리
         if self.processing_type == FileformatBase.TYPE_ARRAY:
             # json_array 가 진짜 array (list) 인지 검사
             if isinstance(json_obj, list):
-                self.pass_list.extend(json_obj)
-            # elif isinstance(json_obj, dict):
-            #     self.pass_list.append(json_obj)
+                return json_obj
             else:
-                self.fail_list.append(json_obj)
+                self.fail_list.append(json_obj, reason=f"must be a list but {type(json_obj)}")
                 logger.error(f"json_obj['{data_key}'] in {self.processing_type=} must be a list but {type(json_obj)}")
         elif self.processing_type == FileformatBase.TYPE_MULTILINE:
             if isinstance(json_obj, dict):
-                self.pass_list.append(json_obj)
+                return [json_obj]
             else:
-                self.fail_list.append(json_obj)
+                self.fail_list.append(json_obj, reason=f"must be a dict but {type(json_obj)}")
                 logger.error(f"json_obj['{data_key}'] in {self.processing_type=} must be a dict")
         elif self.processing_type == FileformatBase.TYPE_OBJECT:
-            self.pass_list.append(json_obj)
+            return [json_obj]
+        return []
+
+    def _iter_json_lines(self, fp, binary_mode, opened, data_key, start_line: int = 1) -> Iterator[dict]:
+        """내부메쏘드 'multiline' 파일의 각 줄을 읽어서 row 를 순차 생성
+
+        JSON 으로 읽을 수 없는 줄은 fail_list 에 추가
+        fp 가 mmap.mmap 이면 mapping 된 buffer 에서 바로 줄을 나눔
+
+        Args:
+            fp: 읽을 file object
+            binary_mode: 로그 출력용. bytes 줄은 _parse_json() 에서 처리
+            opened: 로그 출력용
+            data_key: 사용할 키, None 이면 전체 사용
+            start_line: 첫 줄의 줄 번호
+
+        Returns:
+            dictionary generator
+        """
+        lines = iter(fp.readline, b'') if isinstance(fp, mmap.mmap) else fp
+        for line_no, line in enumerate(lines, start=start_line):
+            try:
+                line_obj = self._parse_json(line)
+                yield from self._select_json_rows(line_obj, data_key)
+            except Exception as e:
+                self.fail_list.append(line, source=fp, offset=line_no, reason=e)
+                logger.error(f"{fp=}, {binary_mode=} {opened=} json_type='{self.processing_type}' load raise {e}")
+
+    def _use_arrow_lines(self, file_or_filename, binary_mode, data_key, engine: str) -> bool:
+        """내부메쏘드 'multiline' load() 에서 pyarrow.json 으로 읽을 수 있으면 True"""
+        if engine not in JsonHandler.ENGINES:
+            raise ValueError(f"{engine=} is not supported, use one of {JsonHandler.ENGINES}")
+        if engine == 'python' or data_key:
+            return False
+        if engine == 'auto' and source_size(file_or_filename) < JsonHandler.ARROW_AUTO_MIN_BYTES:
+            return False
+        if not binary_mode or not self._utf8:
+            if engine == 'pyarrow':
+                logger.warning("pyarrow json engine need utf-8 binary input, use 'python' engine")
+            return False
+        return True
+
+    def _load_lines_arrow(self, fp, binary_mode, opened) -> None:
+        """내부메쏘드 'multiline' 파일을 줄바꿈에 맞춘 ARROW_BLOCK_BYTES 크기 block 으로 나누어 pyarrow.json 으로 읽기
+
+        block 의 dataframe 은 pass_list 를 거쳐 data_buffer 에 바로 누적.
+        pyarrow 가 읽을 수 없는 block (JSON 오류, object 가 아닌 줄, 컬럼 타입 변경 등) 은
+        _iter_json_lines() 로 다시 읽어서 실패한 줄만 파일 전체의 줄 번호로 fail_list 에 추가
+        """
+        self._flush_pass_list()
+        # 날짜/시간으로 추론된 컬럼은 이후 block 에서도 문자열로 읽음
+        string_fields = {}
+        line_base = 0
+        while True:
+            block = fp.read(JsonHandler.ARROW_BLOCK_BYTES)
+            if not block:
+                break
+            if not block.endswith(b'\n'):
+                block += fp.readline()
+            df = self._read_arrow_block(block, string_fields)
+            if df is None:
+                rows = list(self._iter_json_lines(io.BytesIO(block), binary_mode, opened, None,
+                                                  start_line=line_base + 1))
+                with stat_timer(self._stats, 'convert_time'):
+                    df = pd.DataFrame(rows)
+            line_base += block.count(b'\n') + (0 if block.endswith(b'\n') else 1)
+            if len(df) > 0:
+                self.pass_list.append(df)
+                self._flush_pass_list()
+                self._check_memory_limit()
+
+    def _read_arrow_block(self, block: bytes, string_fields: dict) -> Optional[pd.DataFrame]:
+        """내부메쏘드 JSON line block 을 pyarrow.json 으로 읽어서 dataframe 으로 변환
+
+        pyarrow 가 timestamp 로 추론한 필드는 string_fields 에 추가하고 문자열로 다시 읽어서 원래 값을 유지.
+        list, struct 컬럼은 python list, dictionary 로 변환. JSON null 은 object 컬럼에서 None
+
+        Args:
+            block: 완전한 줄로 끝나는 UTF-8 bytes
+            string_fields: {필드 이름: timestamp 를 string 으로 바꾼 타입} 문자열로 읽을 필드
+
+        Returns:
+            dataframe, 읽을 수 없으면 None
+        """
+        try:
+            table = JsonHandler._read_arrow_json(block, string_fields)
+            columns = table.column_names
+            for field in table.schema:
+                string_type = JsonHandler._timestamp_to_string(field.type)
+                if not string_type.equals(field.type):
+                    string_fields[field.name] = string_type
+            if any(not table.schema.field(name).type.equals(string_fields[name])
+                   for name in columns if name in string_fields):
+                table = JsonHandler._read_arrow_json(block, string_fields).select(columns)
+            if len(string_fields) > 0:
+                # 이전 block 에서 추가한 필드 중 이 block 에 값이 없는 필드는 제외
+                table = table.select([name for name in columns
+                                      if name not in string_fields or table.column(name).null_count < len(table)])
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            logger.debug(f"pyarrow json block [{len(block)}] raise {e}, read by line")
+            return None
+        with stat_timer(self._stats, 'convert_time'):
+            nested = [field.name for field in table.schema if pa.types.is_nested(field.type)]
+            df = (table.drop(nested) if nested else table).to_pandas()
+            for name in nested:
+                df.insert(table.column_names.index(name), name, pd.Series(table.column(name).to_pylist(), dtype=object))
+        return df
+
+    @staticmethod
+    def _read_arrow_json(block: bytes, string_fields: dict) -> pa.Table:
+        """내부함수 string_fields 는 지정한 타입으로, 나머지 필드는 추론하여 block 읽기"""
+        parse_options = pa_json.ParseOptions(explicit_schema=pa.schema(list(string_fields.items())),
+                                             unexpected_field_behavior='infer') if string_fields else None
+        return pa_json.read_json(io.BytesIO(block), read_options=pa_json.ReadOptions(use_threads=True),
+                                 parse_options=parse_options)
+
+    @staticmethod
+    def _timestamp_to_string(data_type: pa.DataType) -> pa.DataType:
+        """내부함수 data_type 안의 timestamp 타입을 string 타입으로 바꾼 타입"""
+        if pa.types.is_timestamp(data_type):
+            return pa.string()
+        if pa.types.is_struct(data_type):
+            return pa.struct([data_type.field(i).with_type(JsonHandler._timestamp_to_string(data_type.field(i).type))
+                              for i in range(data_type.num_fields)])
+        if pa.types.is_list(data_type):
+            return pa.list_(JsonHandler._timestamp_to_string(data_type.value_type))
+        return data_type
+
+    def _load_lines_parallel(self, file_or_filename, data_key, workers: int) -> bool:
+        """내부메쏘드 'multiline' 파일을 줄바꿈에 맞춘 byte 범위로 나누어 process pool 에서 읽기
+
+        범위 결과는 파일 순서대로 pass_list 를 거쳐 data_buffer 에 바로 누적하고,
+        처리 중인 범위는 workers 의 2배로 제한. 나눌 수 없는 입력이면 False 를 리턴하여 순차로 읽도록 함
+
+        Returns:
+            병렬로 읽었으면 True
+        """
+        if not isinstance(file_or_filename, str) or not os.path.isfile(file_or_filename) \
+                or infer_compression(file_or_filename, 'rb', self.compression) \
+                or self.encoding.lower().replace('_', '-').startswith(('utf-16', 'utf-32')):
+            return False
+        file_size = os.path.getsize(file_or_filename)
+        range_count = min(workers, file_size // JsonHandler.PARALLEL_MIN_RANGE_BYTES)
+        if range_count <= 1:
+            return False
+        range_count = max(range_count, -(-file_size // JsonHandler.PARALLEL_MAX_RANGE_BYTES))
+        ranges = JsonHandler._split_line_ranges(file_or_filename, file_size, range_count)
+        if len(ranges) <= 1:
+            return False
+
+        logger.debug(f"{file_or_filename} parallel load {len(ranges)} ranges")
+        self._flush_pass_list()
+        line_base = 0
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+            futures = []
+            next_range = 0
+            for index in range(len(ranges)):
+                while next_range < len(ranges) and next_range < index + 2 * workers:
+                    start, end = ranges[next_range]
+                    futures.append(pool.submit(_parse_json_range, file_or_filename, start, end,
+                                               self.encoding, data_key, self.json_codec.name))
+                    next_range += 1
+                df, line_count, failures = futures[index].result()
+                futures[index] = None
+                for line_no, payload, reason in failures:
+                    self.fail_list.append(payload, source=file_or_filename,
+                                          offset=None if line_no is None else line_base + line_no, reason=reason)
+                line_base += line_count
+                if df is not None:
+                    self.pass_list.append(df)
+                    self._flush_pass_list()
+        return True
+
+    @staticmethod
+    def _split_line_ranges(filename: str, file_size: int, range_count: int) -> List[Tuple[int, int]]:
+        """내부함수 파일을 줄바꿈 다음 위치에서 시작하는 range_count 개 이하의 byte 범위로 나눔
+
+        Returns:
+            [(start, end), ...] byte 범위 목록
+        """
+        bounds = [0]
+        with open(filename, 'rb') as fp:
+            for index in range(1, range_count):
+                target = file_size * index // range_count
+                if target <= bounds[-1]:
+                    continue
+                fp.seek(target - 1)
+                fp.readline()
+                position = fp.tell()
+                if bounds[-1] < position < file_size:
+                    bounds.append(position)
+        bounds.append(file_size)
+        return list(zip(bounds[:-1], bounds[1:]))
 
     def _decide_rw_open_mode(self, method_name) -> str:
         """내부메쏘드 json_type 과 method_name 에 따라서 파일 일기/쓰기 오픈 모드 결정
@@ -366,9 +693,7 @@ class JsonHandler(FileformatBase):
             else:
                 return 'w'
         elif 'load' == method_name:
-            if self.processing_type == FileformatBase.TYPE_MULTILINE:
-                return 'rb'
-            else:
-                return 'r'
+            # bytes 를 그대로 json_codec 에 전달
+            return 'rb'
         else:
             raise TypeError(f"method_name='{method_name}'] not supported yet.")
@@ -0,0 +1,327 @@
+import codecs
+import json
+import re
+from typing import Callable, Iterator
+
+from echoss_fileformat.echoss_logger import get_logger
+
+logger = get_logger("echoss_fileformat")
+
+
+# JSON 구분 문자, 문자열 안의 특수 문자, 숫자/literal 의 끝, 공백이 아닌 문자
+STRUCTURAL_PATTERN = re.compile(r'[\[\]{}"]')
+STRING_SPECIAL_PATTERN = re.compile(r'["\\]')
+SCALAR_END_PATTERN = re.compile(r'[,\]}\s]')
+NON_SPACE_PATTERN = re.compile(r'\S')
+# array 원소 다음의 구분 문자와 앞뒤 공백
+SEPARATOR_PATTERN = re.compile(r'\s*([,\]])\s*')
+
+# 값의 첫 문자로 판별한 JSON 값의 python 타입. 오류 메시지에 사용
+_VALUE_TYPES = {'{': dict, '[': list, '"': str, 't': bool, 'f': bool, 'n': type(None)}
+# 변환할 수 없는 원소 표시
+_INVALID = object()
+
+
+class JsonArrayStream:
+    """큰 JSON 문서에서 array 원소를 하나씩 읽는 streaming reader
+
+    문서 전체를 읽거나 트리를 만들지 않고 chunk_bytes 단위로 읽으면서 array 원소를 하나씩 변환하고,
+    data_key 가 있으면 최상위 object 의 data_key 값 array 를 읽고 다른 키의 값은 변환하지 않고 건너뜀.
+    원소는 BATCH_CHARS 안에서 끝나는 여러 원소를 '[' 와 ']' 로 감싸서 loads 한번으로 변환하고, 변환할 수 없는 범위는
+    구분 문자를 따라가서 원소 하나씩 범위를 찾은 뒤 loads 로 변환함. 메모리 사용량은 chunk_bytes 와 가장 큰 원소 하나의 크기에 비례
+    """
+    CHUNK_BYTES = 1024 * 1024
+    # loads 한번으로 변환할 원소 범위의 최대 문자 수와 범위 끝을 앞의 ',' 로 옮겨서 다시 시도하는 횟수
+    BATCH_CHARS = 16 * 1024
+    BATCH_RETRIES = 4
+
+    def __init__(self, fp, data_key: str = None, loads: Callable = json.loads, encoding: str = 'utf-8',
+                 chunk_bytes: int = None, on_error: Callable = None):
+        """
+        Args:
+            fp: 읽을 binary 또는 text 모드 file object
+            data_key (str): 최상위 object 에서 읽을 array 의 키. None 이면 최상위 array 를 읽음
+            loads: 원소들의 JSON 문자열을 변환할 함수. 예) JsonCodec.loads
+            encoding (str): binary 입력을 decode 할 인코딩
+            chunk_bytes (int): 한번에 읽을 크기
+            on_error: 변환할 수 없는 원소를 받는 함수 (원소 문자열, 원소 번호, 예외). None 이면 예외 발생
+        """
+        self.fp = fp
+        self.data_key = data_key
+        self.loads = loads
+        self.chunk_bytes = chunk_bytes if chunk_bytes is not None else JsonArrayStream.CHUNK_BYTES
+        self.on_error = on_error
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._buffer = ''
+        self._pos = 0
+        # buffer 앞에서 버린 길이. 오류 위치 출력용
+        self._base = 0
+        self._eof = False
+        # 읽은 원소 수
+        self.count = 0
+
+    def __iter__(self) -> Iterator:
+        """array 원소를 순서대로 생성
+
+        Raises:
+            ValueError: 문서 구조가 맞지 않거나 data_key 가 없는 경우
+        """
+        while len(self._buffer) == 0 and self._fill():
+            pass
+        if len(self._buffer) == 0:
+            raise ValueError("JSON document is empty")
+        # BOM 은 건너뜀
+        if self._buffer.startswith('\ufeff'):
+            self._pos = 1
+        char = self._skip_space()
+        if self.data_key is None:
+            if char != '[':
+                raise ValueError(f"must be a list but {_value_type(char)}")
+            yield from self._iter_array()
+            return
+
+        if char != '{':
+            raise ValueError(f"json_obj['{self.data_key}'] must exist")
+        self._pos += 1
+        char = self._skip_space()
+        while char != '}':
+            key_end = self._value_end()
+            key = json.loads(self._buffer[self._pos:key_end])
+            self._pos = key_end
+            if self._skip_space() != ':':
+                self._raise_invalid("':' expected")
+            self._pos += 1
+            char = self._skip_space()
+            if key == self.data_key:
+                if char == '[':
+                    yield from self._iter_array()
+                    return
+                if char == '"':
+                    # 문자열 값은 JSON 문자열로 보고 변환
+                    value_end = self._value_end()
+                    json_value = self.loads(json.loads(self._buffer[self._pos:value_end]))
+                    if not isinstance(json_value, list):
+                        raise ValueError(f"must be a list but {type(json_value)}")
+                    for element in json_value:
+                        self.count += 1
+                        yield element
+                    return
+                raise ValueError(f"json_obj['{self.data_key}'] {_value_type(char)} not supported")
+            self._pos = self._value_end()
+            self._compact()
+            char = self._skip_space()
+            if char == ',':
+                self._pos += 1
+                char = self._skip_space()
+            elif char != '}':
+                self._raise_invalid("',' or '}' expected")
+        raise ValueError(f"json_obj['{self.data_key}'] must exist")
+
+    def iter_batches(self, batch_rows: int) -> Iterator[list]:
+        """array 원소를 최대 batch_rows 개 목록으로 묶어서 생성"""
+        batch = []
+        for element in self:
+            batch.append(element)
+            if len(batch) >= batch_rows:
+                yield batch
+                batch = []
+        if len(batch) > 0:
+            yield batch
+
+    """
+
+    클래스 내부 메쏘드
+
+    """
+
+    def _iter_array(self):
+        """내부메쏘드 현재 위치의 array 원소를 생성"""
+        self._pos += 1
+        char = self._skip_space()
+        if char == ']':
+            return
+        # batch 로 변환하지 못한 범위의 끝 절대 위치. 이 위치까지는 원소 하나씩 변환
+        single_end = 0
+        while True:
+            if self._base + self._pos >= single_end:
+                elements, single_end = self._load_batch()
+                if elements is not None:
+                    yield from elements
+                    self.count += len(elements)
+                    self._compact()
+                    continue
+            end = self._value_end()
+            buffer = self._buffer
+            element = self._load_element(buffer[self._pos:end])
+            if element is not _INVALID:
+                yield element
+            self.count += 1
+            match = SEPARATOR_PATTERN.match(buffer, end)
+            if match is not None and (match.group(1) == ']' or match.end() < len(buffer)):
+                if match.group(1) == ']':
+                    return
+                self._pos = match.end()
+            else:
+                self._pos = end
+                char = self._skip_space()
+                if char == ']':
+                    return
+                if char != ',':
+                    self._raise_invalid("',' or ']' expected")
+                self._pos += 1
+                self._skip_space()
+            self._compact()
+
+    def _load_batch(self):
+        """내부메쏘드 현재 위치부터 BATCH_CHARS 안의 마지막 원소 구분 ',' 까지의 원소들을 loads 한번으로 변환
+
+        원소 안이나 array 밖의 ',' 에서 자르면 '[' 와 ']' 로 감싼 문자열이 올바른 JSON 이 아니므로 변환에 성공한 범위는
+        원소 경계에서 끝남. 실패하면 앞의 ',' 로 BATCH_RETRIES 번 다시 시도
+
+        Returns:
+            (원소 list, 0) 또는 변환하지 못하면 (None, 시도한 범위 끝의 절대 위치)
+        """
+        while len(self._buffer) - self._pos < JsonArrayStream.BATCH_CHARS and self._fill():
+            pass
+        limit = min(len(self._buffer), self._pos + JsonArrayStream.BATCH_CHARS)
+        fail_end = self._base + limit
+        for _ in range(JsonArrayStream.BATCH_RETRIES):
+            cut = self._batch_end(limit)
+            if cut < 0:
+                break
+            try:
+                elements = self.loads('[' + self._buffer[self._pos:cut] + ']')
+            except Exception:
+                limit = cut
+                continue
+            self._pos = cut + 1
+            self._skip_space()
+            return elements, 0
+        return None, fail_end
+
+    def _batch_end(self, limit: int) -> int:
+        """내부메쏘드 limit 앞의 마지막 원소 구분 ',' 후보 위치. 없으면 -1
+
+        현재 원소가 object 나 array 이면 다음 원소도 같은 문자로 시작한다고 보고 ',' 다음에 그 문자가 오는 위치만 후보로 함
+        """
+        buffer = self._buffer
+        start = buffer[self._pos]
+        if start not in '{[':
+            return buffer.rfind(',', self._pos, limit)
+        while True:
+            index = buffer.rfind(start, self._pos + 1, limit)
+            if index < 0:
+                return -1
+            comma = index - 1
+            while buffer[comma].isspace():
+                comma -= 1
+            if buffer[comma] == ',':
+                return comma
+            limit = index
+
+    def _load_element(self, text: str):
+        """내부메쏘드 범위를 찾은 원소 하나를 loads 로 변환. 변환할 수 없으면 on_error 호출 후 _INVALID 리턴"""
+        try:
+            return self.loads(text)
+        except Exception as e:
+            if self.on_error is None:
+                raise
+            self.on_error(text, self.count, e)
+            return _INVALID
+
+    def _fill(self) -> bool:
+        """내부메쏘드 chunk 하나를 더 읽어서 buffer 에 추가. 더 읽을 것이 없으면 False"""
+        if self._eof:
+            return False
+        chunk = self.fp.read(self.chunk_bytes)
+        if not chunk:
+            self._eof = True
+            chunk = self._decoder.decode(b'', final=True)
+            if not chunk:
+                return False
+        elif not isinstance(chunk, str):
+            chunk = self._decoder.decode(chunk)
+        self._buffer += chunk
+        return True
+
+    def _compact(self):
+        """내부메쏘드 읽은 앞부분이 chunk_bytes 보다 크면 buffer 에서 버림"""
+        if self._pos > self.chunk_bytes:
+            self._base += self._pos
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+
+    def _skip_space(self) -> str:
+        """내부메쏘드 공백을 건너뛰고 현재 위치의 문자를 리턴. 문서가 끝나면 ValueError"""
+        if self._pos < len(self._buffer) and not self._buffer[self._pos].isspace():
+            return self._buffer[self._pos]
+        while True:
+            match = NON_SPACE_PATTERN.search(self._buffer, self._pos)
+            if match is not None:
+                self._pos = match.start()
+                return self._buffer[self._pos]
+            self._pos = len(self._buffer)
+            if not self._fill():
+                self._raise_invalid("unexpected end of JSON document")
+
+    def _value_end(self) -> int:
+        """내부메쏘드 현재 위치에서 시작하는 JSON 값 하나의 끝 위치. 필요하면 chunk 를 더 읽음"""
+        char = self._buffer[self._pos]
+        if char == '"':
+            return self._string_end(self._pos + 1)
+        if char in '[{':
+            # 아직 닫지 않은 괄호의 닫는 문자
+            closers = []
+            index = self._pos
+            while True:
+                match = STRUCTURAL_PATTERN.search(self._buffer, index)
+                if match is None:
+                    index = len(self._buffer)
+                    if not self._fill():
+                        self._raise_invalid("unexpected end of JSON document")
+                    continue
+                token = match.group()
+                index = match.end()
+                if token == '"':
+                    index = self._string_end(index)
+                elif token in '[{':
+                    closers.append(']' if token == '[' else '}')
+                elif token != closers.pop():
+                    self._pos = index - 1
+                    self._raise_invalid(f"mismatched '{token}'")
+                elif len(closers) == 0:
+                    return index
+        # 숫자, true, false, null
+        index = self._pos
+        while True:
+            match = SCALAR_END_PATTERN.search(self._buffer, index)
+            if match is not None:
+                return match.start()
+            index = len(self._buffer)
+            if not self._fill():
+                return index
+
+    def _string_end(self, index: int) -> int:
+        """내부메쏘드 index 에서 시작하는 문자열 내용 다음의 닫는 따옴표 다음 위치"""
+        while True:
+            match = STRING_SPECIAL_PATTERN.search(self._buffer, index)
+            if match is None:
+                index = len(self._buffer)
+            elif match.group() == '"':
+                return match.end()
+            else:
+                # escape 문자 다음 문자는 건너뜀
+                index = match.end() + 1
+                if index <= len(self._buffer):
+                    continue
+            if not self._fill():
+                self._raise_invalid("unterminated JSON string")
+
+    def _raise_invalid(self, message: str):
+        """내부메쏘드 현재 위치를 포함한 ValueError 발생"""
+        raise ValueError(f"invalid JSON at position {self._base + self._pos}: {message}")
+
+
+def _value_type(char: str) -> str:
+    """내부함수 값의 첫 문자로 판별한 타입 문자열"""
+    return str(_VALUE_TYPES.get(char, float if char in '-0123456789' else None))
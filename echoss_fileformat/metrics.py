@@ -0,0 +1,317 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from echoss_fileformat.echoss_logger import get_logger
+from echoss_fileformat.storage import resolve_storage_path
+
+logger = get_logger("echoss_fileformat")
+
+READ_OPERATIONS = ('load', 'loads', 'iter_chunks')
+WRITE_OPERATIONS = ('dump', 'dumps')
+
+
+class HandlerStats:
+    """파일 처리 누적 통계
+
+    bytes_read, bytes_written: 읽고 쓴 byte 수
+    rows_parsed, rows_written: 읽은 row 수, 파일로 쓴 row 수
+    rows_failed: fail_list 에 추가된 실패 수
+    open_time, parse_time, convert_time, concat_time, write_time: 단계별 소요 시간 (초)
+    calls: 처리 메쏘드 호출 수
+    """
+    FIELDS = ('bytes_read', 'bytes_written', 'rows_parsed', 'rows_written', 'rows_failed',
+              'open_time', 'parse_time', 'convert_time', 'concat_time', 'write_time', 'calls')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """통계 초기화"""
+        for field in HandlerStats.FIELDS:
+            setattr(self, field, 0.0 if field.endswith('_time') else 0)
+
+    def add(self, values: dict) -> None:
+        """values 의 같은 이름 항목을 누적"""
+        for field in HandlerStats.FIELDS:
+            if field in values:
+                setattr(self, field, getattr(self, field) + values[field])
+
+    def to_dict(self) -> dict:
+        """통계 dictionary"""
+        return {field: getattr(self, field) for field in HandlerStats.FIELDS}
+
+
+class GlobalStats:
+    """모든 handler 의 처리 통계를 파일 포맷별로 누적하고 전역 observer 에 event 전달"""
+
+    def __init__(self):
+        self._formats: Dict[str, HandlerStats] = {}
+        self._observers: List[Callable[[dict], None]] = []
+        self._lock = threading.Lock()
+
+    def record(self, event: dict) -> None:
+        """처리 event 를 포맷별 통계에 누적하고 observer 호출"""
+        with self._lock:
+            stats = self._formats.get(event['format'])
+            if stats is None:
+                stats = self._formats[event['format']] = HandlerStats()
+            stats.add(event)
+            observers = list(self._observers)
+        notify_observers(observers, event)
+
+    def to_dict(self) -> dict:
+        """{포맷: 통계, 'total': 전체 합계} dictionary"""
+        with self._lock:
+            result = {name: stats.to_dict() for name, stats in self._formats.items()}
+            total = HandlerStats()
+            for stats in self._formats.values():
+                total.add(stats.to_dict())
+        result['total'] = total.to_dict()
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._formats.clear()
+
+    def add_observer(self, callback: Callable[[dict], None]) -> None:
+        with self._lock:
+            self._observers.append(callback)
+
+    def remove_observer(self, callback: Callable[[dict], None]) -> None:
+        with self._lock:
+            if callback in self._observers:
+                self._observers.remove(callback)
+
+
+# process 전체의 처리 통계
+global_stats = GlobalStats()
+
+
+def notify_observers(observers, event: dict) -> None:
+    """observer 목록에 event 전달. observer 예외는 로그만 남김"""
+    for callback in observers:
+        try:
+            callback(event)
+        except Exception as e:
+            logger.error(f"stats observer {callback} raise: {e}")
+
+
+@contextmanager
+def stat_timer(stats: HandlerStats, field: str):
+    """with 블럭의 소요 시간을 stats 의 field 에 누적"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(stats, field, getattr(stats, field) + time.perf_counter() - start)
+
+
+def source_size(source) -> int:
+    """파일명, 저장소 경로, str/bytes 입력의 byte 크기. 알 수 없으면 0"""
+    try:
+        if isinstance(source, (bytes, bytearray)):
+            return len(source)
+        storage_path = resolve_storage_path(source)
+        if storage_path is not None:
+            return storage_path.size()
+        if isinstance(source, str):
+            if os.path.isfile(source):
+                return os.path.getsize(source)
+            return 0
+    except Exception:
+        return 0
+    return 0
+
+
+def _tell(source):
+    """내부함수 file object 의 현재 위치, 파일 객체가 아니면 None"""
+    if source is None or isinstance(source, (str, bytes, bytearray)) or resolve_storage_path(source) is not None:
+        return None
+    try:
+        return source.tell()
+    except Exception:
+        return None
+
+
+class _Measurement:
+    """내부 클래스 instrument 된 메쏘드 1회 호출의 측정값"""
+
+    def __init__(self, handler, operation: str, source, data=None):
+        self.handler = handler
+        self.operation = operation
+        self.source = source
+        self.data = data
+        self.rows = 0
+        self.elapsed = 0.0
+        self.outer = False
+        self._started = None
+        stats = handler._stats
+        self._times_before = (stats.open_time, stats.convert_time, stats.concat_time)
+        self._failed_before = handler.fail_list.total
+        self._rows_before = handler._accumulated_rows() if operation in ('load', 'loads') else 0
+        self._position = _tell(source)
+
+    def start(self):
+        if self._started is None and self.handler._instrument_depth == 0:
+            self.outer = True
+        self.handler._instrument_depth += 1
+        self._started = time.perf_counter()
+
+    def stop(self):
+        self.elapsed += time.perf_counter() - self._started
+        self.handler._instrument_depth -= 1
+
+    def finish(self, result=None):
+        """측정값을 handler 통계와 전역 통계에 누적하고 observer 호출. 중첩 호출은 가장 바깥 호출만 기록"""
+        if not self.outer:
+            return
+        handler = self.handler
+        stats = handler._stats
+        open_time = stats.open_time - self._times_before[0]
+        convert_time = stats.convert_time - self._times_before[1]
+        concat_time = stats.concat_time - self._times_before[2]
+        work_time = max(self.elapsed - open_time - convert_time - concat_time, 0.0)
+        reading = self.operation in READ_OPERATIONS
+
+        if self.operation in ('load', 'loads'):
+            if isinstance(result, pd.DataFrame):
+                self.rows = len(result)
+            else:
+                self.rows = max(handler._accumulated_rows() - self._rows_before, 0)
+        elif self.operation == 'dump':
+            data = self.data if self.data is not None else handler.data_df
+            self.rows = len(data) if isinstance(data, pd.DataFrame) else 0
+
+        if self.operation == 'dumps':
+            nbytes = len(result) if isinstance(result, (str, bytes)) else 0
+        elif self._position is not None:
+            end = _tell(self.source)
+            nbytes = end - self._position if isinstance(end, int) and end >= self._position else 0
+        elif reading or self.operation == 'dump':
+            nbytes = source_size(self.source)
+        else:
+            nbytes = 0
+
+        event = {
+            'handler': type(handler).__name__,
+            'format': handler.format,
+            'operation': self.operation,
+            'source': self.source if isinstance(self.source, str) else type(self.source).__name__,
+            'elapsed': self.elapsed,
+            'bytes_read': nbytes if reading else 0,
+            'bytes_written': 0 if reading else nbytes,
+            'rows_parsed': self.rows if reading else 0,
+            'rows_written': 0 if reading else self.rows,
+            'rows_failed': max(handler.fail_list.total - self._failed_before, 0),
+            'open_time': open_time,
+            'parse_time': work_time if reading or self.operation == 'to_pandas' else 0.0,
+            'convert_time': convert_time,
+            'concat_time': concat_time,
+            'write_time': 0.0 if reading or self.operation == 'to_pandas' else work_time,
+            'calls': 1,
+        }
+        if isinstance(self.source, str) and len(self.source) > 256:
+            event['source'] = 'str'
+        # open, convert, concat 시간은 측정 지점에서 이미 handler 통계에 누적됨
+        stats.add({key: value for key, value in event.items()
+                   if key not in ('open_time', 'convert_time', 'concat_time')})
+        notify_observers(list(handler._observers), event)
+        global_stats.record(event)
+
+
+def instrument(operation: str):
+    """handler 처리 메쏘드의 시간, byte, row, 실패 수를 handler.stats() 와 전역 통계에 기록하는 decorator
+
+    generator 메쏘드(iter_chunks)는 chunk 를 만드는 시간만 측정하고 chunk row 수를 누적
+
+    Args:
+        operation (str): 'load', 'loads', 'iter_chunks', 'dump', 'dumps', 'to_pandas'
+    """
+    def decorator(func):
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(self, *args, **kwargs):
+                measurement = _Measurement(self, operation, _first_arg(args, kwargs))
+                generator = func(self, *args, **kwargs)
+                try:
+                    while True:
+                        measurement.start()
+                        try:
+                            chunk = next(generator)
+                        except StopIteration:
+                            return
+                        finally:
+                            measurement.stop()
+                        measurement.rows += len(chunk) if hasattr(chunk, '__len__') else 1
+                        yield chunk
+                finally:
+                    generator.close()
+                    measurement.finish()
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            measurement = _Measurement(self, operation, _first_arg(args, kwargs), data=kwargs.get('data'))
+            measurement.start()
+            result = None
+            try:
+                result = func(self, *args, **kwargs)
+                return result
+            finally:
+                measurement.stop()
+                measurement.finish(result)
+        return wrapper
+    return decorator
+
+
+def _first_arg(args, kwargs):
+    """내부함수 처리 대상 입력 (file_or_filename 또는 str_or_bytes)"""
+    if args:
+        return args[0]
+    return kwargs.get('file_or_filename', kwargs.get('str_or_bytes'))
+
+
+def measure_call(file_format: str, operation: str, source, func, *args, **kwargs):
+    """handler 없이 pandas/pyarrow 로 직접 처리하는 func 호출을 전역 통계에 기록
+
+    Args:
+        file_format (str): 통계를 누적할 파일 포맷 이름
+        operation (str): 'load' 또는 'dump'
+        source: 파일명 또는 저장소 경로
+        func: 실행할 함수, *args 와 **kwargs 로 호출
+
+    Returns:
+        func 의 리턴값
+    """
+    reading = operation in READ_OPERATIONS
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    frame = result if reading else next((arg for arg in args if isinstance(arg, pd.DataFrame)), None)
+    nbytes = source_size(source)
+    global_stats.record({
+        'handler': None,
+        'format': file_format,
+        'operation': operation,
+        'source': source if isinstance(source, str) else type(source).__name__,
+        'elapsed': elapsed,
+        'bytes_read': nbytes if reading else 0,
+        'bytes_written': 0 if reading else nbytes,
+        'rows_parsed': len(frame) if reading and isinstance(frame, pd.DataFrame) else 0,
+        'rows_written': len(frame) if not reading and isinstance(frame, pd.DataFrame) else 0,
+        'rows_failed': 0,
+        'open_time': 0.0,
+        'parse_time': elapsed if reading else 0.0,
+        'convert_time': 0.0,
+        'concat_time': 0.0,
+        'write_time': 0.0 if reading else elapsed,
+        'calls': 1,
+    })
+    return result
@@ -0,0 +1,253 @@
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from echoss_fileformat.echoss_logger import get_logger
+
+logger = get_logger("echoss_fileformat")
+
+# parse_dates 후보로 보는 ISO 날짜/시간 문자열
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$')
+
+
+class SchemaCache:
+    """같은 layout 의 CSV/TSV 파일이 공유하는 schema 추론 결과 cache
+
+    처음 읽는 layout 은 앞 sample_rows 개 row 로 dtype, 날짜 컬럼, categorical 후보 컬럼을 추론하고
+    이후에는 추론 결과를 pd.read_csv 의 dtype=, parse_dates= 로 전달하여 파일마다 다시 추론하지 않음.
+
+    layout 은 파일명이 patterns 중 하나와 일치하면 그 pattern, 아니면 구분자와 헤더 컬럼 이름의 fingerprint 로 구분.
+    path 를 지정하면 JSON 파일로 저장하여 process 가 바뀌어도 재사용
+    """
+    VERSION = 1
+    SAMPLE_ROWS = 1000
+    # categorical 후보 조건: 고유값 수가 sample row 수의 비율 이하이고 최대 고유값 수 이하
+    CATEGORY_RATIO = 0.5
+    CATEGORY_MAX_VALUES = 1000
+
+    def __init__(self, path: str = None, sample_rows: int = None, patterns: List[str] = None,
+                 categorize: bool = False):
+        """
+        Args:
+            path (str): cache 저장 JSON 파일명. None 이면 메모리에만 보관
+            sample_rows (int): 추론에 사용할 앞부분 row 수
+            patterns (list): 같은 layout 으로 볼 파일명 glob pattern 목록. 예) ['*/events_*.csv']
+            categorize (bool): True 이면 categorical 후보 컬럼을 'category' dtype 으로 읽음
+        """
+        self.path = path
+        self.sample_rows = sample_rows if sample_rows is not None else SchemaCache.SAMPLE_ROWS
+        self.patterns = list(patterns) if patterns else []
+        self.categorize = categorize
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self._read_file()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def pattern_key(self, filename) -> Optional[str]:
+        """파일명과 일치하는 pattern 의 cache key, 없으면 None"""
+        if not isinstance(filename, str):
+            filename = str(filename)
+        for pattern in self.patterns:
+            if fnmatch.fnmatch(filename, pattern) or fnmatch.fnmatch(os.path.basename(filename), pattern):
+                return f"pattern:{pattern}"
+        return None
+
+    @staticmethod
+    def header_key(columns, sep: str) -> str:
+        """구분자와 헤더 컬럼 이름으로 만든 cache key"""
+        text = json.dumps([sep, [str(col) for col in columns]], ensure_ascii=False)
+        return "header:" + hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """cache 항목 조회
+
+        Returns:
+            {'columns': [...], 'dtype': {...}, 'parse_dates': [...], 'categories': [...]} 또는 None
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, entry: dict) -> None:
+        """cache 항목 저장. path 가 있으면 파일도 갱신"""
+        with self._lock:
+            self._entries[key] = entry
+            if self.path is not None:
+                self._write_file()
+
+    def widen(self, key: str, entry: dict) -> None:
+        """기존 cache 항목과 새 추론 결과를 합쳐서 저장
+
+        int64 와 float64 는 float64 로 넓히고, 그 밖에 dtype 이 다른 컬럼은 dtype 을 지정하지 않음.
+        날짜 컬럼과 categorical 후보는 양쪽 모두에 있는 컬럼만 유지
+        """
+        old = self.get(key)
+        if old is not None:
+            dtype = {}
+            for col, new_type in entry['dtype'].items():
+                old_type = old['dtype'].get(col, new_type)
+                if old_type == new_type:
+                    dtype[col] = new_type
+                elif {old_type, new_type} == {'int64', 'float64'}:
+                    dtype[col] = 'float64'
+            entry = {
+                'columns': entry['columns'],
+                'dtype': dtype,
+                'parse_dates': [col for col in entry['parse_dates'] if col in old['parse_dates']],
+                'categories': [col for col in entry['categories'] if col in old['categories']],
+            }
+        self.put(key, entry)
+
+    def infer(self, df: pd.DataFrame) -> dict:
+        """sample dataframe 에서 schema 추론
+
+        모두 결측값인 컬럼은 dtype 을 지정하지 않음
+
+        Args:
+            df: pd.read_csv 로 읽은 sample dataframe
+
+        Returns:
+            cache 항목 dictionary
+        """
+        dtype = {}
+        parse_dates = []
+        categories = []
+        for col in df.columns:
+            series = df[col]
+            values = series.dropna()
+            if len(values) == 0:
+                continue
+            if series.dtype == object:
+                if values.map(lambda value: isinstance(value, str) and DATE_PATTERN.match(value) is not None).all():
+                    parse_dates.append(col)
+                    continue
+                unique_count = values.nunique()
+                if unique_count <= max(1, len(series) * SchemaCache.CATEGORY_RATIO) \
+                        and unique_count <= SchemaCache.CATEGORY_MAX_VALUES:
+                    categories.append(col)
+            dtype[col] = str(series.dtype)
+        return {
+            'columns': list(df.columns),
+            'dtype': dtype,
+            'parse_dates': parse_dates,
+            'categories': categories,
+        }
+
+    def read_kwargs(self, entry: dict, usecols=None) -> dict:
+        """cache 항목을 pd.read_csv 의 dtype, parse_dates 키워드 옵션으로 변환
+
+        Args:
+            entry: cache 항목
+            usecols: load() 의 usecols. 읽지 않는 컬럼은 parse_dates 에서 제외
+
+        Returns:
+            pd.read_csv 키워드 옵션 dictionary
+        """
+        columns = entry['columns']
+        if usecols is None or callable(usecols):
+            selected = None if usecols is None else [col for col in columns if usecols(col)]
+        else:
+            selected = [columns[col] if isinstance(col, int) and col < len(columns) else col for col in usecols]
+        dtype = dict(entry['dtype'])
+        if self.categorize:
+            dtype.update({col: 'category' for col in entry['categories']})
+        parse_dates = [col for col in entry['parse_dates'] if selected is None or col in selected]
+        if selected is not None:
+            dtype = {col: value for col, value in dtype.items() if col in selected}
+        result = {'dtype': dtype}
+        if len(parse_dates) > 0:
+            result['parse_dates'] = parse_dates
+        return result
+
+    def conform(self, df: pd.DataFrame, entry: dict) -> pd.DataFrame:
+        """cache 없이 읽은 dataframe 을 cache 항목의 dtype 과 날짜 컬럼으로 변환
+
+        변환할 수 없는 컬럼은 그대로 둠
+        """
+        kwargs = self.read_kwargs(entry)
+        df = df.copy(deep=False)
+        for col, col_type in kwargs['dtype'].items():
+            if col in df.columns and str(df[col].dtype) != col_type:
+                try:
+                    df[col] = df[col].astype(col_type)
+                except (TypeError, ValueError):
+                    pass
+        for col in kwargs.get('parse_dates', []):
+            if col in df.columns:
+                try:
+                    df[col] = pd.to_datetime(df[col])
+                except (TypeError, ValueError):
+                    pass
+        return df
+
+    def clear(self) -> None:
+        """cache 항목 모두 삭제"""
+        with self._lock:
+            self._entries.clear()
+            if self.path is not None:
+                self._write_file()
+
+    """
+
+    클래스 내부 메쏘드
+
+    """
+
+    def _read_file(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fp:
+                data = json.load(fp)
+            if data.get('version') == SchemaCache.VERSION:
+                self._entries = data.get('entries', {})
+        except Exception as e:
+            logger.warning(f"schema cache '{self.path}' read raise {e}, start empty cache")
+
+    def _write_file(self):
+        """내부메쏘드 임시 파일에 쓴 뒤 교체하여 다른 process 가 쓰다 만 파일을 읽지 않도록 함"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix='.schema_cache_', dir=directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                json.dump({'version': SchemaCache.VERSION, 'entries': self._entries}, fp, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"schema cache '{self.path}' write raise {e}")
+
+
+_schema_caches: Dict[str, SchemaCache] = {}
+_schema_caches_lock = threading.Lock()
+
+
+def get_schema_cache(path_or_cache) -> Optional[SchemaCache]:
+    """SchemaCache 객체 또는 cache 파일명으로 SchemaCache 획득
+
+    같은 파일명은 process 안에서 같은 객체를 공유
+
+    Args:
+        path_or_cache: SchemaCache, cache JSON 파일명, True (메모리 전용 공유 cache) 또는 None
+
+    Returns:
+        SchemaCache 또는 None
+    """
+    if path_or_cache is None or path_or_cache is False:
+        return None
+    if isinstance(path_or_cache, SchemaCache):
+        return path_or_cache
+    key = '' if path_or_cache is True else os.path.abspath(path_or_cache)
+    with _schema_caches_lock:
+        cache = _schema_caches.get(key)
+        if cache is None:
+            cache = _schema_caches[key] = SchemaCache(path=key or None)
+        return cache
@@ -0,0 +1,305 @@
+import codecs
+import csv
+import fnmatch
+import io
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Union
+
+from echoss_fileformat.compression import compression_from_magic, infer_compression, open_compressed, \
+    parse_compression, split_compression_ext
+from echoss_fileformat.echoss_logger import get_logger
+from echoss_fileformat.storage import resolve_storage_path
+
+logger = get_logger("echoss_fileformat")
+
+# 인코딩 판별에 사용하는 BOM
+BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+
+
+class CsvSniffer:
+    """CSV/TSV 파일 앞부분 sample 로 인코딩, 구분자, 인용문자, 헤더 여부를 판별하고 디렉토리 또는 pattern 별로 cache
+
+    같은 디렉토리의 파일은 같은 설정으로 만들어진다고 보고 처음 판별한 결과를 재사용.
+    파일명이 patterns 중 하나와 일치하면 디렉토리 대신 그 pattern 으로 구분.
+    cache 된 설정은 새 파일의 sample 이 그 인코딩으로 decode 되고 첫 줄에 구분자가 있는지만 확인하고,
+    맞지 않으면 다시 판별하여 cache 를 갱신함. path 를 지정하면 JSON 파일로 저장하여 process 가 바뀌어도 재사용
+    """
+    VERSION = 1
+    SAMPLE_BYTES = 16 * 1024
+    # 순서대로 decode 를 시도하는 인코딩. cp949 는 euc-kr 의 확장
+    ENCODINGS = ('utf-8', 'cp949')
+    DELIMITERS = (',', '\t', ';', '|')
+    QUOTECHARS = ('"', "'")
+
+    def __init__(self, path: str = None, sample_bytes: int = None, patterns: List[str] = None):
+        """
+        Args:
+            path (str): cache 저장 JSON 파일명. None 이면 메모리에만 보관
+            sample_bytes (int): 판별에 사용할 파일 앞부분 byte 수
+            patterns (list): 같은 설정으로 볼 파일명 glob pattern 목록. 예) ['*/events_*.csv']
+        """
+        self.path = path
+        self.sample_bytes = sample_bytes if sample_bytes is not None else CsvSniffer.SAMPLE_BYTES
+        self.patterns = list(patterns) if patterns else []
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self._read_file()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def cache_key(self, filename) -> str:
+        """파일명과 일치하는 pattern 또는 파일의 디렉토리로 만든 cache key"""
+        filename = str(filename)
+        for pattern in self.patterns:
+            if fnmatch.fnmatch(filename, pattern) or fnmatch.fnmatch(os.path.basename(filename), pattern):
+                return f"pattern:{pattern}"
+        if resolve_storage_path(filename) is not None:
+            return "dir:" + filename.rsplit('/', 1)[0]
+        return "dir:" + os.path.dirname(os.path.abspath(filename))
+
+    def get(self, key: str) -> Optional[dict]:
+        """cache 항목 조회
+
+        Returns:
+            {'encoding': ..., 'delimiter': ..., 'quotechar': ..., 'header': 0 또는 None} 또는 None
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, entry: dict) -> None:
+        """cache 항목 저장. path 가 있으면 파일도 갱신"""
+        with self._lock:
+            self._entries[key] = entry
+            if self.path is not None:
+                self._write_file()
+
+    def clear(self) -> None:
+        """cache 항목 모두 삭제"""
+        with self._lock:
+            self._entries.clear()
+            if self.path is not None:
+                self._write_file()
+
+    def sniff(self, file_or_filename, compression: Union[str, dict, None] = 'infer') -> Optional[dict]:
+        """파일명 또는 저장소 경로의 CSV 설정 판별
+
+        Args:
+            file_or_filename: 파일명, 's3://bucket/key' 같은 저장소 URL 또는 StoragePath
+            compression: 압축 형식. 'infer' 는 확장자와 첫 byte 로 판별
+
+        Returns:
+            {'encoding', 'delimiter', 'quotechar', 'header'} dictionary. file object 이거나 읽을 수 없으면 None
+        """
+        if not isinstance(file_or_filename, str) and resolve_storage_path(file_or_filename) is None:
+            return None
+        try:
+            sample, complete = read_sample(file_or_filename, self.sample_bytes, compression)
+        except Exception as e:
+            logger.warning(f"{file_or_filename} sniff sample read raise {e}")
+            return None
+
+        key = self.cache_key(file_or_filename)
+        entry = self.get(key)
+        if entry is not None and CsvSniffer.matches(sample, entry):
+            return entry
+        new_entry = CsvSniffer.detect(sample, complete)
+        if new_entry is None:
+            logger.warning(f"{file_or_filename} sniff can not decode sample with {CsvSniffer.ENCODINGS}")
+            return entry
+        if entry is not None:
+            logger.info(f"{file_or_filename} sniff {new_entry} differ from cached {entry}")
+        self.put(key, new_entry)
+        return new_entry
+
+    @staticmethod
+    def matches(sample: bytes, entry: dict) -> bool:
+        """sample 이 cache 항목의 인코딩으로 decode 되고 첫 줄에 구분자가 있는지 확인
+
+        BOM 이 다르거나, cache 항목이 utf-8 이 아닌데 sample 이 ascii 가 아닌 utf-8 이면 다른 설정으로 봄
+        """
+        encoding = entry['encoding']
+        bom_encoding = next((name for bom, name in BOMS if sample.startswith(bom)), None)
+        if bom_encoding is not None and bom_encoding != encoding:
+            return False
+        if encoding not in ('utf-8', 'utf-8-sig') and not sample.isascii() \
+                and CsvSniffer._decode(sample, 'utf-8', False) is not None:
+            return False
+        text = CsvSniffer._decode(sample, encoding, False)
+        if text is None:
+            return False
+        first_line = text.split('\n', 1)[0]
+        return entry['delimiter'] in first_line or len(first_line) == 0
+
+    @staticmethod
+    def detect(sample: bytes, complete: bool = True) -> Optional[dict]:
+        """sample byte 로 인코딩, 구분자, 인용문자, 헤더 여부 판별
+
+        인코딩은 BOM, utf-8, ENCODINGS 순서로 판별. 구분자와 인용문자는 csv 모듈로 읽은 row 의 필드 수가
+        가장 일정한 조합을 선택. 첫 row 에 숫자 필드가 없고 다른 row 에 숫자 필드가 있는 컬럼이 있거나,
+        첫 row 의 값이 다른 row 에 없으면 헤더로 판별
+
+        Args:
+            sample: 파일 앞부분 byte
+            complete: sample 이 파일 전체이면 True. 아니면 잘린 마지막 줄은 사용하지 않음
+
+        Returns:
+            {'encoding', 'delimiter', 'quotechar', 'header'} dictionary. decode 할 수 없으면 None
+        """
+        encoding = next((name for bom, name in BOMS if sample.startswith(bom)), None)
+        if encoding is not None:
+            text = CsvSniffer._decode(sample, encoding, complete)
+        else:
+            text = None
+            for name in CsvSniffer.ENCODINGS:
+                text = CsvSniffer._decode(sample, name, complete)
+                if text is not None:
+                    encoding = name
+                    break
+        if text is None:
+            return None
+        if not complete and '\n' in text:
+            text = text[:text.rfind('\n') + 1]
+
+        best = None
+        for quotechar in CsvSniffer.QUOTECHARS:
+            for delimiter in CsvSniffer.DELIMITERS:
+                rows = [row for row in csv.reader(io.StringIO(text), delimiter=delimiter, quotechar=quotechar)
+                        if len(row) > 0]
+                if len(rows) == 0:
+                    continue
+                counts = [len(row) for row in rows]
+                width = max(set(counts), key=counts.count)
+                if width < 2:
+                    continue
+                # 필드 수가 같은 row 비율, 필드 수 순서로 비교하고 같으면 앞 순서의 구분자와 인용문자 선택
+                score = (counts.count(width) / len(counts), width)
+                if best is None or score > best[0]:
+                    best = (score, delimiter, quotechar, rows)
+        if best is None:
+            # 컬럼이 1개인 파일
+            return {'encoding': encoding, 'delimiter': ',', 'quotechar': '"', 'header': 0}
+        _, delimiter, quotechar, rows = best
+        return {
+            'encoding': encoding,
+            'delimiter': delimiter,
+            'quotechar': quotechar,
+            'header': 0 if CsvSniffer._has_header(rows) else None,
+        }
+
+    """
+
+    클래스 내부 메쏘드
+
+    """
+
+    @staticmethod
+    def _decode(sample: bytes, encoding: str, final: bool) -> Optional[str]:
+        """내부함수 sample decode. final 이 아니면 sample 끝에서 잘린 multi-byte 문자는 무시. 실패하면 None"""
+        try:
+            return codecs.getincrementaldecoder(encoding)().decode(sample, final=final)
+        except (UnicodeDecodeError, LookupError):
+            return None
+
+    @staticmethod
+    def _has_header(rows: List[list]) -> bool:
+        """내부함수 첫 row 가 헤더인지 판별"""
+        first, rest = rows[0], rows[1:]
+        if len(rest) == 0:
+            return True
+        if any(CsvSniffer._is_number(value) for value in first):
+            return False
+        for index, name in enumerate(first):
+            values = [row[index] for row in rest if index < len(row) and row[index] != '']
+            if len(values) > 0 and all(CsvSniffer._is_number(value) for value in values):
+                return True
+        # 문자열 컬럼만 있으면 첫 row 의 값이 다른 row 에 나오지 않을 때 헤더로 봄
+        return not any(name in (row[index] for row in rest if index < len(row))
+                       for index, name in enumerate(first) if name)
+
+    @staticmethod
+    def _is_number(value: str) -> bool:
+        try:
+            float(value.replace(',', ''))
+            return True
+        except ValueError:
+            return False
+
+    def _read_file(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fp:
+                data = json.load(fp)
+            if data.get('version') == CsvSniffer.VERSION:
+                self._entries = data.get('entries', {})
+        except Exception as e:
+            logger.warning(f"sniff cache '{self.path}' read raise {e}, start empty cache")
+
+    def _write_file(self):
+        """내부메쏘드 임시 파일에 쓴 뒤 교체하여 다른 process 가 쓰다 만 파일을 읽지 않도록 함"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix='.sniff_cache_', dir=directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                json.dump({'version': CsvSniffer.VERSION, 'entries': self._entries}, fp, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"sniff cache '{self.path}' write raise {e}")
+
+
+def read_sample(file_or_filename, size: int, compression: Union[str, dict, None] = 'infer') -> tuple:
+    """파일명 또는 저장소 경로의 앞부분 size byte 읽기. 압축 파일은 압축 해제한 앞부분
+
+    Returns:
+        (sample bytes, 파일 전체를 읽었는지 여부) tuple
+    """
+    storage_path = resolve_storage_path(file_or_filename)
+    if storage_path is not None:
+        method, _, _ = parse_compression(compression)
+        if method == 'infer':
+            _, method = split_compression_ext(storage_path.path)
+            if method is None:
+                method = compression_from_magic(storage_path.read_range(0, 10))
+        if not method:
+            sample = storage_path.read_range(0, size + 1)
+            return sample[:size], len(sample) <= size
+        fp = open_compressed(storage_path.open('rb'), 'rb', method)
+    else:
+        method = infer_compression(file_or_filename, 'rb', compression)
+        fp = open_compressed(file_or_filename, 'rb', method) if method else open(file_or_filename, 'rb')
+    with fp:
+        sample = fp.read(size + 1)
+    return sample[:size], len(sample) <= size
+
+
+_sniffers: Dict[str, CsvSniffer] = {}
+_sniffers_lock = threading.Lock()
+
+
+def get_sniffer(path_or_sniffer) -> Optional[CsvSniffer]:
+    """CsvSniffer 객체 또는 cache 파일명으로 CsvSniffer 획득
+
+    같은 파일명은 process 안에서 같은 객체를 공유
+
+    Args:
+        path_or_sniffer: CsvSniffer, cache JSON 파일명, True (메모리 전용 공유 cache) 또는 None
+
+    Returns:
+        CsvSniffer 또는 None
+    """
+    if path_or_sniffer is None or path_or_sniffer is False:
+        return None
+    if isinstance(path_or_sniffer, CsvSniffer):
+        return path_or_sniffer
+    key = '' if path_or_sniffer is True else os.path.abspath(path_or_sniffer)
+    with _sniffers_lock:
+        sniffer = _sniffers.get(key)
+        if sniffer is None:
+            sniffer = _sniffers[key] = CsvSniffer(path=key or None)
+        return sniffer
@@ -0,0 +1,396 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Optional, Union
+
+from echoss_fileformat.echoss_logger import get_logger
+
+try:
+    import boto3
+    from botocore.config import Config as BotoConfig
+except ImportError:
+    boto3 = None
+    BotoConfig = None
+
+logger = get_logger("echoss_fileformat")
+
+
+class StorageBackend:
+    """file_or_filename 대신 사용할 수 있는 저장소 기본 클래스
+
+    하위 클래스는 size(), read_range(), open() 과 write_bytes() 또는 open() 의 쓰기 모드를 구현
+    """
+    scheme = ''
+
+    def size(self, path: str) -> int:
+        """객체 전체 byte 크기"""
+        raise NotImplementedError
+
+    def exists(self, path: str) -> bool:
+        """객체 존재 여부"""
+        raise NotImplementedError
+
+    def read_range(self, path: str, start: int, length: int) -> bytes:
+        """start 위치부터 length byte 읽기
+
+        Args:
+            path (str): 저장소 안의 경로
+            start (int): 시작 byte 위치
+            length (int): 읽을 byte 수
+
+        Returns:
+            bytes, 객체 끝을 넘으면 남은 byte 만 리턴
+        """
+        raise NotImplementedError
+
+    def open(self, path: str, mode: str = 'rb'):
+        """binary file object 열기
+
+        Args:
+            path (str): 저장소 안의 경로
+            mode (str): Literal['rb', 'wb']
+
+        Returns:
+            읽기는 seek 가능한 binary file object, 쓰기는 close 시에 저장하는 binary file object
+        """
+        raise NotImplementedError
+
+    def path(self, path: str) -> 'StoragePath':
+        """저장소와 경로를 묶은 StoragePath 생성"""
+        return StoragePath(self, path)
+
+
+class LocalStorage(StorageBackend):
+    """로컬 파일 시스템 저장소
+
+    root 를 지정하면 경로는 root 기준 상대 경로
+    """
+    scheme = 'file'
+
+    def __init__(self, root: str = None):
+        self.root = root
+
+    def size(self, path: str) -> int:
+        return os.path.getsize(self._full_path(path))
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(self._full_path(path))
+
+    def read_range(self, path: str, start: int, length: int) -> bytes:
+        with open(self._full_path(path), 'rb') as fp:
+            fp.seek(start)
+            return fp.read(length)
+
+    def open(self, path: str, mode: str = 'rb'):
+        return open(self._full_path(path), mode)
+
+    def _full_path(self, path: str) -> str:
+        """내부메쏘드 root 기준 경로"""
+        return os.path.join(self.root, path) if self.root else path
+
+
+class MemoryStorage(StorageBackend):
+    """프로세스 메모리 저장소. 테스트와 임시 데이터 교환에 사용"""
+    scheme = 'memory'
+
+    def __init__(self):
+        self._objects: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def size(self, path: str) -> int:
+        return len(self._get(path))
+
+    def exists(self, path: str) -> bool:
+        return path in self._objects
+
+    def read_range(self, path: str, start: int, length: int) -> bytes:
+        return self._get(path)[start:start + length]
+
+    def open(self, path: str, mode: str = 'rb'):
+        if 'r' in mode:
+            return io.BytesIO(self._get(path))
+        return _UploadOnClose(lambda data: self.write_bytes(path, data))
+
+    def write_bytes(self, path: str, data: bytes) -> None:
+        """객체 저장"""
+        with self._lock:
+            self._objects[path] = bytes(data)
+
+    def _get(self, path: str) -> bytes:
+        """내부메쏘드 객체 bytes, 없으면 FileNotFoundError"""
+        try:
+            return self._objects[path]
+        except KeyError:
+            raise FileNotFoundError(f"memory://{path} is not exist")
+
+
+class S3Storage(StorageBackend):
+    """S3 호환 저장소 (AWS S3, MinIO 등)
+
+    하나의 boto3 client 를 공유하여 connection pool 을 재사용하고,
+    읽기는 block_size 단위 range GET 으로 필요한 부분만 가져오며 순차 읽기 시에 다음 block 을 병렬로 미리 가져옴
+    """
+    scheme = 's3'
+
+    def __init__(self, client=None, endpoint_url: str = None, max_pool_connections: int = 16,
+                 block_size: int = 8 * 1024 * 1024, prefetch_blocks: int = 4, **client_kwargs):
+        """
+        Args:
+            client: 사용할 boto3 s3 client, None 이면 생성
+            endpoint_url (str): MinIO 등 S3 호환 서버 주소
+            max_pool_connections (int): connection pool 크기, 병렬 range GET 수
+            block_size (int): range GET 1회의 byte 크기
+            prefetch_blocks (int): 순차 읽기 시에 미리 가져올 block 수
+            **client_kwargs: boto3.client() 키워드 옵션 (region_name, aws_access_key_id 등)
+        """
+        if client is None:
+            if boto3 is None:
+                raise ImportError("S3Storage need 'boto3' package, pip install boto3")
+            client = boto3.client('s3', endpoint_url=endpoint_url,
+                                  config=BotoConfig(max_pool_connections=max_pool_connections), **client_kwargs)
+        self.client = client
+        self.block_size = block_size
+        self.prefetch_blocks = prefetch_blocks
+        self.max_pool_connections = max_pool_connections
+        self._executor = ThreadPoolExecutor(max_workers=max_pool_connections, thread_name_prefix='echoss_s3')
+
+    def size(self, path: str) -> int:
+        bucket, key = self._split(path)
+        return self.client.head_object(Bucket=bucket, Key=key)['ContentLength']
+
+    def exists(self, path: str) -> bool:
+        try:
+            self.size(path)
+        except Exception:
+            return False
+        return True
+
+    def read_range(self, path: str, start: int, length: int) -> bytes:
+        if length <= 0:
+            return b''
+        bucket, key = self._split(path)
+        response = self.client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{start + length - 1}")
+        return response['Body'].read()
+
+    def open(self, path: str, mode: str = 'rb'):
+        if 'r' in mode:
+            reader = RangeReader(self, path, block_size=self.block_size, prefetch_blocks=self.prefetch_blocks,
+                                 executor=self._executor)
+            return io.BufferedReader(reader, buffer_size=self.block_size)
+        return _UploadOnClose(lambda data: self.write_bytes(path, data))
+
+    def write_bytes(self, path: str, data: bytes) -> None:
+        """객체 저장. 큰 객체는 boto3 가 multipart 로 병렬 업로드"""
+        bucket, key = self._split(path)
+        self.client.upload_fileobj(io.BytesIO(data), bucket, key)
+
+    @staticmethod
+    def _split(path: str):
+        """내부메쏘드 'bucket/key' 경로를 (bucket, key) 로 분리"""
+        bucket, _, key = path.lstrip('/').partition('/')
+        if not bucket or not key:
+            raise ValueError(f"s3 path '{path}' must be 'bucket/key'")
+        return bucket, key
+
+
+class RangeReader(io.RawIOBase):
+    """StorageBackend.read_range() 로 block 단위로 읽는 seek 가능한 binary file object
+
+    pyarrow 등이 footer 와 필요한 column 만 seek 해서 읽을 때는 해당 block 만 가져오고,
+    순차 읽기 시에는 executor 로 다음 prefetch_blocks 개 block 을 병렬로 미리 가져옴
+    """
+
+    def __init__(self, storage: StorageBackend, path: str, block_size: int = 8 * 1024 * 1024,
+                 prefetch_blocks: int = 4, executor: Executor = None, max_cached_blocks: int = None):
+        super().__init__()
+        self.storage = storage
+        self.path = path
+        self.block_size = block_size
+        self.prefetch_blocks = prefetch_blocks if executor is not None else 0
+        self.executor = executor
+        self.max_cached_blocks = max_cached_blocks or max(2 * self.prefetch_blocks, 2)
+        self._size = storage.size(path)
+        self._pos = 0
+        self._last_block = -1
+        self._blocks = OrderedDict()
+
+    @property
+    def name(self):
+        return f"{self.storage.scheme}://{self.path}"
+
+    @property
+    def mode(self):
+        return 'rb'
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self._size + offset
+        else:
+            raise ValueError(f"{whence=} is not supported")
+        self._pos = max(self._pos, 0)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        if self._pos >= self._size:
+            return 0
+        index = self._pos // self.block_size
+        block = self._get_block(index)
+        start = self._pos - index * self.block_size
+        n = min(len(buffer), len(block) - start)
+        buffer[:n] = block[start:start + n]
+        self._pos += n
+        return n
+
+    def close(self) -> None:
+        for future in self._blocks.values():
+            if not isinstance(future, bytes):
+                future.cancel()
+        self._blocks.clear()
+        super().close()
+
+    def _get_block(self, index: int) -> bytes:
+        """내부메쏘드 block 읽기. 순차 읽기이면 다음 block 들을 미리 요청"""
+        sequential = index == self._last_block + 1
+        self._last_block = index
+        if index not in self._blocks:
+            self._blocks[index] = self._fetch(index)
+        if sequential:
+            last = min(index + self.prefetch_blocks, (self._size - 1) // self.block_size)
+            for next_index in range(index + 1, last + 1):
+                if next_index not in self._blocks:
+                    self._blocks[next_index] = self.executor.submit(self._fetch, next_index)
+        block = self._blocks[index]
+        if not isinstance(block, bytes):
+            block = block.result()
+            self._blocks[index] = block
+        self._blocks.move_to_end(index)
+        while len(self._blocks) > self.max_cached_blocks + self.prefetch_blocks:
+            old_index, old_block = self._blocks.popitem(last=False)
+            if not isinstance(old_block, bytes):
+                old_block.cancel()
+        return block
+
+    def _fetch(self, index: int) -> bytes:
+        """내부메쏘드 block 하나를 range read"""
+        return self.storage.read_range(self.path, index * self.block_size, self.block_size)
+
+
+class _UploadOnClose(io.BytesIO):
+    """내부 클래스 close 시에 쓴 내용을 저장소에 저장하는 binary file object"""
+
+    def __init__(self, upload):
+        super().__init__()
+        self._upload = upload
+
+    def close(self) -> None:
+        if not self.closed:
+            try:
+                self._upload(self.getvalue())
+            finally:
+                super().close()
+
+
+class StoragePath:
+    """저장소와 경로를 묶은 객체. file_or_filename 대신 사용
+
+    예) StoragePath(S3Storage(endpoint_url='http://localhost:9000'), 'bucket/data.csv.gz')
+    """
+
+    def __init__(self, storage: StorageBackend, path: str):
+        self.storage = storage
+        self.path = path
+
+    def __str__(self):
+        return f"{self.storage.scheme}://{self.path}"
+
+    def __repr__(self):
+        return f"StoragePath('{self}')"
+
+    def open(self, mode: str = 'rb'):
+        """binary file object 열기"""
+        return self.storage.open(self.path, mode)
+
+    def exists(self) -> bool:
+        return self.storage.exists(self.path)
+
+    def size(self) -> int:
+        return self.storage.size(self.path)
+
+    def read_range(self, start: int, length: int) -> bytes:
+        return self.storage.read_range(self.path, start, length)
+
+
+_storages: Dict[str, StorageBackend] = {}
+_storages_lock = threading.Lock()
+
+
+def register_storage(scheme: str, storage: StorageBackend) -> None:
+    """'scheme://' URL 문자열에 사용할 저장소 등록
+
+    예) register_storage('s3', S3Storage(endpoint_url='http://localhost:9000'))
+
+    Args:
+        scheme (str): URL scheme
+        storage: 사용할 StorageBackend
+    """
+    with _storages_lock:
+        _storages[scheme] = storage
+
+
+def get_storage(scheme: str) -> StorageBackend:
+    """scheme 에 등록된 저장소. 'file', 's3', 'memory' 는 처음 사용할 때 기본 설정으로 생성
+
+    Args:
+        scheme (str): URL scheme
+
+    Returns:
+        StorageBackend
+    """
+    with _storages_lock:
+        storage = _storages.get(scheme)
+        if storage is None:
+            if scheme == 'file':
+                storage = LocalStorage()
+            elif scheme == 's3':
+                storage = S3Storage()
+            elif scheme == 'memory':
+                storage = MemoryStorage()
+            else:
+                raise ValueError(f"storage scheme '{scheme}' is not registered")
+            _storages[scheme] = storage
+        return storage
+
+
+def resolve_storage_path(file_or_filename) -> Optional[StoragePath]:
+    """file_or_filename 이 StoragePath 또는 'scheme://path' 문자열이면 StoragePath 로 변환
+
+    로컬 파일명은 None 을 리턴하여 기존 로컬 파일 처리를 사용
+
+    Args:
+        file_or_filename: file 관련 객체 또는 filename
+
+    Returns:
+        StoragePath 또는 None
+    """
+    if isinstance(file_or_filename, StoragePath):
+        return file_or_filename
+    if isinstance(file_or_filename, str) and '://' in file_or_filename:
+        scheme, _, path = file_or_filename.partition('://')
+        if scheme and scheme.isidentifier():
+            return StoragePath(get_storage(scheme), path)
+    return None
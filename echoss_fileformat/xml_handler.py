@@ -1,10 +1,11 @@
 import io
 import json
 import pandas as pd
-from typing import Dict, Literal, Optional, Union
+from typing import Dict, Iterator, List, Literal, Optional, Union
 from lxml import etree as et
 
 from .fileformat_base import FileformatBase
+from .metrics import instrument
 from .echoss_logger import get_logger, set_logger_level
 
 logger = get_logger('echoss_fileformat')
@@ -24,13 +25,23 @@ class XmlHandler(FileformatBase):
     format = "xml"
 
     def __init__(self, processing_type: str = 'array',
-                 encoding='utf-8', error_log='error.log'):
+                 encoding='utf-8', error_log='error.log',
+                 memory_limit: int = None, spill_dir: str = None,
+                 compression: Union[str, dict, None] = 'infer', use_mmap: bool = False,
+                 categorize: str = None):
         """Initialize XML file format
 
         Args:
             processing_type (): Literal['array', 'object'] XML 은 'multiline' 지원 안함
+            memory_limit (int): 누적 데이터의 메모리 최대 byte 크기. 넘으면 임시 파일로 spill
+            spill_dir (str): spill 임시 파일 디렉토리
+            compression: 파일명 사용 시의 압축 형식. 'infer' 는 확장자와 첫 byte 로 판별, None 은 압축하지 않음
+            use_mmap (bool): True 이면 압축하지 않은 파일명 입력을 memory map 으로 읽음
+            categorize (str): 'auto' 이면 low cardinality 문자열 컬럼을 pandas categorical 로 읽음
         """
-        super().__init__(processing_type=processing_type, encoding=encoding, error_log=error_log)
+        super().__init__(processing_type=processing_type, encoding=encoding, error_log=error_log,
+                         memory_limit=memory_limit, spill_dir=spill_dir,
+                         compression=compression, use_mmap=use_mmap, categorize=categorize)
 
         # load 시에 root 기억
         self.root = None
@@ -39,6 +50,7 @@ class XmlHandler(FileformatBase):
         self.root_tag = 'data'
         self.child_tag = 'row'
 
+    @instrument('load')
     def load(self, file_or_filename: Union[io.TextIOWrapper, io.BytesIO, io.BufferedIOBase, str],
              data_key: str = None, usecols: list = None) -> Optional[et.Element]:
         """파일 객체나 파일명에서 JSON 데이터 읽기
@@ -82,7 +94,7 @@ class XmlHandler(FileformatBase):
             self.root = root
             self.root_tag = root.tag
         except Exception as e:
-            self.fail_list.append(str(file_or_filename))
+            self.fail_list.append(None, source=file_or_filename, reason=e)
             logger.error(f"'{file_or_filename}' load raise: {e}")
             raise e
         finally:
@@ -99,7 +111,7 @@ class XmlHandler(FileformatBase):
                 # self.child_tag = data_key.split('/')[-1]
                 data_nodes = tree.findall(data_key, namespaces=root.nsmap)
         except Exception as e:
-            self.fail_list.append(str(file_or_filename))
+            self.fail_list.append(None, source=file_or_filename, reason=e)
             logger.error(f"'{file_or_filename}' load raise: {e}")
             raise e
 
@@ -108,9 +120,10 @@ class XmlHandler(FileformatBase):
                 node_dict = {}
                 self._add_all_child_text(child, node_dict, usecols=usecols)
                 self.pass_list.append(node_dict)
+                self._check_memory_limit()
                 self.child_tag = child.tag
             except Exception as e:
-                self.fail_list.append(str(child))
+                self.fail_list.append(str(child), source=file_or_filename, offset=child.sourceline, reason=e)
                 logger.error(f"'{file_or_filename}' load raise {e}")
 
         # 'object' 처리 유형의 파일 처리는 루트 트리를 바로 리턴
@@ -118,6 +131,36 @@ class XmlHandler(FileformatBase):
             return data_nodes
 
 
+    @instrument('iter_chunks')
+    def iter_chunks(self, file_or_filename: Union[io.TextIOWrapper, io.BytesIO, io.BufferedIOBase, str],
+                    chunk_rows: int = 10000, data_key: str = None, usecols: list = None) -> Iterator[pd.DataFrame]:
+        """XML 파일을 iterparse 로 읽어서 chunk_rows 단위 dataframe 으로 생성
+
+        처리가 끝난 노드는 바로 clear 하여 메모리 사용량이 전체 트리가 아니라 chunk 크기에 비례함
+        data_key 는 'row', 'a/b', './/bndbox' 처럼 태그 경로만 지원하고
+        조건식([...])이나 속성(@) 이 들어간 경로는 전체 트리를 읽은 후 나누어 생성
+
+        Args:
+            file_or_filename (file-like object): file or s3 stream object which support .read() function
+            chunk_rows (int): chunk 1개의 최대 row 수
+            data_key (str): if empty use whole file, else use only key value. for example 'data'
+            usecols (list]): 전체 키 사용시 None, 이름의 리스트 ['foo', 'bar', 'baz'] 처럼 사용
+
+        Returns:
+            pd.DataFrame generator
+        """
+        if self.processing_type == FileformatBase.TYPE_OBJECT:
+            logger.error(f"{self.processing_type} not support iter_chunks() method")
+            raise TypeError(f"processing_type '{self.processing_type}' not support iter_chunks() method")
+
+        path = self._parse_data_key_path(data_key)
+        if data_key is not None and path is None:
+            rows = self._iter_findall_rows(file_or_filename, data_key, usecols)
+        else:
+            rows = self._iter_parse_rows(file_or_filename, path, usecols)
+        yield from self._records_to_chunks(rows, chunk_rows)
+
+    @instrument('loads')
     def loads(self, str_or_bytes: Union[str, bytes],
               data_key: str = None, usecols: list = None) -> Optional[et.Element]:
         """문자열이나 bytes 에서 XML 객체 읽기
@@ -138,17 +181,18 @@ class XmlHandler(FileformatBase):
                 file_obj = io.BytesIO(str_or_bytes)
                 root = self.load(file_obj, data_key=data_key, usecols=usecols)
         except Exception as e:
-            self.fail_list.append(str_or_bytes)
-            logger.error(f"'{str_or_bytes}' loads raise {e}")
+            self.fail_list.append(str_or_bytes, reason=e)
+            logger.error(f"loads [{len(str_or_bytes)}] raise {e}")
 
         # 'object' 처리 유형의 파일 처리는 루트 트리를 바로 리턴
         if self.processing_type == FileformatBase.TYPE_OBJECT:
             return root
 
+    @instrument('to_pandas')
     def to_pandas(self) -> pd.DataFrame:
         """클래스 내부메쏘드 JSON 파일 처리 결과를 pd.DataFrame 형태로 받음
 
-        내부적으로 추가할 데이터(pass_list)가 있으면 추가하여 새로운 pd.DataFrame 생성
+        내부적으로 추가할 데이터(pass_list)가 있으면 data_buffer 에 추가하여 pd.DataFrame 생성
         실패 목록(fail_list)가 있으면 파일로 저장
         학습을 위한 dataframe 이기 떄문에 dot('.') 문자로 normalize 된 flatten 컬럼과 값을 가진다.
 
@@ -158,44 +202,11 @@ class XmlHandler(FileformatBase):
             logger.error(f"{self.processing_type} not support to_pandas() method")
             raise TypeError(f"processing_type '{self.processing_type}' support to_pandas() method")
 
-        if len(self.pass_list) > 0:
-            try:
-                append_df = pd.DataFrame(self.pass_list)
-                merge_df = pd.concat([self.data_df, append_df], ignore_index=True)
-                self.data_df = merge_df
-            except Exception as e:
-                logger.error(f"pass_list[{len(self.pass_list)}] to_pandas raise {e}")
-                self.fail_list.extend(self.pass_list)
-            finally:
-                self.pass_list.clear()
-        if len(self.fail_list) > 0:
-            error_fp = None
-            try:
-                error_fp = open(self.error_log, mode='ab')
-            except Exception as e:
-                logger.error(f"fail_list[{len(self.fail_list)}] error log append raise {e}")
-
-            if error_fp:
-                for fail in self.fail_list:
-                    try:
-                        fail_str = None
-                        if isinstance(fail, dict):
-                            fail_str = json.dumps(fail, ensure_ascii=False, separators=(',', ':'))
-                        elif isinstance(fail, list):
-                            fail_str = str(fail)
-                        elif not isinstance(fail, str):
-                            fail_str = str(fail)
-
-                        if fail_str:
-                            fail_bytes = fail_str.encode(self.encoding)
-                            error_fp.write(fail_bytes)
-                            error_fp.write(b'\n')
-                    except Exception as e:
-                        logger.exception(e)
-                error_fp.close()
-                self.fail_list.clear()
+        self._merge_pass_list()
+        self._flush_fail_list()
         return self.data_df
 
+    @instrument('dump')
     def dump(self, file_or_filename: Union[io.TextIOWrapper, io.BytesIO, str],
              data=None, root_tag=None, child_tag=None) -> None:
         """데이터를 JSON 파일로 쓰기
@@ -226,7 +237,7 @@ class XmlHandler(FileformatBase):
                 # dataframe 에 추가할 것 있으면 concat
                 data = self.to_pandas()
         except Exception as e:
-            self.fail_list.append(data)
+            self.fail_list.append(data, source=fp, reason=e)
             logger.error(f"{fp=}, {binary_mode=}, {opened=}, {self.processing_type=} dump raise: {e}")
 
         if not root_tag:
@@ -272,14 +283,15 @@ class XmlHandler(FileformatBase):
                 tree.write(fp, encoding=self.encoding, xml_declaration=True)
             else:
                 dict_list = []
-                self.fail_list.append(data)
+                self.fail_list.append(data, source=fp, reason=f"{type(data)} is not supported")
                 logger.error(f"{fp=}, {binary_mode=}, {opened=}, {self.processing_type=} {type(data)} is not supported")
         except Exception as e:
-            self.fail_list.append(data)
+            self.fail_list.append(data, source=fp, reason=e)
             logger.error(f"{fp=}, {binary_mode=}, {opened=}, {self.processing_type=} dump raise: {e}")
         finally:
             self._safe_close(fp, opened)
 
+    @instrument('dumps')
     def dumps(self, data=None, root_tag=None, child_tag=None) -> str:
         """XML 데이터를 형태로 출력
 
@@ -324,6 +336,126 @@ class XmlHandler(FileformatBase):
         else:
             raise TypeError(f"method_name='{method_name}'] not supported yet.")
 
+    @staticmethod
+    def _parse_data_key_path(data_key: str) -> Optional[tuple]:
+        """내부메쏘드 data_key 를 iterparse 에서 비교할 수 있는 (descendant, tag 목록) 형태로 변환
+
+        Args:
+            data_key: 'row', './row', 'a/b', './/bndbox' 형태의 태그 경로
+
+        Returns:
+            (descendant, [localname, ...]) 또는 지원하지 않는 경로이면 None
+        """
+        if data_key is None:
+            return False, ['*']
+        if any(c in data_key for c in '[]@()') or '..' in data_key:
+            return None
+        descendant = False
+        key = data_key
+        if key.startswith('.//'):
+            descendant, key = True, key[3:]
+        elif key.startswith('//'):
+            descendant, key = True, key[2:]
+        elif key.startswith('./'):
+            key = key[2:]
+        if not key or '//' in key:
+            return None
+        tags = [tag.split(':')[-1].split('}')[-1] for tag in key.split('/')]
+        return descendant, tags
+
+    @staticmethod
+    def _match_path(stack: List[str], path: tuple) -> bool:
+        """내부메쏘드 root 아래 태그 stack 이 data_key 경로와 일치하는지 검사"""
+        descendant, tags = path
+        if len(stack) < len(tags) or (not descendant and len(stack) != len(tags)):
+            return False
+        for node_tag, tag in zip(stack[-len(tags):], tags):
+            if tag != '*' and tag != node_tag:
+                return False
+        return True
+
+    def _iter_parse_rows(self, file_or_filename, path: tuple, usecols: list) -> Iterator[dict]:
+        """내부메쏘드 iterparse 로 data_key 경로에 맞는 노드를 dictionary 로 순차 생성"""
+        fp = None
+        opened = False
+        try:
+            fp, binary_mode, opened = self._get_file_obj(file_or_filename, self._decide_rw_open_mode('load'))
+            # root 아래 태그 localname stack 과 각 노드의 매칭 여부 stack
+            stack = []
+            matched = []
+            matched_open = 0
+            root = None
+            for event, elem in et.iterparse(fp, events=('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                        self.root = root
+                        self.root_tag = root.tag
+                        continue
+                    stack.append(et.QName(elem).localname)
+                    is_match = self._match_path(stack, path)
+                    matched.append(is_match)
+                    if is_match:
+                        matched_open += 1
+                    continue
+
+                # event == 'end'
+                if elem is root:
+                    break
+                is_match = matched.pop()
+                depth = len(stack)
+                stack.pop()
+                if is_match:
+                    matched_open -= 1
+                    try:
+                        node_dict = {}
+                        self._add_all_child_text(elem, node_dict, usecols=usecols)
+                        self.child_tag = elem.tag
+                    except Exception as e:
+                        self.fail_list.append(str(elem), source=file_or_filename, offset=elem.sourceline, reason=e)
+                        logger.error(f"'{file_or_filename}' iter_chunks raise {e}")
+                    else:
+                        yield node_dict
+                # 처리가 끝난 top level 노드는 메모리에서 제거
+                if depth == 1 and matched_open == 0:
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del root[0]
+        except Exception as e:
+            self.fail_list.append(None, source=file_or_filename, reason=e)
+            logger.error(f"'{file_or_filename}' iter_chunks raise: {e}")
+        finally:
+            self._safe_close(fp, opened)
+
+    def _iter_findall_rows(self, file_or_filename, data_key: str, usecols: list) -> Iterator[dict]:
+        """내부메쏘드 전체 트리를 읽은 후 findall(data_key) 노드를 dictionary 로 순차 생성"""
+        fp = None
+        opened = False
+        try:
+            fp, binary_mode, opened = self._get_file_obj(file_or_filename, self._decide_rw_open_mode('load'))
+            tree = et.parse(fp)
+            root = tree.getroot()
+            self.root = root
+            self.root_tag = root.tag
+            data_nodes = tree.findall(data_key, namespaces=root.nsmap)
+        except Exception as e:
+            self.fail_list.append(None, source=file_or_filename, reason=e)
+            logger.error(f"'{file_or_filename}' iter_chunks raise: {e}")
+            return
+        finally:
+            self._safe_close(fp, opened)
+
+        for child in data_nodes:
+            try:
+                node_dict = {}
+                self._add_all_child_text(child, node_dict, usecols=usecols)
+                self.child_tag = child.tag
+            except Exception as e:
+                self.fail_list.append(str(child), source=file_or_filename, offset=child.sourceline, reason=e)
+                logger.error(f"'{file_or_filename}' iter_chunks raise {e}")
+            else:
+                yield node_dict
+
     def _add_all_child_text(self, parent: et._Element, parent_dict: dict, usecols: list = None, parent_key=None):
         """
             element node 안의 모든 text 를 dictionary 에 추가
@@ -30,5 +30,10 @@ setup(
         "wcwidth>=0.2.13",
         "lxml>=5.0.1",
         "pyyaml"
-    ]
+    ],
+    extras_require={
+        "zstd": ["zstandard>=0.15"],
+        "s3": ["boto3>=1.26"],
+        "json": ["orjson>=3.6"]
+    }
 )
@@ -1,9 +1,13 @@
 import unittest
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+import io
 import time
 import os
+import tempfile
 import pandas as pd
 
-from echoss_fileformat import CsvHandler
+from echoss_fileformat import CsvHandler, SchemaCache
 from echoss_fileformat import echoss_logger, to_table, LOG_FORMAT_DETAIL
 
 logger = echoss_logger.get_logger("test_csv_handler", backup_count=1, logger_format=LOG_FORMAT_DETAIL)
@@ -37,7 +41,7 @@ class MyTestCase(unittest.TestCase):
         load_filename = 'test_data/simple_standard.csv'
         dump_filename = 'test_data/simple_standard_to_delete.csv'
         try:
-            handler = CsvHandler()
+            handler = CsvHandler(error_log=None)
             handler.load(load_filename, header=0, skiprows=0)
             pass_size = len(handler.pass_list)
             fail_size = len(handler.fail_list)
@@ -78,7 +82,7 @@ class MyTestCase(unittest.TestCase):
         load_filename = 'test_data/simple_standard.csv'
         dump_filename = 'test_data/simple_standard_to_delete.csv'
         file_obj = None
-        handler = CsvHandler()
+        handler = CsvHandler(error_log=None)
 
         for given_mode in modes:
             expect_pass = 1
@@ -117,7 +121,7 @@ class MyTestCase(unittest.TestCase):
                     file_obj.close()
                     file_obj = None
 
-                check_csv = CsvHandler()
+                check_csv = CsvHandler(error_log=None)
                 check_csv.load(dump_filename)
 
                 check_df = check_csv.to_pandas()
@@ -140,6 +144,274 @@ class MyTestCase(unittest.TestCase):
                 if file_obj:
                     file_obj.close()
 
+    def test_iter_chunks(self):
+        load_filename = 'test_data/simple_standard.csv'
+        expect_shape = (212, 10)
+        chunk_rows = 50
+
+        handler = CsvHandler(error_log=None)
+        chunk_sizes = []
+        chunk_list = []
+        for chunk_df in handler.iter_chunks(load_filename, chunk_rows=chunk_rows):
+            chunk_sizes.append(len(chunk_df))
+            chunk_list.append(chunk_df)
+        merge_df = pd.concat(chunk_list, ignore_index=True)
+
+        logger.info(f"\t iter_chunks {chunk_sizes=} {merge_df.shape=}")
+        self.assertTrue(all(size <= chunk_rows for size in chunk_sizes))
+        self.assertEqual(expect_shape, merge_df.shape)
+        self.assertEqual(0, len(handler.pass_list))
+
+        check_df = CsvHandler('object', error_log=None).load(load_filename)
+        pd.testing.assert_frame_equal(check_df, merge_df)
+
+    def test_load_use_mmap(self):
+        load_filename = 'test_data/simple_standard.csv'
+
+        handler = CsvHandler('object', error_log=None, use_mmap=True)
+        mmap_df = handler.load(load_filename)
+        check_df = CsvHandler('object', error_log=None).load(load_filename)
+        logger.info(f"\t use_mmap load {mmap_df.shape=} {check_df.shape=}")
+        pd.testing.assert_frame_equal(check_df, mmap_df)
+
+    def test_load_chunksize(self):
+        load_filename = 'test_data/simple_standard.csv'
+        check_df = CsvHandler('object', error_log=None).load(load_filename)
+
+        handler = CsvHandler(error_log=None)
+        handler.load(load_filename, chunksize=50)
+        chunk_df = handler.to_pandas()
+        logger.info(f"\t chunksize load {chunk_df.shape=} {check_df.shape=}")
+        pd.testing.assert_frame_equal(check_df, chunk_df)
+
+        first_col = check_df.columns[0]
+        handler = CsvHandler('object', error_log=None)
+        object_df = handler.load(load_filename, chunksize=50, usecols=[first_col], dtype={first_col: 'int32'},
+                                 transform=lambda df: df[df[first_col] % 2 == 0])
+        expect_df = check_df.loc[check_df[first_col] % 2 == 0, [first_col]].astype('int32')
+        logger.info(f"\t chunksize transform {object_df.shape=} {expect_df.shape=}")
+        pd.testing.assert_frame_equal(expect_df, object_df)
+
+    def test_load_filter(self):
+        load_filename = 'test_data/simple_standard.csv'
+        check_df = CsvHandler('object', error_log=None).load(load_filename)
+        column, value = check_df.columns[0], check_df.iloc[0, 0]
+        expect_df = check_df[check_df[column] == value].reset_index(drop=True)
+
+        filters = [f"`{column}` == {value!r}", {column: value}, {column: [value]},
+                   {column: lambda series: series == value}, lambda df: df[column] == value]
+        for row_filter in filters:
+            filter_df = CsvHandler('object', error_log=None).load(load_filename, filter=row_filter, chunksize=3)
+            logger.info(f"\t filter {row_filter} {filter_df.shape=} {expect_df.shape=}")
+            pd.testing.assert_frame_equal(expect_df, filter_df)
+
+        # usecols 에 없는 dictionary 조건 컬럼도 검사 후 버림
+        handler = CsvHandler(error_log=None)
+        handler.load(load_filename, usecols=list(check_df.columns[1:]), filter={column: value})
+        pd.testing.assert_frame_equal(expect_df[check_df.columns[1:]], handler.to_pandas())
+
+    def test_load_incremental(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            load_filename = os.path.join(tmp_dir, 'tail.csv')
+            checkpoint_filename = os.path.join(tmp_dir, 'tail.json')
+            with open(load_filename, 'w', encoding='utf-8') as fp:
+                fp.write('# collector\nid,text\n1,a\n2,"multi\nline"\n3,"part')
+
+            handler = CsvHandler('object', error_log=None)
+            df = handler.load(load_filename, skiprows=1, incremental=checkpoint_filename)
+            self.assertEqual([1, 2], df['id'].tolist())
+            self.assertEqual(0, len(handler.load(load_filename, skiprows=1, incremental=checkpoint_filename)))
+
+            # 인용문자 안의 줄바꿈은 record 끝이 아니므로 완성된 record 만 읽음
+            with open(load_filename, 'a', encoding='utf-8') as fp:
+                fp.write('ial\n"\n4,"x\n')
+            df = handler.load(load_filename, skiprows=1, incremental=checkpoint_filename)
+            logger.info(f"\t incremental {df.to_dict('records')}")
+            self.assertEqual([3], df['id'].tolist())
+            self.assertEqual('partial\n', df['text'][0])
+
+            # 파일이 교체되면 처음부터 다시 읽음
+            os.remove(load_filename)
+            with open(load_filename, 'w', encoding='utf-8') as fp:
+                fp.write('# rotated\nid,text\n10,b\n')
+            df = handler.load(load_filename, skiprows=1, incremental=checkpoint_filename)
+            self.assertEqual([10], df['id'].tolist())
+
+    def test_load_bad_lines(self):
+        data = 'id,text\n1,"multi\nline"\n2,b,c\n\n3,d\n4,e,f,g\n'
+        for engine in ['c', 'pyarrow']:
+            handler = CsvHandler('object', error_log=None, engine=engine)
+            df = handler.load(io.BytesIO(data.encode('utf-8')))
+            records = [(record['offset'], record['payload']) for record in handler.fail_list]
+            logger.info(f"\t {engine=} bad lines {records}")
+            self.assertEqual([1, 3], df['id'].tolist())
+            self.assertEqual([(3, '2,b,c'), (6, '4,e,f,g')], records)
+            self.assertEqual('expected 2 fields, saw 3', handler.fail_list[0]['reason'])
+
+        # 'python' 엔진은 on_bad_lines 함수로 필드가 많은 줄을 받고 줄 번호는 원문으로 찾음
+        handler = CsvHandler('object', error_log=None, engine='python')
+        df = handler.load(io.BytesIO(data.encode('utf-8')))
+        records = [(record['offset'], record['payload']) for record in handler.fail_list]
+        logger.info(f"\t engine='python' bad lines {records}")
+        self.assertEqual([1, 3], df['id'].tolist())
+        self.assertEqual([(3, '2,b,c'), (6, '4,e,f,g')], records)
+        self.assertEqual('too many fields, saw 3', handler.fail_list[0]['reason'])
+
+        # 'skip' 은 fail_list 에 추가하지 않음
+        handler = CsvHandler('object', error_log=None)
+        handler.load(io.StringIO(data), on_bad_lines='skip')
+        self.assertEqual(0, len(handler.fail_list))
+
+    def test_load_bad_lines_threads(self):
+        # 여러 thread 에서 동시에 읽어도 bad line 은 읽은 파일의 fail_list 에만 기록
+        def load(index):
+            lines = [f"{i},{index}" for i in range(2000)]
+            lines[index * 10] += ',bad'
+            handler = CsvHandler('object', error_log=None, engine=['c', 'python'][index % 2])
+            handler.load(io.BytesIO(('id,value\n' + '\n'.join(lines) + '\n').encode('utf-8')))
+            return [(record['offset'], record['payload']) for record in handler.fail_list]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(load, range(1, 17)))
+        for index, records in enumerate(results, start=1):
+            self.assertEqual([(index * 10 + 2, f"{index * 10},{index},bad")], records)
+        logger.info(f"\t thread bad lines {results[:2]}")
+
+    def test_schema_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            first_filename = os.path.join(tmp_dir, 'first.csv')
+            second_filename = os.path.join(tmp_dir, 'second.csv')
+            with open(first_filename, 'w', encoding='utf-8') as fp:
+                fp.write("id,ts,val\n1,2024-01-01,1.5\n2,2024-01-02,2.5\n")
+            with open(second_filename, 'w', encoding='utf-8') as fp:
+                fp.write("id,ts,val\n3,2024-01-03,1\n,2024-01-04,2\n")
+            cache_filename = os.path.join(tmp_dir, 'schema.json')
+
+            handler = CsvHandler(error_log=None, schema_cache=SchemaCache(cache_filename))
+            handler.load(first_filename)
+            handler.load(second_filename)
+            df = handler.to_pandas()
+            logger.info(f"\t schema cache dtypes {df.dtypes.to_dict()}")
+            self.assertEqual(4, len(df))
+            self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['ts']))
+            self.assertEqual('float64', str(df['val'].dtype))
+
+            # 파일에 저장된 cache 를 다른 객체가 재사용하고, 두번째 파일로 넓힌 id dtype 을 사용
+            cache = SchemaCache(cache_filename)
+            self.assertEqual(1, len(cache))
+            first_df = CsvHandler('object', error_log=None, schema_cache=cache).load(first_filename)
+            self.assertEqual('float64', str(first_df['id'].dtype))
+
+    def test_load_parallel(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            load_filename = os.path.join(tmp_dir, 'parallel.csv')
+            rows = 20000
+            with open(load_filename, 'w', encoding='utf-8') as fp:
+                fp.write("skip this line\nid,text,value\n")
+                for i in range(rows):
+                    text = f'"quoted, ""{i}""\nnext line"' if i % 7 == 0 else f"text{i}"
+                    fp.write(f"{i},{text},{i * 0.5}\n")
+
+            min_range_bytes = CsvHandler.PARALLEL_MIN_RANGE_BYTES
+            CsvHandler.PARALLEL_MIN_RANGE_BYTES = 1024
+            try:
+                check_df = CsvHandler('object', error_log=None).load(load_filename, skiprows=1)
+                parallel_df = CsvHandler('object', error_log=None).load(load_filename, skiprows=1, workers=4)
+                logger.info(f"\t parallel load {parallel_df.shape=} {check_df.shape=}")
+                pd.testing.assert_frame_equal(check_df, parallel_df)
+
+                handler = CsvHandler(error_log=None)
+                handler.load(load_filename, skiprows=1, usecols=['id', 'text'], workers=3)
+                pd.testing.assert_frame_equal(check_df[['id', 'text']], handler.to_pandas())
+
+                nrows_df = CsvHandler('object', error_log=None).load(load_filename, skiprows=1, nrows=10, workers=4)
+                pd.testing.assert_frame_equal(check_df.head(10), nrows_df)
+
+                # 범위마다 추론한 dtype 이 다른 컬럼이 있으면 한번에 읽은 결과와 같음
+                mixed_filename = os.path.join(tmp_dir, 'mixed.csv')
+                with open(mixed_filename, 'w', encoding='utf-8') as fp:
+                    fp.write("d,value\n")
+                    for i in range(3000):
+                        fp.write(f"{'x' if i == 2900 else i},{'' if i == 10 else i}\n")
+                for kwargs in [{}, {'header': None}]:
+                    check_df = CsvHandler('object', error_log=None).load(mixed_filename, **kwargs)
+                    parallel_df = CsvHandler('object', error_log=None).load(mixed_filename, workers=4, **kwargs)
+                    first_col = check_df.columns[0]
+                    logger.info(f"\t mixed parallel load {kwargs} {parallel_df.dtypes.to_dict()}")
+                    pd.testing.assert_frame_equal(check_df, parallel_df)
+                    self.assertEqual({str}, {type(v) for v in parallel_df[first_col]})
+                # int64 범위와 결측값이 있는 float64 범위는 나누어 읽어도 한번에 읽은 결과와 같음
+                check_df = CsvHandler('object', error_log=None).load(mixed_filename, usecols=['value'])
+                parallel_df = CsvHandler('object', error_log=None).load(mixed_filename, usecols=['value'], workers=4)
+                self.assertEqual('float64', parallel_df['value'].dtype)
+                pd.testing.assert_frame_equal(check_df, parallel_df)
+            finally:
+                CsvHandler.PARALLEL_MIN_RANGE_BYTES = min_range_bytes
+
+    def test_dump_pyarrow_engine(self):
+        df = CsvHandler('object', error_log=None).load('test_data/simple_standard.csv')
+        df['text'] = ['quoted, "text"\nnext line', '한글'] * (len(df) // 2) + ['end'] * (len(df) % 2)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for filename in ['dump.csv', 'dump.csv.gz']:
+                dump_filename = os.path.join(tmp_dir, filename)
+                handler = CsvHandler('object', error_log=None)
+                handler.dump(dump_filename, data=df, engine='pyarrow', escapechar=None, chunk_rows=7)
+                check_df = CsvHandler('object', error_log=None).load(dump_filename)
+                logger.info(f"\t pyarrow dump {filename} {df.shape=} {check_df.shape=}")
+                self.assertEqual(0, len(handler.fail_list))
+                pd.testing.assert_frame_equal(df, check_df, check_dtype=False)
+
+        # 값 type 이 섞인 object 컬럼이 있으면 한 파일에 형식이 섞이지 않도록 전체를 같은 옵션의 df.to_csv 로 씀
+        mixed_df = pd.DataFrame({'id': range(6), 'value': [0.5, 1.5, 2.5, 'x', 1, 2], 'flag': [True] * 6})
+        text_fp = io.StringIO()
+        CsvHandler('object', error_log=None).dump(text_fp, data=mixed_df, engine='pyarrow', escapechar=None,
+                                                  quoting=1, chunk_rows=3)
+        self.assertEqual(mixed_df.to_csv(index=False, quoting=1), text_fp.getvalue())
+
+        # pyarrow 는 escapechar 를 지원하지 않으므로 escapechar 를 지정하면 df.to_csv 로 씀
+        escape_df = pd.DataFrame({'path': ['c:\\data', 'a,b'], 'value': [1.0, 2.0]})
+        text_fp = io.StringIO()
+        CsvHandler('object', error_log=None).dump(text_fp, data=escape_df, engine='pyarrow')
+        self.assertEqual(escape_df.to_csv(index=False, escapechar='\\'), text_fp.getvalue())
+
+        # engine='auto' 는 load() 에만 사용하고 dump() 는 dump_engine 기본값 'c' 로 씀
+        text_fp = io.StringIO()
+        CsvHandler('object', error_log=None, engine='auto').dump(text_fp, data=mixed_df.iloc[:3])
+        self.assertEqual(mixed_df.iloc[:3].to_csv(index=False, escapechar='\\'), text_fp.getvalue())
+        with self.assertRaises(ValueError):
+            CsvHandler('object', error_log=None, dump_engine='arrow')
+
+    def test_load_pyarrow_engine(self):
+        load_filename = 'test_data/simple_standard.csv'
+        options = [{}, {'nrows': 10}, {'skiprows': 3, 'nrows': 5}, {'usecols': [0, 2]}, {'header': None},
+                   {'usecols': ['PROMTN_TY_NM', 'SEQ_NO']}, {'usecols': ['PROMTN_TY_NM', 'SEQ_NO'], 'nrows': 5}]
+
+        for kwargs in options:
+            arrow_df = CsvHandler('object', error_log=None, engine='pyarrow').load(load_filename, **kwargs)
+            check_df = CsvHandler('object', error_log=None).load(load_filename, **kwargs)
+            logger.info(f"\t pyarrow engine {kwargs} {arrow_df.shape=} {check_df.shape=}")
+            pd.testing.assert_frame_equal(check_df, arrow_df)
+
+        # 순서가 다른 usecols 컬럼명은 'c' 엔진과 같이 파일 헤더 순서로 읽음. file object 도 헤더 확인 후 처음부터 읽음
+        with mock.patch.object(CsvHandler, '_arrow_header_order', wraps=CsvHandler._arrow_header_order) as header_order:
+            with open(load_filename, 'rb') as fp:
+                handler = CsvHandler('object', error_log=None, engine='pyarrow')
+                arrow_df = handler.load(fp, usecols=['PROMTN_TY_NM', 'SEQ_NO'])
+        self.assertEqual(1, header_order.call_count)
+        self.assertEqual(['SEQ_NO', 'PROMTN_TY_NM'], list(arrow_df.columns))
+        pd.testing.assert_frame_equal(CsvHandler('object', error_log=None).load(load_filename,
+                                                                                usecols=['SEQ_NO', 'PROMTN_TY_NM']),
+                                      arrow_df)
+
+        # pyarrow 가 지원하지 않는 옵션은 'c' 엔진으로 대체
+        fallback_df = CsvHandler('object', error_log=None, engine='pyarrow').load(load_filename, comment='#')
+        check_df = CsvHandler('object', error_log=None).load(load_filename, comment='#')
+        pd.testing.assert_frame_equal(check_df, fallback_df)
+
+        arrow_df = CsvHandler('object', error_log=None, engine='pyarrow', dtype_backend='pyarrow').load(load_filename)
+        self.assertTrue(all(isinstance(dtype, pd.ArrowDtype) for dtype in arrow_df.dtypes))
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,333 @@
+import unittest
+import io
+import json
+import os
+import tempfile
+import time
+import warnings
+from unittest import mock
+import numpy as np
+import pandas as pd
+
+from echoss_fileformat import CsvHandler, JsonHandler
+from echoss_fileformat.data_buffer import ColumnAccumulator, DataBuffer
+from echoss_fileformat import get_logger
+
+logger = get_logger("test_data_buffer")
+
+
+class MyTestCase(unittest.TestCase):
+    """
+        테스트 설정
+    """
+    def setUp(self):
+        """Before test"""
+        ids = self.id().split('.')
+        self.str_id = f"{ids[-2]}: {ids[-1]}"
+        self.start_time = time.perf_counter()
+        logger.info(f"setting up test [{self.str_id}] ")
+
+    def tearDown(self):
+        """After test"""
+        self.end_time = time.perf_counter()
+        logger.info(f" tear down test [{self.str_id}] elapsed time {(self.end_time-self.start_time)*1000: .3f}ms \n")
+
+    """
+    유닛 테스트 
+    """
+
+    def test_append_same_as_concat(self):
+        frames = [
+            pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']}),
+            pd.DataFrame({'a': [1.5], 'c': [True]}),
+            pd.DataFrame({'b': ['z'], 'd': pd.to_datetime(['2020-01-01'])}),
+            pd.DataFrame({'a': [3], 'e': pd.array([7], dtype='Int64')}),
+            pd.DataFrame({'f': pd.Categorical(['u', 'v']), 'a': [4, 5]}),
+        ]
+        buffer = DataBuffer()
+        for i, df in enumerate(frames):
+            buffer.append(df)
+            expect_df = pd.concat(frames[:i + 1], ignore_index=True)
+            pd.testing.assert_frame_equal(expect_df, buffer.to_frame())
+        logger.info(f"\t buffer {len(buffer)=} {buffer.columns=}")
+        self.assertEqual(7, len(buffer))
+
+    def test_append_mixed_dtype_same_as_concat(self):
+        # datetime 컬럼 다음에 object 조각이 오면 Timestamp 를 유지
+        frames = [
+            pd.DataFrame({'ts': pd.to_datetime(['2024-01-01', '2024-01-02'])}),
+            pd.DataFrame({'ts': ['notadate']}),
+        ]
+        buffer = DataBuffer()
+        for df in frames:
+            buffer.append(df)
+        df = buffer.to_frame()
+        logger.info(f"\t datetime then object {df['ts'].tolist()}")
+        pd.testing.assert_frame_equal(pd.concat(frames, ignore_index=True), df)
+        self.assertEqual(pd.Timestamp('2024-01-01'), df['ts'][0])
+
+        # bool + int, 빈 object 조각, 모두 결측값인 조각, 컬럼이 없는 조각도 pd.concat 과 같은 dtype 과 값
+        cases = [
+            [pd.DataFrame({'a': [True, False]}), pd.DataFrame({'a': [1, 2]})],
+            [pd.DataFrame({'a': [True, False]}), pd.DataFrame({'a': [1, 2]}), pd.DataFrame({'a': ['x']})],
+            [pd.DataFrame({'a': [1, 2]}), pd.DataFrame({'a': pd.Series([], dtype=object)})],
+            [pd.DataFrame({'a': [1, 2]}), pd.DataFrame({'a': [None]}), pd.DataFrame({'a': [3]})],
+            [pd.DataFrame({'a': [1.5]}), pd.DataFrame({'a': [None]})],
+            [pd.DataFrame({'a': pd.to_datetime(['2024-01-01'])}), pd.DataFrame({'a': pd.to_timedelta(['1s'])})],
+            [pd.DataFrame({'b': pd.Series([], dtype=float)}), pd.DataFrame({'a': [1, 2]})],
+            [pd.DataFrame({'a': [True]}), pd.DataFrame({'b': [1]}), pd.DataFrame({'a': [False]})],
+        ]
+        for frames in cases:
+            buffer = DataBuffer()
+            for df in frames:
+                buffer.append(df)
+            expect_df = pd.concat(frames, ignore_index=True)
+            df = buffer.to_frame()[expect_df.columns]
+            logger.info(f"\t {[str(frame.dtypes.to_dict()) for frame in frames]} -> {df.dtypes.to_dict()}")
+            pd.testing.assert_frame_equal(expect_df, df)
+            for col in df.columns:
+                self.assertEqual([type(v) for v in expect_df[col]], [type(v) for v in df[col]])
+
+        # CSV 파일마다 parse_dates 결과 dtype 이 달라도 날짜 값을 유지
+        handler = CsvHandler('array', error_log=None)
+        handler.load(io.BytesIO(b'id,ts\n1,2024-01-01\n2,2024-01-02\n'), parse_dates=['ts'])
+        handler.load(io.BytesIO(b'id,ts\n3,notadate\n'), parse_dates=['ts'])
+        df = handler.to_pandas()
+        self.assertEqual([pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-02'), 'notadate'], df['ts'].tolist())
+
+    def test_append_missing_extension_column(self):
+        # Int64 조각 다음에 int64 조각이 온 컬럼이 없는 dataframe 도 pd.concat 과 같이 결측값으로 채움
+        frames = [
+            pd.DataFrame({'a': pd.array([1, None], dtype='Int64'), 'b': [1, 2]}),
+            pd.DataFrame({'a': [3], 'b': [3]}),
+            pd.DataFrame({'b': [4]}),
+        ]
+        buffer = DataBuffer()
+        for df in frames:
+            buffer.append(df)
+        logger.info(f"\t {buffer.to_frame().dtypes.to_dict()=}")
+        pd.testing.assert_frame_equal(pd.concat(frames, ignore_index=True), buffer.to_frame())
+
+        handler = CsvHandler('array', error_log=None)
+        handler.load(io.BytesIO(b'a,b\n1,1\n,2\n'), dtype={'a': 'Int64'})
+        handler.load(io.BytesIO(b'a,b\n3,3\n'))
+        handler.load(io.BytesIO(b'b\n4\n'))
+        self.assertEqual(0, len(handler.fail_list))
+        self.assertEqual([1, 2, 3, 4], handler.to_pandas()['b'].tolist())
+
+        # 컬럼 하나를 추가하다가 예외가 발생하면 다른 컬럼도 추가하지 않음
+        expect_df = buffer.to_frame().copy()
+        with mock.patch.object(DataBuffer, '_prepare_missing', side_effect=ValueError('fail')):
+            with self.assertRaises(ValueError):
+                buffer.append(pd.DataFrame({'b': [5], 'c': ['x']}))
+        self.assertEqual(4, len(buffer))
+        pd.testing.assert_frame_equal(expect_df, buffer.to_frame())
+        buffer.append(pd.DataFrame({'b': [5]}))
+        self.assertEqual([1, 2, 3, 4, 5], buffer.to_frame()['b'].tolist())
+
+    def test_append_random_dtypes_same_as_concat(self):
+        def column(kind, rows):
+            if kind == 'int':
+                return np.arange(rows, dtype=np.int64)
+            if kind == 'int32':
+                return np.arange(rows, dtype=np.int32)
+            if kind == 'float':
+                return np.arange(rows) + 0.5
+            if kind == 'nan':
+                return np.full(rows, np.nan)
+            if kind == 'bool':
+                return np.arange(rows) % 2 == 0
+            if kind == 'str':
+                return np.array([f"s{i}" for i in range(rows)], dtype=object)
+            if kind == 'none':
+                return np.array([None] * rows, dtype=object)
+            if kind == 'datetime':
+                return pd.date_range('2024-01-01', periods=rows).to_numpy()
+            if kind == 'nat':
+                return np.full(rows, np.datetime64('NaT'), dtype='datetime64[ns]')
+            if kind == 'timedelta':
+                return pd.to_timedelta(np.arange(rows), unit='s').to_numpy()
+            return pd.array(range(rows), dtype='Int64')
+
+        # datetime, NaN float, 문자열 순서로 dtype 이 여러 번 바뀌어도 NaN 을 유지
+        frames = [pd.DataFrame({'a': column('datetime', 1)}), pd.DataFrame({'a': column('nan', 1)}),
+                  pd.DataFrame({'a': ['x']})]
+        buffer = DataBuffer()
+        for df in frames:
+            buffer.append(df)
+        self.assertEqual(pd.Timestamp('2024-01-01'), buffer.to_frame()['a'][0])
+        self.assertTrue(np.isnan(buffer.to_frame()['a'][1]))
+
+        kinds = ['int', 'int32', 'float', 'nan', 'bool', 'str', 'none', 'datetime', 'nat', 'timedelta', 'Int64',
+                 'absent']
+        rng = np.random.default_rng(0)
+        for trial in range(200):
+            frames = []
+            for _ in range(rng.integers(2, 6)):
+                kind, rows = kinds[rng.integers(len(kinds))], int(rng.integers(0, 4))
+                data = {'b': np.arange(rows)}
+                if kind != 'absent':
+                    data['a'] = column(kind, rows)
+                frames.append(pd.DataFrame(data))
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', FutureWarning)
+                expect_df = pd.concat(frames, ignore_index=True)
+            buffer = DataBuffer()
+            for df in frames:
+                buffer.append(df)
+            df = buffer.to_frame()
+            pd.testing.assert_frame_equal(expect_df, df)
+            for col in df.columns:
+                self.assertEqual([(type(v), repr(v)) for v in expect_df[col]], [(type(v), repr(v)) for v in df[col]],
+                                 f"{trial=} {[frame.dtypes.to_dict() for frame in frames]}")
+
+    def test_to_frame_reuse_buffer(self):
+        buffer = DataBuffer()
+        buffer.append(pd.DataFrame({'a': np.arange(10.0)}))
+        frame = buffer.to_frame()
+        # 추가된 row 가 없으면 같은 dataframe 을 리턴하고, 버퍼를 복사하지 않음
+        self.assertIs(frame, buffer.to_frame())
+        self.assertTrue(np.shares_memory(frame['a'].to_numpy(), buffer._arrays['a']))
+
+        buffer.append(pd.DataFrame({'a': [10.0]}))
+        self.assertEqual(11, len(buffer.to_frame()))
+        self.assertEqual(10, len(frame))
+
+    def test_handler_repeated_to_pandas(self):
+        handler = JsonHandler('multiline', error_log=None)
+        for i in range(3):
+            handler.load('test_data/simple_multiline_object.jsonl')
+            df = handler.to_pandas()
+            logger.info(f"\t to_pandas {i=} {df.shape=}")
+            self.assertEqual(15 * (i + 1), len(df))
+        self.assertEqual(0, len(handler.pass_list))
+
+    def test_memory_limit_spill(self):
+        spill_dir = tempfile.mkdtemp()
+        handler = CsvHandler(error_log=None, memory_limit=50000, spill_dir=spill_dir)
+        check_handler = CsvHandler(error_log=None)
+        for i in range(3):
+            handler.load('test_data/simple_standard.csv')
+            check_handler.load('test_data/simple_standard.csv')
+        spill_files = os.listdir(spill_dir)
+        logger.info(f"\t {handler.data_buffer.spilled=} {spill_files=}")
+        self.assertTrue(handler.data_buffer.spilled)
+        self.assertEqual(3, len(spill_files))
+
+        # spill 된 데이터의 chunk 단위 dump 결과도 같아야 함
+        self.assertEqual(check_handler.dumps(), handler.dumps())
+        pd.testing.assert_frame_equal(check_handler.to_pandas(), handler.to_pandas())
+
+        handler.data_buffer.clear()
+        self.assertEqual(0, len(os.listdir(spill_dir)))
+        os.rmdir(spill_dir)
+
+    def test_memory_limit_spill_same_values(self):
+        rows = [
+            {'id': 1, 'name': 'a', 'tags': [1, 2], 'meta': {'k': 1}},
+            {'id': 2, 'name': None, 'tags': None, 'meta': None},
+            {'id': 3, 'name': 'c', 'tags': [3], 'meta': {'k': 2}},
+        ]
+        data = '\n'.join(json.dumps(row) for row in rows)
+        check_handler = JsonHandler('multiline', error_log=None)
+        check_handler.loads(data)
+        check_df = check_handler.to_pandas()
+        self.assertIsNone(check_df['name'][1])
+        self.assertIsInstance(check_df['tags'][0], list)
+
+        # list, dict 컬럼이 있으면 pickle, 문자열 컬럼만 있으면 Arrow 파일로 spill 하고 None 과 list 를 그대로 읽음
+        for columns, suffix in [(None, '.pkl'), (['id', 'name'], '.arrow')]:
+            spill_dir = tempfile.mkdtemp()
+            handler = JsonHandler('multiline', error_log=None, memory_limit=1, spill_dir=spill_dir)
+            for row in rows:
+                handler.loads(json.dumps(row if columns is None else {k: row[k] for k in columns}))
+            spill_files = os.listdir(spill_dir)
+            logger.info(f"\t {columns=} {spill_files=}")
+            self.assertTrue(all(name.endswith(suffix) for name in spill_files))
+            df = handler.to_pandas()
+            expect_df = check_df if columns is None else check_df[columns]
+            pd.testing.assert_frame_equal(expect_df, df)
+            for col in df.columns:
+                self.assertEqual([type(v) for v in expect_df[col]], [type(v) for v in df[col]])
+            handler.data_buffer.clear()
+            os.rmdir(spill_dir)
+
+        # 결측값이 NaN 인 문자열 컬럼은 NaN 으로 읽음
+        buffer = DataBuffer(memory_limit=1)
+        buffer.append(pd.DataFrame({'name': ['a', np.nan]}))
+        self.assertTrue(buffer.spilled)
+        self.assertTrue(np.isnan(buffer.to_frame()['name'][1]))
+        buffer.clear()
+
+    def test_categorize_auto(self):
+        regions = ['seoul', 'busan', 'daegu', np.nan]
+        chunks = [pd.DataFrame({'id': range(i * 100, (i + 1) * 100),
+                                'region': [regions[(i + j) % 4] for j in range(100)],
+                                'name': [f"name{i * 100 + j}" for j in range(100)]}) for i in range(3)]
+        check_df = pd.concat(chunks, ignore_index=True)
+
+        buffer = DataBuffer(categorize='auto')
+        for chunk in chunks:
+            buffer.append(chunk)
+        df = buffer.to_frame()
+        logger.info(f"\t categorize dtypes {df.dtypes.to_dict()}")
+        self.assertIsInstance(df['region'].dtype, pd.CategoricalDtype)
+        self.assertEqual(object, df['name'].dtype)
+        pd.testing.assert_frame_equal(check_df, df.astype({'region': object}))
+
+        # 고유값이 많은 조각이 추가되면 object 컬럼으로 전환
+        buffer.append(pd.DataFrame({'region': [f"region{i}" for i in range(10)]}))
+        df = buffer.to_frame()
+        self.assertEqual(object, df['region'].dtype)
+        check_region = pd.concat([check_df['region'], pd.Series([f"region{i}" for i in range(10)])], ignore_index=True)
+        pd.testing.assert_series_equal(check_region, df['region'], check_names=False)
+
+        # spill 파일은 Arrow dictionary 컬럼으로 저장하고 categorical 로 합침
+        handler = CsvHandler(error_log=None, memory_limit=10000, categorize='auto')
+        check_handler = CsvHandler(error_log=None)
+        for chunk in chunks:
+            handler.loads(chunk.to_csv(index=False))
+            check_handler.loads(chunk.to_csv(index=False))
+        self.assertTrue(handler.data_buffer.spilled)
+        df = handler.to_pandas()
+        self.assertIsInstance(df['region'].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(check_handler.to_pandas(), df.astype({'region': object}))
+
+
+    def test_column_accumulator(self):
+        rows = [
+            {'a': 1, 'b': 'x'},
+            {'b': 'y', 'c': [1, 2]},
+            {'a': 2.5, 'd': None},
+            {'c': {'k': 1}, 'e': True},
+            {},
+            {'a': 3, 'b': None, 'e': False},
+        ]
+        accumulator = ColumnAccumulator()
+        accumulator.extend(rows)
+        self.assertEqual(len(rows), len(accumulator))
+        # 빠진 키는 건너뛰고 원래 row dictionary 로 다시 만듦
+        self.assertEqual(rows, list(accumulator))
+        df = accumulator.to_frame()
+        logger.info(f"\t column accumulator dtypes {df.dtypes.to_dict()}")
+        pd.testing.assert_frame_equal(pd.DataFrame(rows), df)
+        self.assertEqual(0, len(accumulator))
+
+        # dataframe 과 dictionary 가 섞이면 순서대로 누적
+        handler = JsonHandler('multiline', error_log=None)
+        handler.pass_list.append(pd.DataFrame({'a': [0]}))
+        handler.pass_list.extend(rows)
+        self.assertEqual(1, len(handler.pass_list.frames))
+        self.assertEqual(len(rows), handler.pass_list.rows)
+        df = handler.to_pandas()
+        check_df = pd.concat([pd.DataFrame({'a': [0]}), pd.DataFrame(rows)], ignore_index=True)
+        pd.testing.assert_frame_equal(check_df, df)
+
+        # JSONL 로 읽은 결과는 row dictionary 목록으로 만든 dataframe 과 같음
+        handler = JsonHandler('multiline', error_log=None)
+        handler.loads('\n'.join(json.dumps(row) for row in rows))
+        pd.testing.assert_frame_equal(pd.DataFrame(rows), handler.to_pandas())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
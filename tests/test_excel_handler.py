@@ -42,7 +42,7 @@ class MyTestCase(unittest.TestCase):
         load_columns = []
         dump_columns = []
         try:
-            handler = ExcelHandler(processing_type='object')
+            handler = ExcelHandler(error_log=None, processing_type='object')
             df = handler.load(load_filename, header=[3,4])
 
             # t_pandas() 사용하지 않음
@@ -60,7 +60,7 @@ class MyTestCase(unittest.TestCase):
             exist = os.path.exists(dump_filename)
 
             if exist:
-                check_handler = ExcelHandler(processing_type='object')
+                check_handler = ExcelHandler(error_log=None, processing_type='object')
                 check_df = check_handler.load(dump_filename, header=[0,1])
                 # check_df = check_handler.to_pandas()
                 dump_columns = list(check_df.columns)
@@ -84,7 +84,7 @@ class MyTestCase(unittest.TestCase):
         expect_len = 100
         dump_filename = 'test_data/simple_table_to_delete.xlsx'
         try:
-            handler = ExcelHandler()
+            handler = ExcelHandler(error_log=None)
             handler.load(load_filename)
             pass_size = len(handler.pass_list)
             fail_size = len(handler.fail_list)
@@ -103,7 +103,7 @@ class MyTestCase(unittest.TestCase):
             exist = os.path.exists(dump_filename)
 
             if exist:
-                check_handler = ExcelHandler()
+                check_handler = ExcelHandler(error_log=None)
                 check_handler.load(dump_filename)
                 check_df = check_handler.to_pandas()
                 dump_columns = list(check_df.columns)
@@ -126,7 +126,7 @@ class MyTestCase(unittest.TestCase):
         load_filename = 'test_data/채널지수평가 샘플_v0.1.xlsx'
         dump_filename = 'test_data/채널지수평가 샘플_v0.1_to_delete.xlsx'
         try:
-            handler = ExcelHandler()
+            handler = ExcelHandler(error_log=None)
             handler.load(load_filename, sheet_name='Youtube생산성', skiprows=1, header=0, nrows=20, usecols='B:D')
             df = handler.to_pandas()
             if df is not None:
@@ -143,7 +143,7 @@ class MyTestCase(unittest.TestCase):
             exist = os.path.exists(dump_filename)
 
             if exist:
-                check_handler = ExcelHandler()
+                check_handler = ExcelHandler(error_log=None)
                 check_handler.load(dump_filename)
                 check_df = check_handler.to_pandas()
                 dump_columns = list(check_df.columns)
@@ -169,7 +169,7 @@ class MyTestCase(unittest.TestCase):
         load_filename = 'test_data/multiheader_table.xlsx'
         try:
             for skiprows, header, succeed in zip(test_skiprows, test_header, expect_success):
-                handler = ExcelHandler()
+                handler = ExcelHandler(error_log=None)
                 logger.info(f"\ttry load sheet_name='50주차', skiprows={skiprows}, header={header}, nrows=50")
                 handler.load(load_filename, sheet_name='50주차', skiprows=skiprows, header=header, nrows=50)
                 df = handler.to_pandas()
@@ -202,7 +202,7 @@ class MyTestCase(unittest.TestCase):
         load_filename = 'test_data/multiheader_table.xlsx'
         dump_filename = 'test_data/multiheader_table_to_delete.xlsx'
         try:
-            handler = ExcelHandler()
+            handler = ExcelHandler(error_log=None)
             handler.load(load_filename, sheet_name='50주차', skiprows=0, header=[3, 4], nrows=100)
 
             df = handler.to_pandas()
@@ -221,7 +221,7 @@ class MyTestCase(unittest.TestCase):
             exist = os.path.exists(dump_filename)
 
             if exist:
-                check_handler = ExcelHandler()
+                check_handler = ExcelHandler(error_log=None)
                 # sheet_name='50주차', skiprows=1, , nrows=100
                 # 멀티 헤더 문제 때문에 빈칸이 하나더 추가되어 nrows 를 설정하면 +1을 해야함
                 # check_handler.load(dump_filename, skiprows=0, header=[0, 1], nrows=101)
@@ -241,6 +241,21 @@ class MyTestCase(unittest.TestCase):
             logger.info(f"\t assert load {load_columns=}, {dump_columns=} is list equal")
             self.assertListEqual(load_columns, dump_columns)
 
+    def test_iter_chunks(self):
+        load_filename = 'test_data/simple_table.xlsx'
+        chunk_rows = 30
+
+        handler = ExcelHandler(error_log=None)
+        chunk_list = list(handler.iter_chunks(load_filename, chunk_rows=chunk_rows))
+        chunk_sizes = [len(chunk_df) for chunk_df in chunk_list]
+        logger.info(f"\t iter_chunks {chunk_sizes=}")
+        self.assertEqual([30, 30, 30, 10], chunk_sizes)
+
+        check_handler = ExcelHandler(error_log=None)
+        check_handler.load(load_filename)
+        check_df = check_handler.to_pandas()
+        pd.testing.assert_frame_equal(check_df, pd.concat(chunk_list, ignore_index=True))
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
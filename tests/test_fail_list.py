@@ -0,0 +1,93 @@
+import unittest
+import json
+import os
+import tempfile
+import time
+
+from echoss_fileformat import JsonHandler
+from echoss_fileformat.fail_list import FailList
+from echoss_fileformat import get_logger
+
+logger = get_logger("test_fail_list")
+
+
+class MyTestCase(unittest.TestCase):
+    """
+        테스트 설정
+    """
+    def setUp(self):
+        """Before test"""
+        ids = self.id().split('.')
+        self.str_id = f"{ids[-2]}: {ids[-1]}"
+        self.start_time = time.perf_counter()
+        logger.info(f"setting up test [{self.str_id}] ")
+
+    def tearDown(self):
+        """After test"""
+        self.end_time = time.perf_counter()
+        logger.info(f" tear down test [{self.str_id}] elapsed time {(self.end_time-self.start_time)*1000: .3f}ms \n")
+
+    """
+    유닛 테스트
+    """
+
+    def test_bounded_records(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            error_log = os.path.join(tmp_dir, 'error.log')
+            fail_list = FailList(error_log=error_log, max_records=10, payload_limit=8)
+            for i in range(25):
+                fail_list.append('x' * 100, source='input.csv', offset=i, reason=ValueError('bad'))
+
+            logger.info(f"\t {fail_list=} in memory {len(fail_list.records)}")
+            self.assertEqual(25, len(fail_list))
+            self.assertEqual(5, len(fail_list.records))
+            record = fail_list[0]
+            self.assertEqual({'source': 'input.csv', 'offset': 20, 'reason': 'ValueError: bad',
+                              'payload': 'x' * 8, 'size': 100}, record)
+
+            fail_list.flush(wait=True)
+            with open(error_log, 'r', encoding='utf-8') as fp:
+                lines = [json.loads(line) for line in fp]
+            logger.info(f"\t error log lines {len(lines)}")
+            self.assertEqual(25, len(lines))
+            self.assertEqual(list(range(25)), [line['offset'] for line in lines])
+
+    def test_payload_bytes(self):
+        # max_bytes 는 문자 수가 아닌 인코딩 byte 크기. 한글 10 글자는 utf-8 30 byte
+        fail_list = FailList(error_log=None, max_bytes=100, payload_limit=10)
+        for i in range(3):
+            fail_list.append('가' * 10, offset=i)
+        self.assertEqual(0, fail_list.dropped)
+        fail_list.append('가' * 10, offset=3)
+        self.assertEqual(4, fail_list.dropped)
+        self.assertEqual(0, len(fail_list.records))
+
+        # dict, list 는 payload_limit 길이까지만 직렬화하고 size 는 원소 수
+        fail_list = FailList(error_log=None, payload_limit=20)
+        fail_list.append({f"key{i}": '값' * 10 for i in range(10000)})
+        fail_list.append([1, 2, 3])
+        logger.info(f"\t {fail_list.records=}")
+        self.assertEqual('{"key0": "' + '값' * 10, fail_list[0]['payload'])
+        self.assertEqual(10000, fail_list[0]['size'])
+        self.assertEqual({'payload': '[1, 2, 3]', 'size': 3},
+                         {key: fail_list[1][key] for key in ('payload', 'size')})
+
+    def test_handler_error_log(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            error_log = os.path.join(tmp_dir, 'error.log')
+            handler = JsonHandler('multiline', error_log=error_log)
+            handler.load('test_data/complex_one_object.json')
+            fail_size = len(handler.fail_list)
+            handler.to_pandas()
+            handler.fail_list.flush(wait=True)
+
+            with open(error_log, 'r', encoding='utf-8') as fp:
+                lines = [json.loads(line) for line in fp]
+            logger.info(f"\t assertEqual({fail_size=}, {len(lines)=})")
+            self.assertEqual(fail_size, len(lines))
+            self.assertEqual(0, len(handler.fail_list))
+            self.assertTrue(all(line['offset'] is not None and line['reason'] for line in lines))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
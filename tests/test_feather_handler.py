@@ -38,7 +38,7 @@ class MyTestCase(unittest.TestCase):
         load_filename = 'test_data/simple_standard.csv'
         dump_filename = 'test_data/simple_standard_to_delete.feather'
         try:
-            csv_handler = CsvHandler()
+            csv_handler = CsvHandler(error_log=None)
             csv_handler.load(load_filename, header=0, skiprows=0)
             pass_size = len(csv_handler.pass_list)
             fail_size = len(csv_handler.fail_list)
@@ -53,7 +53,7 @@ class MyTestCase(unittest.TestCase):
 
             self.assertTrue(csv_str.startswith(expect_csv_str), "startswith fail")
 
-            feather_handler = FeatherHandler()
+            feather_handler = FeatherHandler(error_log=None)
             feather_handler.dump(dump_filename, data=csv_df)
             exist = os.path.exists(dump_filename)
             file_size = os.path.getsize(dump_filename)
@@ -72,6 +72,21 @@ class MyTestCase(unittest.TestCase):
             logger.info(f"\t load expect fail {expect_fail} get {fail_size}")
             self.assertTrue(fail_size == expect_fail)
 
+    def test_iter_chunks(self):
+        load_filename = 'test_data/simple_standard.csv'
+        dump_filename = 'test_data/simple_standard_chunks_to_delete.feather'
+        csv_df = CsvHandler('object', error_log=None).load(load_filename)
+
+        feather_handler = FeatherHandler(error_log=None)
+        feather_handler.dump(dump_filename, data=csv_df)
+        chunk_sizes = [len(chunk_df) for chunk_df in
+                       feather_handler.iter_chunks(dump_filename, chunk_rows=100, columns=['SEQ_NO', 'BRAND_NM'])]
+        if os.path.exists(dump_filename) and 'to_delete' in dump_filename:
+            os.remove(dump_filename)
+
+        logger.info(f"\t iter_chunks {chunk_sizes=}")
+        self.assertEqual([100, 100, 12], chunk_sizes)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
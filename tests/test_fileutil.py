@@ -1,10 +1,15 @@
+import asyncio
 import io
 import os
 import pandas as pd
+import tempfile
 import time
 import unittest
+from unittest import mock
 
-from echoss_fileformat import FileUtil, to_table, get_logger
+from echoss_fileformat import FileUtil, CsvHandler, CsvSniffer, to_table, get_logger
+from echoss_fileformat.fail_list import FailList
+from echoss_fileformat.fileformat import _load_file
 
 logger = get_logger("test_fileutil", backup_count=1)
 verbose = True
@@ -262,6 +267,106 @@ class FileUtilTestCase(unittest.TestCase):
         # Assert
         self.assertDictEqual(config_dict, reload_dict, "is same or not?")
 
+    def test_load_many(self):
+        load_filenames = ['test_data/simple_standard.csv', 'test_data/simple_standard_not_exist.csv',
+                          'test_data/simple_standard.csv']
+        expect_shape = (424, 10)
+
+        for executor, fail_list in [('thread', FailList(error_log=None)), ('process', [])]:
+            df = FileUtil.load_many(load_filenames, workers=2, executor=executor, fail_list=fail_list)
+            logger.info(f"\t load_many {executor=} {df.shape=} {fail_list=}")
+            self.assertEqual(expect_shape, df.shape)
+            self.assertEqual(1, len(fail_list))
+            # list 에도 FailList 와 같은 형식의 기록을 추가
+            record = fail_list[0]
+            self.assertEqual(['source', 'offset', 'reason', 'payload', 'size'], list(record.keys()))
+            self.assertEqual(load_filenames[1], record['source'])
+            self.assertTrue(record['reason'].startswith('OSError'))
+
+        shapes = [df.shape for _, df in FileUtil.load_many(load_filenames[:1], combine=False)]
+        self.assertEqual([(212, 10)], shapes)
+
+        # combine=False 는 가져간 결과 다음의 몇 개 파일만 읽고, generator 를 닫으면 나머지 읽기는 취소
+        with mock.patch('echoss_fileformat.fileformat._load_file', wraps=_load_file) as load_file:
+            results = FileUtil.load_many(load_filenames[:1] * 20, workers=1, combine=False)
+            path, df = next(results)
+            results.close()
+        logger.info(f"\t load_many combine=False {load_file.call_count=}")
+        self.assertEqual((212, 10), df.shape)
+        self.assertLessEqual(load_file.call_count, 3)
+
+    def test_aload_many(self):
+        load_filenames = ['test_data/simple_standard.csv', 'test_data/simple_standard_not_exist.csv',
+                          'test_data/simple_standard.csv']
+        dump_filename = 'test_data/simple_standard_to_delete_async.csv'
+        expect_shape = (424, 10)
+
+        async def run():
+            fail_list = []
+            many_df = await FileUtil.aload_many(load_filenames, limit=2, fail_list=fail_list)
+            one_df = await FileUtil.aload(load_filenames[0])
+            await FileUtil.adump(one_df, dump_filename, force_write=True)
+
+            handler = CsvHandler(error_log=None)
+            await handler.aload(dump_filename)
+            return many_df, fail_list, one_df, handler.to_pandas()
+
+        many_df, fail_list, one_df, dump_df = asyncio.run(run())
+        if os.path.exists(dump_filename):
+            os.remove(dump_filename)
+        logger.info(f"\t aload_many {many_df.shape=} {fail_list=}")
+        self.assertEqual(expect_shape, many_df.shape)
+        self.assertEqual(1, len(fail_list))
+        self.assertEqual(load_filenames[1], fail_list[0]['source'])
+        logger.info(f"\t adump and aload {one_df.shape=} {dump_df.shape=}")
+        self.assertEqual(one_df.shape, dump_df.shape)
+
+    def test_compressed_file(self):
+        load_filename = 'test_data/simple_standard.csv'
+        extensions = ['csv', 'jsonl', 'feather']
+        compressions = ['gz', 'bz2', 'xz', 'zst']
+        try:
+            import zstandard
+        except ImportError:
+            compressions.remove('zst')
+
+        df = FileUtil.load(load_filename)
+        for extension in extensions:
+            for compression in compressions:
+                dump_filename = f'test_data/simple_standard_to_delete.{extension}.{compression}'
+                FileUtil.dump(df, dump_filename, force_write=True)
+                check_df = FileUtil.load(dump_filename)
+                if os.path.exists(dump_filename):
+                    os.remove(dump_filename)
+                logger.info(f"\t {extension}.{compression} assertEqual({df.shape=}, {check_df.shape=})")
+                self.assertEqual(df.shape, check_df.shape)
+
+        logger.info(f"\t assertEqual('jsonl', {FileUtil._infer_file_format('data.jsonl.zst')=})")
+        self.assertEqual('jsonl', FileUtil._infer_file_format('data.jsonl.zst'))
+
+    def test_load_csv_sniff(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            first_filename = os.path.join(tmp_dir, 'first.csv')
+            second_filename = os.path.join(tmp_dir, 'second.csv')
+            with open(first_filename, 'w', encoding='cp949') as fp:
+                fp.write('이름;나이;주소\n홍길동;30;"서울; 중구"\n김철수;25;부산\n')
+            with open(second_filename, 'w', encoding='utf-8-sig') as fp:
+                fp.write('1\t서울\n2\t부산\n')
+
+            sniffer = CsvSniffer()
+            df = FileUtil.load_csv(first_filename, sniff=sniffer)
+            logger.info(f"\t sniff {sniffer.get(sniffer.cache_key(first_filename))}")
+            self.assertEqual(['이름', '나이', '주소'], list(df.columns))
+            self.assertEqual('서울; 중구', df['주소'][0])
+
+            # 같은 디렉토리의 cache 와 인코딩, 구분자가 다르면 다시 판별
+            df = FileUtil.load_csv(second_filename, sniff=sniffer)
+            entry = sniffer.get(sniffer.cache_key(second_filename))
+            logger.info(f"\t sniff {entry}")
+            self.assertEqual(1, len(sniffer))
+            self.assertEqual(('utf-8-sig', '\t', None), (entry['encoding'], entry['delimiter'], entry['header']))
+            self.assertEqual((2, 2), df.shape)
+            self.assertEqual(['서울', '부산'], df[1].tolist())
 
 
 if __name__ == '__main__':
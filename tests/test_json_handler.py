@@ -1,14 +1,23 @@
 import unittest
 import time
 import logging
+import importlib.util
+import io
+import json
 import os
+import pandas as pd
+import tempfile
 
-from echoss_fileformat import JsonHandler, FeatherHandler
+from echoss_fileformat import JsonHandler, FeatherHandler, JsonArrayStream, JsonCodec
 from echoss_fileformat import get_logger, to_table
 
 logger = get_logger(logger_name='test_json_handler', backup_count=1)
 
 
+def _installed(name):
+    return importlib.util.find_spec(name) is not None
+
+
 class MyTestCase(unittest.TestCase):
     """
         테스트 설정
@@ -36,7 +45,7 @@ class MyTestCase(unittest.TestCase):
 
         for processing_type, expect_pass, expect_fail in zip(json_types, expect_passes, expect_fails):
             try:
-                handler = JsonHandler(processing_type)
+                handler = JsonHandler(processing_type, error_log=None)
                 dict_obj = handler.load('test_data/complex_one_object.json')
                 pass_size = len(handler.pass_list)
                 fail_size = len(handler.fail_list)
@@ -56,7 +65,7 @@ class MyTestCase(unittest.TestCase):
 
         for processing_type, expect_pass, expect_fail in zip(json_types, expect_passes, expect_fails):
             try:
-                handler = JsonHandler(processing_type)
+                handler = JsonHandler(processing_type, error_log=None)
                 handler.load('test_data/complex_one_object.json', data_key='main')
                 pass_size = len(handler.pass_list)
                 fail_size = len(handler.fail_list)
@@ -76,7 +85,7 @@ class MyTestCase(unittest.TestCase):
 
         for mode, expect_pass, expect_fail in zip(modes, expect_passes, expect_fails):
             try:
-                handler = JsonHandler('multiline')
+                handler = JsonHandler('multiline', error_log=None)
                 if mode == 'text':
                     with open('test_data/simple_multiline_object.jsonl', 'r', encoding='utf-8') as fp:
                         handler.load(fp)
@@ -102,7 +111,7 @@ class MyTestCase(unittest.TestCase):
 
         for processing_type, expect_pass, expect_fail in zip(processing_types, expect_passes, expect_fails):
             try:
-                handler = JsonHandler(processing_type)
+                handler = JsonHandler(processing_type, error_log=None)
                 handler.load('test_data/simple_multiline_object.jsonl', data_key='message')
                 pass_size = len(handler.pass_list)
                 fail_size = len(handler.fail_list)
@@ -117,7 +126,7 @@ class MyTestCase(unittest.TestCase):
             # 임시 코드로 feather 저장
             if processing_type == 'multiline':
                 df = handler.to_pandas()
-                feather_handler = FeatherHandler()
+                feather_handler = FeatherHandler(error_log=None)
                 feather_handler.dump('test_data/simple_object.feather', df)
 
 
@@ -135,7 +144,7 @@ class MyTestCase(unittest.TestCase):
 
         for processing_type, data_key, expect_file_size  in zip(json_types, data_keys, expect_file_sizes):
             try:
-                handler = JsonHandler(processing_type)
+                handler = JsonHandler(processing_type, error_log=None)
                 dict_obj = handler.load(load_filename, data_key=data_key)
                 pass_size = len(handler.pass_list)
 
@@ -166,7 +175,7 @@ class MyTestCase(unittest.TestCase):
 
         for mode, expect_file_size in zip(modes, expect_file_sizes):
             try:
-                handler = JsonHandler('multiline')
+                handler = JsonHandler('multiline', error_log=None)
                 if mode == 'text':
                     with open(load_filename, 'r', encoding='utf-8') as fp:
                         handler.load(fp)
@@ -209,7 +218,7 @@ class MyTestCase(unittest.TestCase):
 
         for mode, data_key, expect_file_size in zip(modes, data_keys, expect_file_sizes):
             try:
-                handler = JsonHandler('multiline')
+                handler = JsonHandler('multiline', error_log=None)
                 if mode == 'text':
                     with open(load_filename, 'r', encoding='utf-8') as fp:
                         handler.load(fp, data_key=data_key)
@@ -243,6 +252,200 @@ class MyTestCase(unittest.TestCase):
                 self.assertTrue(True, f"\t {mode} multiline File load fail by {e}")
                 # logger.error(f"\t {mode} multiline File load fail by {e}")
 
+    def test_iter_chunks_multiline(self):
+        load_filename = 'test_data/simple_multiline_object.jsonl'
+        chunk_rows = 4
+
+        handler = JsonHandler('multiline', error_log=None)
+        chunk_sizes = [len(chunk_df) for chunk_df in handler.iter_chunks(load_filename, chunk_rows=chunk_rows)]
+        logger.info(f"\t iter_chunks {chunk_sizes=}")
+        self.assertEqual([4, 4, 4, 3], chunk_sizes)
+        self.assertEqual(0, len(handler.pass_list))
+
+        handler = JsonHandler('array', error_log=None)
+        chunk_sizes = [len(chunk_df) for chunk_df in
+                       handler.iter_chunks('test_data/complex_one_object.json', chunk_rows=40, data_key='main')]
+        logger.info(f"\t iter_chunks 'array' {chunk_sizes=}")
+        self.assertEqual([40, 40, 22], chunk_sizes)
+
+    def test_load_multiline_use_mmap(self):
+        load_filename = 'test_data/simple_multiline_object.jsonl'
+        expect_pass = 15
+
+        handler = JsonHandler('multiline', error_log=None, use_mmap=True)
+        handler.load(load_filename)
+        pass_size = len(handler.pass_list)
+        logger.info(f"\t use_mmap load assertEqual({expect_pass=}, {pass_size=})")
+        self.assertEqual(expect_pass, pass_size)
+
+        check_handler = JsonHandler('multiline', error_log=None)
+        check_handler.load(load_filename)
+        self.assertTrue(check_handler.to_pandas().equals(handler.to_pandas()))
+
+    def test_load_multiline_incremental(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            load_filename = os.path.join(tmp_dir, 'tail.jsonl')
+            with open(load_filename, 'w', encoding='utf-8') as fp:
+                fp.write('{"id": 1}\n{"id": 2}\n{"id": ')
+
+            handler = JsonHandler('multiline', error_log=None)
+            handler.load(load_filename, incremental=True)
+            self.assertEqual([1, 2], handler.to_pandas()['id'].tolist())
+
+            # 줄바꿈으로 끝난 새 줄만 읽음
+            with open(load_filename, 'a', encoding='utf-8') as fp:
+                fp.write('3}\n{"id": 4}\n')
+            handler.load(load_filename, incremental=True)
+            handler.load(load_filename, incremental=True)
+            logger.info(f"\t incremental ids {handler.to_pandas()['id'].tolist()}")
+            self.assertEqual([1, 2, 3, 4], handler.to_pandas()['id'].tolist())
+
+            # 파일이 잘리면 처음부터 다시 읽음
+            with open(load_filename, 'w', encoding='utf-8') as fp:
+                fp.write('{"id": 5}\n')
+            handler.load(load_filename, incremental=True)
+            self.assertEqual([1, 2, 3, 4, 5], handler.to_pandas()['id'].tolist())
+
+    def test_load_multiline_workers(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            load_filename = os.path.join(tmp_dir, 'parallel.jsonl')
+            with open(load_filename, 'w', encoding='utf-8') as fp:
+                for i in range(2000):
+                    if i % 500 == 7:
+                        fp.write('{"id": broken\n')
+                    else:
+                        fp.write(json.dumps({'id': i, 'text': f"한글{i}"} if i % 2 else {'id': i, 'value': i * 0.5},
+                                            ensure_ascii=False) + '\n')
+
+            min_range_bytes = JsonHandler.PARALLEL_MIN_RANGE_BYTES
+            max_range_bytes = JsonHandler.PARALLEL_MAX_RANGE_BYTES
+            JsonHandler.PARALLEL_MIN_RANGE_BYTES = 1024
+            JsonHandler.PARALLEL_MAX_RANGE_BYTES = 8 * 1024
+            try:
+                check_handler = JsonHandler('multiline', error_log=None)
+                check_handler.load(load_filename)
+                check_df = check_handler.to_pandas()
+                handler = JsonHandler('multiline', error_log=None)
+                handler.load(load_filename, workers=3)
+                offsets = [record['offset'] for record in handler.fail_list]
+                parallel_df = handler.to_pandas()
+            finally:
+                JsonHandler.PARALLEL_MIN_RANGE_BYTES = min_range_bytes
+                JsonHandler.PARALLEL_MAX_RANGE_BYTES = max_range_bytes
+            logger.info(f"\t parallel load {parallel_df.shape=} {check_df.shape=}")
+            pd.testing.assert_frame_equal(check_df, parallel_df)
+            self.assertEqual([8, 508, 1008, 1508], offsets)
+
+
+    def test_load_multiline_arrow(self):
+        lines = [json.dumps({'id': i, 'ts': f"2020-01-{i % 28 + 1:02d}T10:00:00", 'tags': ['a', str(i)],
+                             'meta': {'k': i}, 'name': '한글' if i % 3 else None}, ensure_ascii=False)
+                 for i in range(40)]
+        lines.insert(5, '{"id": broken')
+        lines.insert(30, '[1, 2]')
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+
+        check_handler = JsonHandler('multiline', error_log=None)
+        check_handler.load(io.BytesIO(data))
+        check_df = check_handler.to_pandas()
+
+        block_bytes = JsonHandler.ARROW_BLOCK_BYTES
+        JsonHandler.ARROW_BLOCK_BYTES = 512
+        try:
+            handler = JsonHandler('multiline', error_log=None, engine='pyarrow')
+            handler.load(io.BytesIO(data))
+            offsets = [record['offset'] for record in handler.fail_list]
+            arrow_df = handler.to_pandas()
+        finally:
+            JsonHandler.ARROW_BLOCK_BYTES = block_bytes
+        logger.info(f"\t pyarrow engine {arrow_df.shape=} {offsets=}")
+        pd.testing.assert_frame_equal(check_df, arrow_df)
+        self.assertEqual([6, None], offsets)
+        self.assertEqual(['a', '0'], arrow_df['tags'][0])
+        self.assertEqual('2020-01-01T10:00:00', arrow_df['ts'][0])
+
+    def test_load_array_stream(self):
+        rows = [{'id': i, 'text': f"한글 ]}}\"{i}", 'values': [i, None]} for i in range(500)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            load_filename = os.path.join(tmp_dir, 'stream.json')
+            text = json.dumps({'meta': {'data': [{'skip': True}]}, 'data': rows}, ensure_ascii=False, indent=1)
+            # 300번째 원소를 읽을 수 없는 JSON 으로 변경
+            text = text.replace('"id": 300,', '"id": 300x,')
+            with open(load_filename, 'w', encoding='utf-8') as fp:
+                fp.write(text)
+
+            chunk_bytes = JsonArrayStream.CHUNK_BYTES
+            JsonArrayStream.CHUNK_BYTES = 256
+            try:
+                handler = JsonHandler('array', error_log=None, memory_limit=1024 * 1024)
+                handler.load(load_filename, data_key='data')
+                offsets = [record['offset'] for record in handler.fail_list]
+                df = handler.to_pandas()
+                chunk_handler = JsonHandler('array', error_log=None)
+                chunks = list(chunk_handler.iter_chunks(load_filename, chunk_rows=200, data_key='data'))
+            finally:
+                JsonArrayStream.CHUNK_BYTES = chunk_bytes
+            logger.info(f"\t array stream {df.shape=} {offsets=} chunks={[len(chunk) for chunk in chunks]}")
+            expect_df = pd.DataFrame(rows[:300] + rows[301:])
+            pd.testing.assert_frame_equal(expect_df, df)
+            self.assertEqual([300], offsets)
+            self.assertEqual([200, 200, 99], [len(chunk) for chunk in chunks])
+
+            handler = JsonHandler('array', error_log=None)
+            handler.load(load_filename)
+            self.assertEqual(1, len(handler.fail_list))
+            self.assertEqual(0, len(handler.to_pandas()))
+
+    def test_json_backend(self):
+        rows = [
+            {'id': 1, 'text': '한글 "quote" \\ /', 'small': 1e-05, 'big': 1e+16, 'nested': {'list': [1, 2.5, None]}},
+            {'id': 2, 'nan': float('nan'), 'huge': 2 ** 70, 'flag': True},
+        ]
+        expect = b''.join(json.dumps(row, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+                          for row in rows)
+        lines = expect + b'{"id": 3, "value": NaN}\n{"id": broken\n'
+        backends = ['json'] + [name for name in ['orjson', 'simdjson', 'ujson'] if _installed(name)]
+        for backend in backends:
+            handler = JsonHandler('multiline', error_log=None, json_backend=backend)
+            self.assertEqual(backend, handler.json_codec.name)
+            dump_bytes = handler.dumps(data=rows).encode('utf-8')
+            self.assertEqual(expect, dump_bytes)
+
+            handler.load(io.BytesIO(lines))
+            self.assertEqual([4], [record['offset'] for record in handler.fail_list])
+            df = handler.to_pandas()
+            logger.info(f"\t json_backend={backend} {df.shape=}")
+            self.assertEqual([1, 2, 3], df['id'].tolist())
+            self.assertEqual(2 ** 70, df['huge'][1])
+
+        with self.assertRaises(ValueError):
+            JsonHandler('multiline', error_log=None, json_backend='unknown')
+
+    def test_load_array_json_backend(self):
+        class CountingCodec(JsonCodec):
+            name = 'counting'
+            calls = 0
+
+            def loads(self, data):
+                CountingCodec.calls += 1
+                return super().loads(data)
+
+        rows = [{'id': i, 'text': f"a, [{i}], {{\"b\": {i}}}", 'values': [[i], {'k': None}]} for i in range(3000)]
+        text = json.dumps({'data': rows}, ensure_ascii=False, indent=1)
+        text = text.replace('"id": 1500,', '"id": 1500x,')
+        backends = ['json'] + [name for name in ['orjson', 'simdjson', 'ujson'] if _installed(name)] + [CountingCodec()]
+        for backend in backends:
+            handler = JsonHandler('array', error_log=None, json_backend=backend)
+            handler.load(io.BytesIO(text.encode('utf-8')), data_key='data')
+            offsets = [record['offset'] for record in handler.fail_list]
+            df = handler.to_pandas()
+            logger.info(f"\t array json_backend={handler.json_codec.name} {df.shape=} {offsets=}")
+            pd.testing.assert_frame_equal(pd.DataFrame(rows[:1500] + rows[1501:]), df)
+            self.assertEqual([1500], offsets)
+        # 모든 원소를 원소마다가 아니라 여러 원소를 묶어서 json_backend 로 변환
+        logger.info(f"\t {CountingCodec.calls=}")
+        self.assertTrue(len(text) // JsonArrayStream.BATCH_CHARS <= CountingCodec.calls < len(rows) / 10)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,81 @@
+import unittest
+import io
+import time
+
+from echoss_fileformat import FileUtil, CsvHandler, JsonHandler
+from echoss_fileformat import get_logger
+
+logger = get_logger("test_metrics")
+
+
+class MyTestCase(unittest.TestCase):
+    """
+        테스트 설정
+    """
+    def setUp(self):
+        """Before test"""
+        ids = self.id().split('.')
+        self.str_id = f"{ids[-2]}: {ids[-1]}"
+        self.start_time = time.perf_counter()
+        logger.info(f"setting up test [{self.str_id}] ")
+
+    def tearDown(self):
+        """After test"""
+        self.end_time = time.perf_counter()
+        logger.info(f" tear down test [{self.str_id}] elapsed time {(self.end_time-self.start_time)*1000: .3f}ms \n")
+
+    """
+    유닛 테스트
+    """
+
+    def test_handler_stats(self):
+        events = []
+        handler = CsvHandler(error_log=None)
+        handler.add_observer(events.append)
+        handler.load('test_data/simple_standard.csv')
+        df = handler.to_pandas()
+        buffer = io.StringIO()
+        handler.dump(buffer)
+
+        stats = handler.stats()
+        logger.info(f"\t {stats=}")
+        self.assertEqual(len(df), stats['rows_parsed'])
+        self.assertEqual(len(df), stats['rows_written'])
+        self.assertEqual(len(buffer.getvalue()), stats['bytes_written'])
+        self.assertGreater(stats['bytes_read'], 0)
+        self.assertGreater(stats['parse_time'], 0)
+        self.assertEqual(['load', 'to_pandas', 'dump'], [event['operation'] for event in events])
+
+        handler.reset_stats()
+        self.assertEqual(0, handler.stats()['calls'])
+
+    def test_failed_rows_and_chunks(self):
+        handler = JsonHandler('multiline', error_log=None)
+        handler.load('test_data/complex_one_object.json')
+        stats = handler.stats()
+        logger.info(f"\t assertEqual({len(handler.fail_list)=}, {stats['rows_failed']=})")
+        self.assertEqual(len(handler.fail_list), stats['rows_failed'])
+
+        handler = CsvHandler(error_log=None)
+        rows = sum(len(chunk) for chunk in handler.iter_chunks('test_data/simple_standard.csv', chunk_rows=50))
+        logger.info(f"\t assertEqual({rows=}, {handler.stats()['rows_parsed']=})")
+        self.assertEqual(rows, handler.stats()['rows_parsed'])
+
+    def test_fileutil_stats(self):
+        events = []
+        FileUtil.reset_stats()
+        FileUtil.add_observer(events.append)
+        try:
+            df = FileUtil.load('test_data/simple_standard.csv')
+        finally:
+            FileUtil.remove_observer(events.append)
+
+        stats = FileUtil.stats()
+        logger.info(f"\t {stats['csv']=}")
+        self.assertEqual(len(df), stats['csv']['rows_parsed'])
+        self.assertEqual(stats['csv']['bytes_read'], stats['total']['bytes_read'])
+        self.assertTrue(all(event['format'] == 'csv' for event in events))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,104 @@
+import unittest
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+from echoss_fileformat import FileUtil, CsvHandler, MemoryStorage, StoragePath, register_storage
+from echoss_fileformat.storage import RangeReader
+from echoss_fileformat import get_logger
+
+try:
+    import boto3
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
+
+logger = get_logger("test_storage")
+
+
+class CountingStorage(MemoryStorage):
+    """range read 호출 기록용 저장소"""
+    def __init__(self):
+        super().__init__()
+        self.ranges = []
+
+    def read_range(self, path, start, length):
+        self.ranges.append((start, length))
+        return super().read_range(path, start, length)
+
+
+class MyTestCase(unittest.TestCase):
+    """
+        테스트 설정
+    """
+    def setUp(self):
+        """Before test"""
+        ids = self.id().split('.')
+        self.str_id = f"{ids[-2]}: {ids[-1]}"
+        self.start_time = time.perf_counter()
+        logger.info(f"setting up test [{self.str_id}] ")
+
+    def tearDown(self):
+        """After test"""
+        self.end_time = time.perf_counter()
+        logger.info(f" tear down test [{self.str_id}] elapsed time {(self.end_time-self.start_time)*1000: .3f}ms \n")
+
+    """
+    유닛 테스트
+    """
+
+    def test_memory_storage_load_dump(self):
+        register_storage('memory', MemoryStorage())
+        df = FileUtil.load('test_data/simple_standard.csv')
+        extensions = ['csv', 'csv.gz', 'jsonl', 'feather', 'parquet', 'xlsx']
+
+        for extension in extensions:
+            url = f'memory://bucket/simple_standard.{extension}'
+            FileUtil.dump(df, url, force_write=True)
+            check_df = FileUtil.load(url)
+            logger.info(f"\t {url} assertEqual({df.shape=}, {check_df.shape=})")
+            self.assertEqual(df.shape, check_df.shape)
+
+        storage = MemoryStorage()
+        storage.write_bytes('simple_standard.csv', open('test_data/simple_standard.csv', 'rb').read())
+        handler = CsvHandler(error_log=None)
+        handler.load(StoragePath(storage, 'simple_standard.csv'))
+        self.assertEqual(df.shape, handler.to_pandas().shape)
+
+    def test_range_reader(self):
+        data = bytes(range(256)) * 100
+        storage = CountingStorage()
+        storage.write_bytes('data', data)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            reader = RangeReader(storage, 'data', block_size=1000, prefetch_blocks=2, executor=executor)
+            reader.seek(-100, io.SEEK_END)
+            tail = reader.read(100)
+            logger.info(f"\t tail read ranges {storage.ranges}")
+            self.assertEqual(data[-100:], tail)
+            self.assertEqual([(25000, 1000)], storage.ranges)
+
+            reader.seek(0)
+            self.assertEqual(data, io.BufferedReader(reader, buffer_size=1000).read())
+            reader.close()
+
+    @unittest.skipIf(mock_aws is None, "boto3 and moto are not installed")
+    def test_s3_storage(self):
+        from echoss_fileformat import S3Storage
+        with mock_aws():
+            client = boto3.client('s3', region_name='us-east-1')
+            client.create_bucket(Bucket='bucket')
+            register_storage('s3', S3Storage(client=client, block_size=1024))
+
+            df = FileUtil.load('test_data/simple_standard.csv')
+            for extension in ['csv.gz', 'parquet', 'feather']:
+                url = f's3://bucket/simple_standard.{extension}'
+                FileUtil.dump(df, url, force_write=True)
+                check_df = FileUtil.load(url)
+                logger.info(f"\t {url} assertEqual({df.shape=}, {check_df.shape=})")
+                self.assertEqual(df.shape, check_df.shape)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -38,7 +38,7 @@ class MyTestCase(unittest.TestCase):
         for processing_type, file_name, expect_pass, expect_fail in \
                 zip(processing_types, file_names, expect_passes, expect_fails):
             try:
-                handler = XmlHandler(processing_type)
+                handler = XmlHandler(processing_type, error_log=None)
                 tree_obj = handler.load(file_name)
                 pass_size = len(handler.pass_list)
                 fail_size = len(handler.fail_list)
@@ -63,7 +63,7 @@ class MyTestCase(unittest.TestCase):
         for processing_type, load_filename, dump_filename, expect_file_size \
                 in zip(processing_types, load_filenames, dump_filenames, expect_file_sizes):
             try:
-                handler = XmlHandler(processing_type)
+                handler = XmlHandler(processing_type, error_log=None)
                 tree_obj = handler.load(load_filename)
                 pass_size = len(handler.pass_list)
                 fail_size = len(handler.fail_list)
@@ -75,7 +75,7 @@ class MyTestCase(unittest.TestCase):
                 self.assertTrue(True, f"\t {processing_type=} File load raise: {e}")
 
             try:
-                handler = XmlHandler(processing_type)
+                handler = XmlHandler(processing_type, error_log=None)
                 handler.dump(dump_filename, data=tree_obj)
                 tree_str = handler.dumps(data=tree_obj)
                 if verbose:
@@ -107,7 +107,7 @@ class MyTestCase(unittest.TestCase):
         for processing_type, load_filename, dump_filename, data_key, expect_file_size \
                 in zip(processing_types, load_filenames, dump_filenames, data_keys, expect_file_sizes):
             try:
-                handler = XmlHandler(processing_type)
+                handler = XmlHandler(processing_type, error_log=None)
                 tree_obj = handler.load(load_filename, data_key=data_key)
                 pass_size = len(handler.pass_list)
                 fail_size = len(handler.fail_list)
@@ -146,12 +146,26 @@ class MyTestCase(unittest.TestCase):
           <body>Don't forget me this weekend!</body>
         </note>
         """
-        handler = XmlHandler(processing_type='object')
+        handler = XmlHandler(error_log=None, processing_type='object')
         root = et.fromstring(xml_data)
         xml_dict = handler.xml_to_dict(root)
         logger.info(xml_data)
         logger.info(xml_dict)
 
+    def test_iter_chunks(self):
+        load_filename = 'test_data/complex_one_object.xml'
+        data_keys = [None, './/bndbox', 'object/bndbox']
+        expect_rows = [38, 32, 32]
+
+        for data_key, expect_row in zip(data_keys, expect_rows):
+            handler = XmlHandler(error_log=None)
+            chunk_sizes = [len(chunk_df) for chunk_df in
+                           handler.iter_chunks(load_filename, chunk_rows=10, data_key=data_key)]
+            logger.info(f"\t iter_chunks {data_key=} {chunk_sizes=}")
+            self.assertTrue(all(size <= 10 for size in chunk_sizes))
+            self.assertEqual(expect_row, sum(chunk_sizes))
+            self.assertEqual(0, len(handler.fail_list))
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)